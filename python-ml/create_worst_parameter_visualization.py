@@ -17,7 +17,7 @@ import sys
 # Add current directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from utils.dataset import load_dataset, get_data_dir
+from utils.dataset import load_split, get_data_dir
 from utils.evaluation import calculate_metrics
 from utils.forecasting import predict_residuals_iterative
 from training.arimax_trainer import train_arimax
@@ -48,8 +48,8 @@ def create_worst_parameter_visualization():
     data_dir = get_data_dir()
     
     # Load datasets
-    train = load_dataset('train_dataset.csv')
-    test = load_dataset('test_dataset.csv')
+    train = load_split('train')
+    test = load_split('test')
     
     # Parameter terburuk
     p, d, q = 3, 1, 0
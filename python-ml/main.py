@@ -1,11 +1,17 @@
 """FastAPI application for Hybrid ARIMAX-LSTM wave height prediction."""
 
+import time
+
+# Waktu mulai import modul (untuk laporan waktu startup di /health/imports)
+_IMPORT_STARTED_AT = time.perf_counter()
+
 import os
 from pathlib import Path
 from typing import Optional
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Query, Body
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 import pandas as pd
 import numpy as np
@@ -17,57 +23,184 @@ from pathlib import Path
 # Add current directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from utils.preprocessing import load_and_clean_data, split_train_test, split_train_validation_test
-from utils.dataset import save_uploaded_file, save_dataset, load_dataset, get_data_dir, get_models_dir
-from utils.evaluation import calculate_metrics, mape
+from utils.preprocessing import load_and_clean_data, split_offsets, UPLOAD_FORMATS
+from utils.dataset import (
+    save_upload_stream,
+    save_dataset,
+    get_dataset_path,
+    read_frame,
+    save_snapshot,
+    load_split,
+    split_exists,
+    get_snapshot_paths,
+    migrate_csv_datasets,
+    migrate_split_datasets,
+    get_data_dir,
+    get_models_dir,
+    fingerprint_files,
+)
+from utils.evaluation import (
+    calculate_metrics,
+    mape,
+    build_evaluation_artifact,
+    save_evaluation_artifact,
+    load_evaluation_artifact,
+)
 from utils.forecasting import (
     predict_residuals_iterative,
     load_arimax_model,
     load_lstm_model,
     load_residual_scaler,
     load_arimax_order_metadata,
+    load_arimax_metadata,
     create_sequences,
+    get_model_version,
+    forecast_arimax_scenarios,
+    forecast_arimax_mean,
+    forecast_arimax_horizons,
 )
-from training.arimax_trainer import train_arimax
-from training.hybrid_trainer import train_lstm_residual
+from utils.cache import ForecastCache, hash_vector
+from utils.registry import (
+    resolve_serving_bundle,
+    get_bundle_dir,
+    get_evaluation_base,
+    get_residual_train_path,
+    publish_bundle,
+    list_bundles,
+    activate_bundle,
+)
+from utils.import_report import loaded_heavy_modules
+from utils.executors import WorkerPool, QueueFullError, in_worker_process
+# CATATAN: modul training (dan TensorFlow/statsmodels/sklearn di dalamnya) hanya meng-import
+# library berat di dalam fungsi, sehingga import main.py tetap ringan dan /health cepat siap
+from training.arimax_trainer import train_arimax, fit_arimax_grid
+from training.hybrid_trainer import train_lstm_residual, restore_lstm_model, SeedSearch, TRAINING_PROFILES
+from training.hparam_search import successive_halving_search
+from training.profile_benchmark import benchmark_training_profiles
+from training.arimax_refresh import (
+    refresh_arimax,
+    load_observation_history,
+    InvalidObservationsError,
+    REFRESH_OBSERVATIONS_FILENAME,
+    REFRESH_OUTPUT_FILES,
+)
+from training.lstm_finetune import finetune_lstm_residual, NotEnoughResidualsError, FINETUNE_OUTPUT_FILES
+
+# Backend inference LSTM untuk serving: 'numpy' (tanpa TensorFlow) atau 'keras'
+LSTM_INFERENCE_BACKEND = os.environ.get('LSTM_INFERENCE_BACKEND', 'numpy')
+
+# Jika True, model dimuat ke cache di background thread saat startup (tidak memblokir /health)
+PRELOAD_MODELS = os.environ.get('PRELOAD_MODELS', '1').lower() not in ('0', 'false', 'no')
+
+# Jumlah bundle model yang dipertahankan di models/registry (bundle CURRENT selalu dipertahankan)
+MODEL_REGISTRY_KEEP = int(os.environ.get('MODEL_REGISTRY_KEEP', '5'))
+
+# Process pool untuk training/evaluasi (statsmodels, Keras) dan thread pool untuk inference,
+# agar event loop tetap responsif (/health, /predict) selama training berjalan
+training_pool = WorkerPool(
+    'training',
+    kind='process',
+    max_workers=int(os.environ.get('TRAINING_WORKERS', '1')),
+    max_pending=int(os.environ.get('TRAINING_QUEUE_SIZE', '4')),
+)
+inference_pool = WorkerPool(
+    'inference',
+    kind='thread',
+    max_workers=int(os.environ.get('INFERENCE_WORKERS', '4')),
+    max_pending=int(os.environ.get('INFERENCE_QUEUE_SIZE', '64')),
+)
+
+# Horizon maksimum yang di-precompute saat model dimuat ke cache.
+# /predict dengan n_steps <= horizon ini cukup mengambil slice dari trajectory yang sudah dihitung.
+PREDICT_MAX_HORIZON = int(os.environ.get('PREDICT_MAX_HORIZON', '500'))
+
+
+def _empty_model_cache() -> dict:
+    """Create an empty model cache."""
+    return {
+        'version': None,
+        'arimax': None,
+        'lstm': None,
+        'scaler': None,
+        'residual_seed': None,
+        'last_wind_speed': None,
+        'train_dataset': None,
+        # Trajectory yang di-precompute sampai PREDICT_MAX_HORIZON (lihat precompute_trajectories)
+        'residual_trajectory': None,
+        'default_arimax_trajectory': None,
+    }
+
 
 # Global cache for models and data
-_model_cache = {
-    'arimax': None,
-    'lstm': None,
-    'scaler': None,
-    'residual_seed': None,
-    'last_wind_speed': None,
-    'train_dataset': None,
-}
+# Cache tidak pernah diubah di tempat saat model diganti: load_models_to_cache() membangun
+# dict baru lalu mengganti referensi global sekaligus, sehingga request yang sedang berjalan
+# tetap memakai snapshot (versi) yang diambilnya di awal tanpa lock
+_model_cache = _empty_model_cache()
+
+# Cache hasil /predict (LRU + TTL), key: (versi model, hash wind_speed, n_steps)
+_forecast_cache = ForecastCache(
+    maxsize=int(os.environ.get('FORECAST_CACHE_SIZE', '256')),
+    ttl_seconds=float(os.environ.get('FORECAST_CACHE_TTL', '600')),
+)
+
+
+# Artefak evaluasi test set yang terakhir dibaca/dihitung (lihat get_evaluation_artifact)
+_evaluation_artifact: dict | None = None
+
+
+# Memuat model LSTM untuk serving menggunakan backend yang dikonfigurasi
+def load_serving_lstm_model(model_dir: Path | None = None):
+    """Load the LSTM model for serving with LSTM_INFERENCE_BACKEND (falls back to Keras)."""
+    try:
+        return load_lstm_model(backend=LSTM_INFERENCE_BACKEND, model_dir=model_dir)
+    except ValueError as e:
+        import logging
+        logging.warning(f'LSTM backend {LSTM_INFERENCE_BACKEND!r} unavailable ({e}), falling back to Keras')
+        return load_lstm_model(backend='keras', model_dir=model_dir)
+
+
+# Membangun cache model baru dari bundle yang sedang dilayani (belum dipasang ke global)
+def build_model_cache() -> dict:
+    """Load the serving bundle into a new model cache dict."""
+    cache = _empty_model_cache()
+    bundle_version, model_dir = resolve_serving_bundle()
+
+    # Load models
+    cache['version'] = bundle_version or get_model_version()
+    cache['arimax'] = load_arimax_model(model_dir)
+    cache['lstm'] = load_serving_lstm_model(model_dir)
+    cache['scaler'] = load_residual_scaler(model_dir)
+
+    # Load and cache residual seed (residual training milik bundle yang sama)
+    residual_path = get_residual_train_path(model_dir)
+    if residual_path.exists():
+        residual_train = read_frame(residual_path)
+        resid_vals = residual_train.values.reshape(-1, 1) if residual_train.ndim > 1 else residual_train.values.reshape(-1, 1)
+        resid_scaled = cache['scaler'].transform(resid_vals)
+        cache['residual_seed'] = resid_scaled[-18:].reshape(1, 18, 1)
+
+    # Load and cache train dataset for last wind speed
+    if split_exists('train'):
+        cache['train_dataset'] = load_split('train')
+        cache['last_wind_speed'] = float(cache['train_dataset']['wind_speed'].iloc[-1])
+    # Bundle hasil refresh: kecepatan angin observasi terakhir yang sudah dilihat ARIMAX
+    arimax_metadata = load_arimax_metadata(model_dir)
+    if arimax_metadata and arimax_metadata.get('last_wind_speed') is not None:
+        cache['last_wind_speed'] = float(arimax_metadata['last_wind_speed'])
+
+    # Precompute residual trajectory dan ARIMAX default-wind sampai horizon maksimum
+    precompute_trajectories(cache)
+    return cache
 
 
 # Memuat semua model dan data ke dalam cache memori untuk performa yang lebih baik
 def load_models_to_cache():
     """Load all models and cache data into memory."""
+    global _model_cache
     try:
         print("Loading models into cache...")
-        
-        # Load models
-        _model_cache['arimax'] = load_arimax_model()
-        _model_cache['lstm'] = load_lstm_model()
-        _model_cache['scaler'] = load_residual_scaler()
-        
-        # Load and cache residual seed
-        data_dir = get_data_dir()
-        residual_path = data_dir / 'residual_train.csv'
-        if residual_path.exists():
-            residual_train = pd.read_csv(residual_path, index_col=0, parse_dates=True)
-            resid_vals = residual_train.values.reshape(-1, 1) if residual_train.ndim > 1 else residual_train.values.reshape(-1, 1)
-            resid_scaled = _model_cache['scaler'].transform(resid_vals)
-            _model_cache['residual_seed'] = resid_scaled[-18:].reshape(1, 18, 1)
-        
-        # Load and cache train dataset for last wind speed
-        train_path = data_dir / 'train_dataset.csv'
-        if train_path.exists():
-            _model_cache['train_dataset'] = load_dataset('train_dataset.csv')
-            _model_cache['last_wind_speed'] = float(_model_cache['train_dataset']['wind_speed'].iloc[-1])
-        
+        # Swap atomik: request yang sedang berjalan tetap memakai cache lama
+        _model_cache = build_model_cache()
         print("Models loaded successfully!")
     except FileNotFoundError as e:
         print(f"Models not found yet: {e}. Will load on first prediction request.")
@@ -75,29 +208,95 @@ def load_models_to_cache():
         print(f"Error loading models: {e}. Will load on first prediction request.")
 
 
+# Mempublikasikan model hasil training sebagai bundle baru dan langsung melayaninya
+def publish_model_bundle(metadata: dict | None = None, files: dict[str, Path] | None = None) -> str:
+    """Publish the freshly trained models as a registry bundle and hot-swap the serving cache."""
+    version = publish_bundle(metadata, keep=MODEL_REGISTRY_KEEP, files=files)
+    # Di proses worker training, proses utama yang memuat ulang bundle (reload_models_after_training)
+    if not in_worker_process():
+        load_models_to_cache()
+        # Hasil forecast versi lama tidak akan dipakai lagi (key menyertakan versi)
+        _forecast_cache.clear()
+    return version
+
+
+# Memuat ulang model di proses utama setelah pekerjaan training di process pool selesai
+async def reload_models_after_training():
+    """Hot-swap the serving cache to the bundle published by a training job."""
+    await inference_pool.run(load_models_to_cache)
+    _forecast_cache.clear()
+
+
+# Menjalankan training di process pool dari background task (hasil hanya dicatat di log)
+async def run_background_training(job, *args):
+    """Run a training job in the process pool from a BackgroundTasks callback."""
+    import logging
+    try:
+        result = await training_pool.run(job, *args)
+        if result.get('status') == 'error':
+            logging.error(f'Background training failed: {result.get("message")}')
+    except QueueFullError as e:
+        logging.error(f'Background training rejected: {e}')
+        return
+    await reload_models_after_training()
+
+
+# Menghitung trajectory prediksi yang tidak bergantung pada request
+def precompute_trajectories(cache: dict, max_horizon: int = PREDICT_MAX_HORIZON):
+    """
+    Precompute the request-independent parts of /predict up to max_horizon.
+
+    - Residual LSTM hanya bergantung pada residual_seed dan n_steps, sehingga rollout
+      sepanjang max_horizon cukup dihitung sekali; n_steps yang lebih pendek adalah prefix-nya.
+    - Jalur default /predict (tanpa wind_speed) memakai last_wind_speed yang konstan,
+      sehingga forecast ARIMAX-nya juga tetap untuk setiap horizon.
+    """
+    if max_horizon <= 0:
+        return
+    if cache['lstm'] is not None and cache['scaler'] is not None and cache['residual_seed'] is not None:
+        cache['residual_trajectory'] = predict_residuals_iterative(
+            cache['lstm'],
+            cache['scaler'],
+            cache['residual_seed'],
+            n_steps=max_horizon,
+            window=18,
+        )
+    if cache['arimax'] is not None and cache['last_wind_speed'] is not None:
+        exog = pd.DataFrame({'wind_speed': [cache['last_wind_speed']] * max_horizon})
+        cache['default_arimax_trajectory'] = forecast_arimax_mean(cache['arimax'], exog)
+
+
 # Menghapus cache model (berguna ketika model dilatih ulang)
 def clear_model_cache():
     """Clear model cache (useful when models are retrained)."""
     global _model_cache
-    _model_cache = {
-        'arimax': None,
-        'lstm': None,
-        'scaler': None,
-        'residual_seed': None,
-        'last_wind_speed': None,
-        'train_dataset': None,
-    }
+    _model_cache = _empty_model_cache()
+    # Hasil forecast dari model lama tidak boleh dipakai lagi
+    _forecast_cache.clear()
 
 
 # Manajer konteks untuk siklus hidup aplikasi (startup dan shutdown)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown."""
-    # Startup: Load models into cache
-    load_models_to_cache()
+    # Startup: konversi sekali dataset CSV lama ke format biner (tidak ada yang dikerjakan jika sudah)
+    migrated = migrate_csv_datasets()
+    if migrated:
+        import logging
+        logging.info(f'Migrated CSV datasets to the binary dataset store: {", ".join(migrated)}')
+    # Dataset per split lama (train/validation/test) digabung sekali menjadi satu snapshot
+    migrate_split_datasets()
+    # Load models into cache di background thread agar server langsung siap
+    # menjawab /health dan /upload-dataset; /predict tetap memuat model sendiri jika
+    # dipanggil sebelum warm-up selesai
+    if PRELOAD_MODELS:
+        import threading
+        threading.Thread(target=load_models_to_cache, name='model-preload', daemon=True).start()
     yield
-    # Shutdown: Clear cache
+    # Shutdown: Clear cache dan hentikan worker pool
     clear_model_cache()
+    training_pool.shutdown()
+    inference_pool.shutdown()
 
 
 app = FastAPI(
@@ -105,10 +304,20 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+
+# Antrian pool penuh: minta client mencoba lagi nanti
+@app.exception_handler(QueueFullError)
+async def queue_full_handler(request, exc: QueueFullError):
+    """Return 503 when a worker pool queue is full."""
+    return JSONResponse(status_code=503, content={'detail': str(exc)}, headers={'Retry-After': '5'})
+
 # Ensure directories exist
 get_data_dir().mkdir(exist_ok=True)
 get_models_dir().mkdir(exist_ok=True)
 
+# Durasi import main.py (cold start sebelum server menerima request)
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED_AT
+
 
 class PredictionRequest(BaseModel):
     """Request model for prediction endpoint."""
@@ -123,6 +332,21 @@ class PredictionResponse(BaseModel):
     residual_predictions: list[float]
 
 
+class BatchPredictionRequest(BaseModel):
+    """Request model for batch scenario prediction endpoint."""
+    wind_speed: list[list[float]]  # Satu list kecepatan angin (panjang n_steps) per skenario
+    n_steps: int = 1
+
+
+class BatchPredictionResponse(BaseModel):
+    """Response model for batch scenario prediction endpoint (columnar, satu baris per skenario)."""
+    n_scenarios: int
+    n_steps: int
+    predictions: list[list[float]]
+    arimax_predictions: list[list[float]]
+    residual_predictions: list[float]  # Sama untuk semua skenario (tidak bergantung pada angin)
+
+
 # Endpoint root yang memberikan informasi dasar tentang API
 # DIPAKAI: Endpoint '/' digunakan oleh Laravel FastAPIService.healthCheck (fallback)
 @app.get('/')
@@ -131,22 +355,39 @@ async def root():
     return {'message': 'Hybrid ARIMAX-LSTM Wave Height Prediction API'}
 
 
-# Mengunggah file dataset Excel dan mempersiapkan data untuk pelatihan
+# Mengunggah file dataset (Excel, CSV, atau Parquet) dan mempersiapkan data untuk pelatihan
 # DIPAKAI: Endpoint '/upload-dataset' dipanggil oleh FastAPIService.uploadDataset
 @app.post('/upload-dataset')
 async def upload_dataset(file: UploadFile = File(...)):
     """
-    Upload dataset Excel file.
+    Upload dataset file (.xlsx, .xlsm, .xls, .csv or .parquet).
 
     Expected columns: timestamp, wave_height, wind_speed
     """
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail='File must be Excel format (.xlsx or .xls)')
+    suffix = Path(file.filename or '').suffix.lower()
+    if suffix not in UPLOAD_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail='File must be Excel (.xlsx, .xlsm, .xls), CSV (.csv) or Parquet (.parquet) format',
+        )
+    if suffix == '.parquet':
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=400, detail='Parquet upload requires pyarrow on the ML server')
 
-    try:
-        content = await file.read()
-        file_path = save_uploaded_file(content, 'upload.xlsx')
+    # Salin upload ke disk per chunk (tanpa membaca seluruh file ke memori)
+    file_path = await run_in_threadpool(save_upload_stream, file.file, suffix)
+    result = await training_pool.run(_upload_dataset_job, file_path)
 
+    # Clear model cache since dataset has changed
+    clear_model_cache()
+    return result
+
+
+def _upload_dataset_job(file_path: str) -> dict:
+    """Clean and split an uploaded dataset file (runs in the training process pool)."""
+    try:
         # Validate file by trying to load it
         df = load_and_clean_data(file_path)
 
@@ -161,34 +402,26 @@ async def upload_dataset(file: UploadFile = File(...)):
 
         # Split data into train, validation, and test sets (70% train, 15% validation, 15% test)
         # This matches Laravel's split to ensure consistency
-        train, validation, test = split_train_validation_test(df, train_ratio=0.7, validation_ratio=0.15)
+        train_end, validation_end = split_offsets(len(df), train_ratio=0.7, validation_ratio=0.15)
         
-        # Save train, validation, and test datasets to CSV files
+        # Save one snapshot with the split offsets (train/validation/test are slices of it)
         # This ensures that evaluate/arimax-models always uses the latest data
-        save_dataset(train, 'train_dataset.csv')
-        save_dataset(validation, 'validation_dataset.csv')
-        save_dataset(test, 'test_dataset.csv')
+        snapshot = save_snapshot(df, train_end, validation_end)
+        # Observasi refresh milik dataset lama tidak melanjutkan dataset baru
+        get_dataset_path(REFRESH_OBSERVATIONS_FILENAME).unlink(missing_ok=True)
         
-        # Verify files were created
         import logging
-        data_dir = get_data_dir()  # Get data directory for verification
-        logging.info(f'Dataset split completed: Train={len(train)}, Validation={len(validation)}, Test={len(test)}')
-        if (data_dir / 'validation_dataset.csv').exists():
-            logging.info('Validation dataset file created successfully')
-        else:
-            logging.warning('Validation dataset file was not created!')
-        
-        # Clear model cache since dataset has changed
-        clear_model_cache()
+        train_rows, validation_rows, test_rows = (end - start for start, end in snapshot['splits'].values())
+        logging.info(f'Dataset split completed: Train={train_rows}, Validation={validation_rows}, Test={test_rows}')
 
         return {
             'status': 'success',
             'message': 'Dataset uploaded successfully',
             'file_path': file_path,
             'rows': len(df),
-            'train_rows': len(train),
-            'validation_rows': len(validation),
-            'test_rows': len(test),
+            'train_rows': train_rows,
+            'validation_rows': validation_rows,
+            'test_rows': test_rows,
             'date_range': {
                 'start': str(df.index.min()),
                 'end': str(df.index.max()),
@@ -202,33 +435,14 @@ async def upload_dataset(file: UploadFile = File(...)):
 def _train_arimax_task(order: tuple[int, int, int] = (2, 1, 1)):
     """Background task for ARIMAX training."""
     try:
-        # Load uploaded dataset
-        data_dir = get_data_dir()
-        upload_path = data_dir / 'upload.xlsx'
-        if not upload_path.exists():
-            raise FileNotFoundError('Uploaded dataset not found. Please upload dataset first.')
-
-        # Load and clean data
-        df = load_and_clean_data(str(upload_path))
-
-        # Split train/test
-        train, test = split_train_test(df, train_ratio=0.7)
-
-        # Save train/test datasets
-        save_dataset(train, 'train_dataset.csv')
-        save_dataset(test, 'test_dataset.csv')
+        # Load training split of the uploaded dataset snapshot
+        train = load_split('train')
 
         # Train ARIMAX with specified order
         arimax_res, fitted_train, residual_train = train_arimax(train, order=order)
 
         # Save residual training data
-        residual_train.to_csv(str(data_dir / 'residual_train.csv'))
-
-        # Clear model cache since models have been retrained
-        clear_model_cache()
-        
-        # Reload models to cache
-        load_models_to_cache()
+        save_dataset(residual_train, 'residual_train.csv')
 
         # Calculate ARIMAX metrics on training set
         arimax_pred_train = fitted_train.values
@@ -266,9 +480,7 @@ async def train_arimax_endpoint(
         q: MA order (default: 0)
     """
     # Check if dataset exists
-    data_dir = get_data_dir()
-    upload_path = data_dir / 'upload.xlsx'
-    if not upload_path.exists():
+    if not split_exists('train'):
         raise HTTPException(
             status_code=400,
             detail='Dataset not found. Please upload dataset first using /upload-dataset',
@@ -284,7 +496,7 @@ async def train_arimax_endpoint(
     order = (p, d, q)
 
     # Start background task
-    background_tasks.add_task(_train_arimax_task, order=order)
+    background_tasks.add_task(run_background_training, _train_arimax_task, order)
 
     return {
         'status': 'success',
@@ -319,9 +531,10 @@ async def train_arimax_sync(
         )
 
     order = (p, d, q)
-    result = _train_arimax_task(order=order)
+    result = await training_pool.run(_train_arimax_task, order)
     if result['status'] == 'error':
         raise HTTPException(status_code=500, detail=result.get('message', 'Training failed'))
+    await reload_models_after_training()
     return result
 
 
@@ -330,14 +543,13 @@ def _train_hybrid_task():
     """Background task for Hybrid LSTM training."""
     try:
         # Load residual training data
-        data_dir = get_data_dir()
-        residual_path = data_dir / 'residual_train.csv'
+        residual_path = get_residual_train_path()
         if not residual_path.exists():
             raise FileNotFoundError(
                 'Residual training data not found. Please train ARIMAX first using /train/arimax',
             )
 
-        residual_train = pd.read_csv(residual_path, index_col=0, parse_dates=True)
+        residual_train = read_frame(residual_path)
         if len(residual_train) == 0:
             raise ValueError('Residual training data is empty')
 
@@ -353,11 +565,11 @@ def _train_hybrid_task():
             seed=42,  # Explicit seed untuk reproducibility
         )
 
-        # Clear model cache since models have been retrained
-        clear_model_cache()
-        
-        # Reload models to cache
-        load_models_to_cache()
+        # Publikasikan model sebagai bundle baru dan hot-swap cache serving
+        publish_model_bundle({'source': 'train/hybrid', 'lstm_seed': 42})
+
+        # Tulis artefak evaluasi untuk /evaluate dan /residual-predictions
+        refresh_evaluation_artifact()
 
         # Calculate training metrics (optional - can be removed for production)
         resid_vals = residual_train.values.reshape(-1, 1) if residual_train.ndim > 1 else residual_train.values.reshape(-1, 1)
@@ -393,8 +605,7 @@ async def train_hybrid_endpoint(background_tasks: BackgroundTasks):
     Requires ARIMAX to be trained first.
     """
     # Check if residual data exists
-    data_dir = get_data_dir()
-    residual_path = data_dir / 'residual_train.csv'
+    residual_path = get_residual_train_path()
     if not residual_path.exists():
         raise HTTPException(
             status_code=400,
@@ -402,7 +613,7 @@ async def train_hybrid_endpoint(background_tasks: BackgroundTasks):
         )
 
     # Start background task
-    background_tasks.add_task(_train_hybrid_task)
+    background_tasks.add_task(run_background_training, _train_hybrid_task)
 
     return {
         'status': 'success',
@@ -446,26 +657,28 @@ async def train_hybrid_sync(request: HybridTrainRequest = Body(default=None)):
     Returns:
         Dictionary with status, arimax_mape (test set), and hybrid_mape (test set)
         """
+    result = await training_pool.run(_train_hybrid_sync_job, request)
+    await reload_models_after_training()
+    return result
+
+
+def _train_hybrid_sync_job(request: HybridTrainRequest | None) -> dict:
+    """ARIMAX + LSTM training with seed search (runs in the training process pool)."""
     try:
         # Load train, validation (if available), and test datasets
-        data_dir = get_data_dir()
-        train_path = data_dir / 'train_dataset.csv'
-        validation_path = data_dir / 'validation_dataset.csv'
-        test_path = data_dir / 'test_dataset.csv'
-        
-        if not train_path.exists() or not test_path.exists():
+        if not split_exists('train') or not split_exists('test'):
             raise HTTPException(
                 status_code=404,
                 detail='Train or test dataset not found. Please upload dataset first.',
             )
         
-        train = load_dataset('train_dataset.csv')
-        test = load_dataset('test_dataset.csv')
+        train = load_split('train')
+        test = load_split('test')
         
         # Load validation dataset if available (for LSTM early stopping)
         validation = None
-        if validation_path.exists():
-            validation = load_dataset('validation_dataset.csv')
+        if split_exists('validation'):
+            validation = load_split('validation')
         
         # Determine ARIMAX order
         # Priority: 1) Request order, 2) Saved order, 3) Default (2,1,1)
@@ -493,12 +706,16 @@ async def train_hybrid_sync(request: HybridTrainRequest = Body(default=None)):
         
         # Save residual for LSTM training
         residual_train = residual_train.dropna()
-        residual_train.to_csv(str(data_dir / 'residual_train.csv'))
+        save_dataset(residual_train, 'residual_train.csv')
         
         # Step 2: Calculate ARIMAX MAPE on test set
         y_true_test = test['wave_height'].values
-        arimax_forecast = arimax_res.get_forecast(steps=len(test), exog=test[['wind_speed']])
-        arimax_pred_test = arimax_forecast.predicted_mean.values
+        # Forecast ARIMAX for validation and test once (one state-space pass); shared by metrics and residuals
+        arimax_forecasts = forecast_arimax_horizons(arimax_res, {
+            'test': test[['wind_speed']],
+            'validation': validation[['wind_speed']] if validation is not None and len(validation) > 0 else None,
+        })
+        arimax_pred_test = arimax_forecasts['test']
         arimax_metrics = calculate_metrics(y_true_test, arimax_pred_test)
         arimax_mape = arimax_metrics['mape']
         
@@ -506,8 +723,7 @@ async def train_hybrid_sync(request: HybridTrainRequest = Body(default=None)):
         arimax_mape_val = None
         if validation is not None and len(validation) > 0:
             y_true_val = validation['wave_height'].values
-            arimax_forecast_val = arimax_res.get_forecast(steps=len(validation), exog=validation[['wind_speed']])
-            arimax_pred_val = arimax_forecast_val.predicted_mean.values
+            arimax_pred_val = arimax_forecasts['validation']
             arimax_metrics_val = calculate_metrics(y_true_val, arimax_pred_val)
             arimax_mape_val = arimax_metrics_val['mape']
             
@@ -530,8 +746,7 @@ async def train_hybrid_sync(request: HybridTrainRequest = Body(default=None)):
         if validation is not None and len(validation) > 0:
             # Predict ARIMAX on validation set to get residuals
             y_true_val = validation['wave_height'].values
-            arimax_forecast_val = arimax_res.get_forecast(steps=len(validation), exog=validation[['wind_speed']])
-            arimax_pred_val = arimax_forecast_val.predicted_mean.values
+            arimax_pred_val = arimax_forecasts['validation']
             # Calculate residual: actual - predicted
             residual_val = pd.Series(y_true_val - arimax_pred_val, index=validation.index)
             residual_val = residual_val.dropna()
@@ -545,8 +760,9 @@ async def train_hybrid_sync(request: HybridTrainRequest = Body(default=None)):
         seed_search_logs = []
         best_seed = None
         best_hybrid_mape = float('inf')
-        best_model_lstm = None
+        best_weights = None
         best_scaler = None
+        best_candidate = None
         
         # Jika user menyediakan seed, gunakan seed tersebut (skip search)
         if request is not None and request.seed is not None:
@@ -573,84 +789,74 @@ async def train_hybrid_sync(request: HybridTrainRequest = Body(default=None)):
             logging.info(log_msg)
             seed_search_logs.append(log_msg)
             
-            for seed_candidate in optimal_seed_candidates:
-                seeds_tried += 1
-                try:
-                    # Train LSTM dengan seed ini (QUICK EVAL: epochs=15, patience=5 untuk mempercepat)
-                    # Note: Training history dari seed search tidak disimpan untuk menghindari overwrite
-                    model_lstm_candidate, scaler_candidate, training_history_candidate = train_lstm_residual(
-                        residual_train.iloc[:, 0] if residual_train.ndim > 1 else residual_train,
-                        window=18,
-                        lstm_units=24,
-                        epochs=15,  # Akan di-override oleh quick_eval=True menjadi 10
-                        batch_size=16,
-                        patience=5,  # Akan di-override oleh quick_eval=True menjadi 5
-                        seed=seed_candidate,
-                        residual_val=residual_val.iloc[:, 0] if residual_val is not None and residual_val.ndim > 1 else residual_val,
-                        quick_eval=True,  # Quick evaluation untuk seed search
-                    )
-                    
-                    # Quick evaluation untuk order ini
-                    resid_vals = residual_train.values.reshape(-1, 1) if residual_train.ndim > 1 else residual_train.values.reshape(-1, 1)
-                    resid_scaled_candidate = scaler_candidate.transform(resid_vals)
-                    seed_data_candidate = resid_scaled_candidate[-18:].reshape(1, 18, 1)
-                    
-                    predicted_resid_test_candidate = predict_residuals_iterative(
-                        model_lstm_candidate,
-                        scaler_candidate,
-                        seed_data_candidate,
-                        n_steps=len(test),
-                        window=18,
-                    )
-                    
-                    hybrid_pred_test_candidate = arimax_pred_test + predicted_resid_test_candidate
-                    hybrid_metrics_candidate = calculate_metrics(y_true_test, hybrid_pred_test_candidate)
-                    hybrid_mape_candidate = hybrid_metrics_candidate['mape']
+            # Semua kandidat dilatih paralel di process pool (quick eval, tanpa menyimpan ke disk),
+            # tetapi hasilnya diproses sesuai urutan kandidat sehingga aturan early stop di bawah
+            # tetap sama; kandidat yang belum selesai dibatalkan saat keluar dari blok `with`
+            seed_search = SeedSearch(
+                residual_train.iloc[:, 0] if residual_train.ndim > 1 else residual_train,
+                residual_val.iloc[:, 0] if residual_val is not None and residual_val.ndim > 1 else residual_val,
+                optimal_seed_candidates,
+                n_steps=len(test),
+                window=18,
+            )
+            with seed_search:
+                for seed_candidate, candidate_future in seed_search:
+                    seeds_tried += 1
+                    try:
+                        # Hasil training LSTM dengan seed ini (QUICK EVAL: epochs=10, patience=5)
+                        candidate = candidate_future.result()
+                        scaler_candidate = candidate['scaler']
+                        predicted_resid_test_candidate = candidate['predicted_resid']
                     
-                    log_msg = f'Order {order}, Seed {seed_candidate}: Hybrid MAPE = {hybrid_mape_candidate:.4f}% (ARIMAX = {arimax_mape:.4f}%)'
-                    logging.info(log_msg)
-                    seed_search_logs.append(log_msg)
+                        hybrid_pred_test_candidate = arimax_pred_test + predicted_resid_test_candidate
+                        hybrid_metrics_candidate = calculate_metrics(y_true_test, hybrid_pred_test_candidate)
+                        hybrid_mape_candidate = hybrid_metrics_candidate['mape']
                     
-                    # Update best jika lebih baik (baik lebih rendah dari best sebelumnya, atau lebih dekat ke ARIMAX)
-                    if hybrid_mape_candidate < best_hybrid_mape:
-                        best_hybrid_mape = hybrid_mape_candidate
-                        best_seed = seed_candidate
-                        best_model_lstm = model_lstm_candidate
-                        best_scaler = scaler_candidate
-                        improvement = ((best_hybrid_mape - arimax_mape) / arimax_mape) * 100 if arimax_mape > 0 else 0
-                        log_msg = f'New best seed for order {order}: {best_seed} with MAPE = {best_hybrid_mape:.4f}% (vs ARIMAX {arimax_mape:.4f}%, diff: {improvement:+.2f}%)'
+                        log_msg = f'Order {order}, Seed {seed_candidate}: Hybrid MAPE = {hybrid_mape_candidate:.4f}% (ARIMAX = {arimax_mape:.4f}%)'
                         logging.info(log_msg)
                         seed_search_logs.append(log_msg)
-                        
-                        # Early stopping yang lebih agresif untuk mempercepat pencarian
-                        # Stop jika: hybrid MAPE <= ARIMAX MAPE (LSTM membantu), atau hybrid MAPE < 25%
-                        if hybrid_mape_candidate <= arimax_mape:
-                            log_msg = f'Found optimal seed ({best_seed}) for order {order}: Hybrid MAPE ({best_hybrid_mape:.4f}%) <= ARIMAX MAPE ({arimax_mape:.4f}%) - LSTM HELPING!'
+                    
+                        # Update best jika lebih baik (baik lebih rendah dari best sebelumnya, atau lebih dekat ke ARIMAX)
+                        if hybrid_mape_candidate < best_hybrid_mape:
+                            best_hybrid_mape = hybrid_mape_candidate
+                            best_seed = seed_candidate
+                            best_weights = candidate['weights']
+                            best_scaler = scaler_candidate
+                            best_candidate = candidate
+                            improvement = ((best_hybrid_mape - arimax_mape) / arimax_mape) * 100 if arimax_mape > 0 else 0
+                            log_msg = f'New best seed for order {order}: {best_seed} with MAPE = {best_hybrid_mape:.4f}% (vs ARIMAX {arimax_mape:.4f}%, diff: {improvement:+.2f}%)'
                             logging.info(log_msg)
                             seed_search_logs.append(log_msg)
-                            break
-                        if best_hybrid_mape < 25.0:
-                            log_msg = f'Found good seed ({best_seed}) for order {order}: Hybrid MAPE ({best_hybrid_mape:.4f}%) < 25%, stopping search'
+                        
+                            # Early stopping yang lebih agresif untuk mempercepat pencarian
+                            # Stop jika: hybrid MAPE <= ARIMAX MAPE (LSTM membantu), atau hybrid MAPE < 25%
+                            if hybrid_mape_candidate <= arimax_mape:
+                                log_msg = f'Found optimal seed ({best_seed}) for order {order}: Hybrid MAPE ({best_hybrid_mape:.4f}%) <= ARIMAX MAPE ({arimax_mape:.4f}%) - LSTM HELPING!'
+                                logging.info(log_msg)
+                                seed_search_logs.append(log_msg)
+                                break
+                            if best_hybrid_mape < 25.0:
+                                log_msg = f'Found good seed ({best_seed}) for order {order}: Hybrid MAPE ({best_hybrid_mape:.4f}%) < 25%, stopping search'
+                                logging.info(log_msg)
+                                seed_search_logs.append(log_msg)
+                                break
+                    
+                        # Early stop jika sudah mencoba 8 seed pertama dan semua buruk
+                        # Ini untuk menghindari timeout jika LSTM tidak membantu untuk order ini
+                        # Tapi tetap coba lebih banyak seed untuk memastikan kita menemukan yang terbaik
+                        if seeds_tried >= 8 and best_hybrid_mape > arimax_mape * 1.10:
+                            # Jika 8 seed pertama semua menghasilkan hybrid MAPE > 110% dari ARIMAX MAPE, stop
+                            # Kemungkinan LSTM tidak membantu untuk order ini, gunakan seed terbaik yang ditemukan
+                            log_msg = f'First {seeds_tried} seeds produce Hybrid MAPE > 110% of ARIMAX MAPE for order {order}, stopping search early to avoid timeout'
                             logging.info(log_msg)
                             seed_search_logs.append(log_msg)
                             break
-                    
-                    # Early stop jika sudah mencoba 8 seed pertama dan semua buruk
-                    # Ini untuk menghindari timeout jika LSTM tidak membantu untuk order ini
-                    # Tapi tetap coba lebih banyak seed untuk memastikan kita menemukan yang terbaik
-                    if seeds_tried >= 8 and best_hybrid_mape > arimax_mape * 1.10:
-                        # Jika 8 seed pertama semua menghasilkan hybrid MAPE > 110% dari ARIMAX MAPE, stop
-                        # Kemungkinan LSTM tidak membantu untuk order ini, gunakan seed terbaik yang ditemukan
-                        log_msg = f'First {seeds_tried} seeds produce Hybrid MAPE > 110% of ARIMAX MAPE for order {order}, stopping search early to avoid timeout'
-                        logging.info(log_msg)
-                        seed_search_logs.append(log_msg)
-                        break
                             
-                except Exception as e:
-                    log_msg = f'Error with order {order}, seed {seed_candidate}: {str(e)}'
-                    logging.warning(log_msg)
-                    seed_search_logs.append(log_msg)
-                    continue
+                    except Exception as e:
+                        log_msg = f'Error with order {order}, seed {seed_candidate}: {str(e)}'
+                        logging.warning(log_msg)
+                        seed_search_logs.append(log_msg)
+                        continue
             
             if best_seed is None:
                 # Fallback ke seed 123 jika semua gagal
@@ -658,8 +864,9 @@ async def train_hybrid_sync(request: HybridTrainRequest = Body(default=None)):
                 logging.warning(log_msg)
                 seed_search_logs.append(log_msg)
                 lstm_seed = 123
-                best_model_lstm = None
+                best_weights = None
                 best_scaler = None
+                best_candidate = None
                 best_hybrid_mape = float('inf')
             else:
                 lstm_seed = best_seed
@@ -672,7 +879,7 @@ async def train_hybrid_sync(request: HybridTrainRequest = Body(default=None)):
         # Training ulang dengan 10 epochs untuk mendapatkan training history lengkap
         # Jika seed search menemukan model dengan Hybrid MAPE <= ARIMAX MAPE, gunakan model tersebut
         use_best_model_from_search = (
-            best_model_lstm is not None 
+            best_weights is not None 
             and best_scaler is not None 
             and best_hybrid_mape <= arimax_mape * 1.05  # Gunakan jika Hybrid MAPE <= 105% dari ARIMAX (LSTM membantu atau netral)
         )
@@ -683,14 +890,19 @@ async def train_hybrid_sync(request: HybridTrainRequest = Body(default=None)):
             log_msg = f'Using best model from seed search (seed {lstm_seed}, Hybrid MAPE {best_hybrid_mape:.4f}% <= ARIMAX {arimax_mape:.4f}%)'
             logging.info(log_msg)
             seed_search_logs.append(log_msg)
-            model_lstm = best_model_lstm
+            model_lstm = restore_lstm_model(best_weights, window=18, lstm_units=24)
             scaler = best_scaler
             # Set hybrid_mape awal dari seed search (akan di-update setelah evaluasi ulang)
             hybrid_mape_from_search = best_hybrid_mape
             
-            # IMPORTANT: Re-train dengan full epochs (10) untuk mendapatkan training history lengkap
-            # Meskipun model dari seed search sudah bagus, kita perlu training history untuk dokumentasi
-            log_msg = f'Re-training with full epochs (10) to get complete training history (seed {lstm_seed})'
+            # Lanjutkan training kandidat pemenang (bobot, state optimizer, early stopping) dari
+            # epoch terakhir quick eval sampai full epochs, tanpa mengulang epoch yang sudah dilatih.
+            # Jika state kandidat tidak tersedia (mode 'replicas'), training ulang dari awal.
+            warm_start = best_candidate if best_candidate is not None and best_candidate.get('optimizer_state') is not None else None
+            if warm_start is not None:
+                log_msg = f"Continuing seed search model from epoch {warm_start['training_history']['epochs_trained']} to full epochs (15) (seed {lstm_seed})"
+            else:
+                log_msg = f'Re-training with full epochs (10) to get complete training history (seed {lstm_seed})'
             logging.info(log_msg)
             seed_search_logs.append(log_msg)
             model_lstm, scaler, training_history = train_lstm_residual(
@@ -703,6 +915,7 @@ async def train_hybrid_sync(request: HybridTrainRequest = Body(default=None)):
                 seed=lstm_seed,  # Gunakan seed yang sama dari seed search
                 residual_val=residual_val.iloc[:, 0] if residual_val is not None and residual_val.ndim > 1 else residual_val,
                 quick_eval=False,  # Full training dengan 10 epochs
+                warm_start=warm_start,
             )
         else:
             # Train final model dengan epochs penuh (10 epochs) untuk performa optimal
@@ -723,11 +936,11 @@ async def train_hybrid_sync(request: HybridTrainRequest = Body(default=None)):
             )
             hybrid_mape_from_search = None
         
-        # Clear model cache since models have been retrained
-        clear_model_cache()
+        # Publikasikan model sebagai bundle baru dan hot-swap cache serving
+        publish_model_bundle({'source': 'train/hybrid/sync', 'order': list(order), 'lstm_seed': lstm_seed})
         
-        # Reload models to cache
-        load_models_to_cache()
+        # Tulis artefak evaluasi untuk /evaluate dan /residual-predictions
+        refresh_evaluation_artifact()
         
         # IMPORTANT: Calculate Hybrid MAPE on TEST SET (not training set)
         # This ensures fair comparison with ARIMAX MAPE which is also calculated on test set
@@ -783,11 +996,11 @@ async def train_hybrid_sync(request: HybridTrainRequest = Body(default=None)):
                     seed_search_logs.append(warning_msg)
                     
                     # Gunakan model dari seed search yang lebih baik
-                    if best_model_lstm is not None and best_scaler is not None:
+                    if best_weights is not None and best_scaler is not None:
                         log_msg = f'Switching to model from seed search (seed {best_seed}) due to better performance'
                         logging.info(log_msg)
                         seed_search_logs.append(log_msg)
-                        model_lstm = best_model_lstm
+                        model_lstm = restore_lstm_model(best_weights, window=18, lstm_units=24)
                         scaler = best_scaler
                         
                         # Re-evaluate dengan model dari seed search
@@ -925,24 +1138,24 @@ async def test_learning_rates(
     Returns:
         Dictionary dengan hasil perbandingan untuk setiap learning rate
     """
+    return await training_pool.run(_test_learning_rates_job, use_same_seed)
+
+
+def _test_learning_rates_job(use_same_seed: bool) -> dict:
+    """Learning rate comparison (runs in the training process pool)."""
     try:
         # Load datasets
-        data_dir = get_data_dir()
-        train_path = data_dir / 'train_dataset.csv'
-        validation_path = data_dir / 'validation_dataset.csv'
-        test_path = data_dir / 'test_dataset.csv'
-        
-        if not train_path.exists() or not test_path.exists():
+        if not split_exists('train') or not split_exists('test'):
             raise HTTPException(
                 status_code=404,
                 detail='Train or test dataset not found. Please upload dataset first.',
             )
         
-        train = load_dataset('train_dataset.csv')
-        test = load_dataset('test_dataset.csv')
+        train = load_split('train')
+        test = load_split('test')
         validation = None
-        if validation_path.exists():
-            validation = load_dataset('validation_dataset.csv')
+        if split_exists('validation'):
+            validation = load_split('validation')
         
         # Step 1: Train ARIMAX (gunakan order yang sudah tersimpan atau default)
         saved_order = load_arimax_order_metadata()
@@ -955,12 +1168,16 @@ async def test_learning_rates(
         
         arimax_res, fitted_train, residual_train = train_arimax(train, order=order)
         residual_train = residual_train.dropna()
-        residual_train.to_csv(str(data_dir / 'residual_train.csv'))
+        save_dataset(residual_train, 'residual_train.csv')
         
         # Calculate ARIMAX MAPE on test set
         y_true_test = test['wave_height'].values
-        arimax_forecast = arimax_res.get_forecast(steps=len(test), exog=test[['wind_speed']])
-        arimax_pred_test = arimax_forecast.predicted_mean.values
+        # Forecast ARIMAX for validation and test once (one state-space pass); shared by metrics and residuals
+        arimax_forecasts = forecast_arimax_horizons(arimax_res, {
+            'test': test[['wind_speed']],
+            'validation': validation[['wind_speed']] if validation is not None and len(validation) > 0 else None,
+        })
+        arimax_pred_test = arimax_forecasts['test']
         arimax_metrics = calculate_metrics(y_true_test, arimax_pred_test)
         arimax_mape = arimax_metrics['mape']
         
@@ -968,8 +1185,7 @@ async def test_learning_rates(
         residual_val = None
         if validation is not None and len(validation) > 0:
             y_true_val = validation['wave_height'].values
-            arimax_forecast_val = arimax_res.get_forecast(steps=len(validation), exog=validation[['wind_speed']])
-            arimax_pred_val = arimax_forecast_val.predicted_mean.values
+            arimax_pred_val = arimax_forecasts['validation']
             residual_val = pd.Series(y_true_val - arimax_pred_val, index=validation.index)
             residual_val = residual_val.dropna()
         
@@ -1196,24 +1412,24 @@ async def test_arimax_lr_combination(
         - improvement_percent: Persentase peningkatan
         - training_history: History training LSTM (loss, val_loss, epochs)
     """
+    return await training_pool.run(_test_arimax_lr_combination_job, p, d, q, learning_rate, seed)
+
+
+def _test_arimax_lr_combination_job(p: int, d: int, q: int, learning_rate: float, seed: int) -> dict:
+    """ARIMAX order + learning rate combination test (runs in the training process pool)."""
     try:
         # Load datasets
-        data_dir = get_data_dir()
-        train_path = data_dir / 'train_dataset.csv'
-        validation_path = data_dir / 'validation_dataset.csv'
-        test_path = data_dir / 'test_dataset.csv'
-        
-        if not train_path.exists() or not test_path.exists():
+        if not split_exists('train') or not split_exists('test'):
             raise HTTPException(
                 status_code=404,
                 detail='Train or test dataset not found. Please upload dataset first.',
             )
         
-        train = load_dataset('train_dataset.csv')
-        test = load_dataset('test_dataset.csv')
+        train = load_split('train')
+        test = load_split('test')
         validation = None
-        if validation_path.exists():
-            validation = load_dataset('validation_dataset.csv')
+        if split_exists('validation'):
+            validation = load_split('validation')
         
         order = (p, d, q)
         import logging
@@ -1222,12 +1438,16 @@ async def test_arimax_lr_combination(
         # Step 1: Train ARIMAX dengan order yang ditentukan
         arimax_res, fitted_train, residual_train = train_arimax(train, order=order)
         residual_train = residual_train.dropna()
-        residual_train.to_csv(str(data_dir / 'residual_train.csv'))
+        save_dataset(residual_train, 'residual_train.csv')
         
         # Calculate ARIMAX MAPE on test set
         y_true_test = test['wave_height'].values
-        arimax_forecast = arimax_res.get_forecast(steps=len(test), exog=test[['wind_speed']])
-        arimax_pred_test = arimax_forecast.predicted_mean.values
+        # Forecast ARIMAX for validation and test once (one state-space pass); shared by metrics and residuals
+        arimax_forecasts = forecast_arimax_horizons(arimax_res, {
+            'test': test[['wind_speed']],
+            'validation': validation[['wind_speed']] if validation is not None and len(validation) > 0 else None,
+        })
+        arimax_pred_test = arimax_forecasts['test']
         arimax_metrics = calculate_metrics(y_true_test, arimax_pred_test)
         arimax_mape = arimax_metrics['mape']
         
@@ -1235,8 +1455,7 @@ async def test_arimax_lr_combination(
         residual_val = None
         if validation is not None and len(validation) > 0:
             y_true_val = validation['wave_height'].values
-            arimax_forecast_val = arimax_res.get_forecast(steps=len(validation), exog=validation[['wind_speed']])
-            arimax_pred_val = arimax_forecast_val.predicted_mean.values
+            arimax_pred_val = arimax_forecasts['validation']
             residual_val = pd.Series(y_true_val - arimax_pred_val, index=validation.index)
             residual_val = residual_val.dropna()
         
@@ -1309,6 +1528,514 @@ async def test_arimax_lr_combination(
         raise HTTPException(status_code=500, detail=error_detail)
 
 
+class LSTMHyperparameterSearchRequest(BaseModel):
+    """Request model untuk pencarian hyperparameter LSTM residual (successive halving)."""
+    windows: list[int] = [12, 18, 24]
+    lstm_units: list[int] = [16, 24, 32]
+    learning_rates: list[float] = [0.01, 0.001]
+    batch_sizes: list[int] = [16, 32]
+    seeds: list[int] = [42, 123, 789]
+    n_configs: int = 27  # Jumlah konfigurasi awal (sampel dari grid)
+    eta: int = 3  # Faktor halving: 1/eta konfigurasi terbaik lanjut ke rung berikutnya
+    min_epochs: int = 2  # Epoch rung pertama (rung terakhir = budget quick_eval)
+    budget_epochs: int = 150  # Budget total epoch training
+    time_budget_seconds: float | None = 240.0  # Budget waktu total (di bawah timeout Laravel 300 detik)
+    sample_seed: int = 0
+    p: int | None = None  # Order ARIMAX (default: order tersimpan atau (2,1,1))
+    d: int | None = None
+    q: int | None = None
+
+
+# Pencarian hyperparameter LSTM residual (window, units, learning rate, batch size, seed)
+@app.post('/test/lstm-hyperparameters')
+async def test_lstm_hyperparameters(request: LSTMHyperparameterSearchRequest = Body(default=None)):
+    """
+    Mencari hyperparameter LSTM residual dengan successive halving di bawah budget komputasi.
+    
+    Proses:
+    1. Train ARIMAX (order dari request, order tersimpan, atau (2,1,1)) tanpa menimpa model
+    2. Ambil sampel n_configs konfigurasi dari grid window x lstm_units x learning_rate x batch_size x seed
+    3. Latih semua konfigurasi beberapa epoch, lanjutkan hanya 1/eta terbaik ke rung berikutnya
+       (training dilanjutkan dari state rung sebelumnya, rung terakhir = budget quick_eval)
+    4. Ranking berdasarkan Hybrid MAPE validation (test jika validation tidak tersedia)
+    
+    Model hasil pencarian tidak disimpan; pakai konfigurasi terbaik untuk training berikutnya.
+    
+    Returns:
+        Dictionary dengan metric, jadwal rung, pemakaian budget, leaderboard, dan konfigurasi terbaik
+    """
+    return await training_pool.run(_test_lstm_hyperparameters_job, request or LSTMHyperparameterSearchRequest())
+
+
+def _test_lstm_hyperparameters_job(request: LSTMHyperparameterSearchRequest) -> dict:
+    """LSTM hyperparameter search (runs in the training process pool)."""
+    search_space = {
+        'window': request.windows,
+        'lstm_units': request.lstm_units,
+        'learning_rate': request.learning_rates,
+        'batch_size': request.batch_sizes,
+        'seed': request.seeds,
+    }
+    empty = [name for name, values in search_space.items() if not values]
+    if empty:
+        raise HTTPException(status_code=400, detail=f'Search space must not be empty: {", ".join(empty)}')
+    if min(request.windows) < 1 or min(request.lstm_units) < 1 or min(request.batch_sizes) < 1:
+        raise HTTPException(status_code=400, detail='windows, lstm_units and batch_sizes must be positive')
+
+    if not split_exists('train') or not split_exists('test'):
+        raise HTTPException(
+            status_code=404,
+            detail='Train or test dataset not found. Please upload dataset first.',
+        )
+    try:
+        train = load_split('train')
+        test = load_split('test')
+        validation = None
+        if split_exists('validation'):
+            validation = load_split('validation')
+        if validation is not None and len(validation) == 0:
+            validation = None
+        
+        if request.p is not None and request.d is not None and request.q is not None:
+            order = (request.p, request.d, request.q)
+        else:
+            order = load_arimax_order_metadata() or (2, 1, 1)
+        
+        # ARIMAX tidak disimpan ke direktori models (pencarian tidak mengubah model yang dilayani)
+        arimax_res, fitted_train, residual_train = train_arimax(train, order=order, save=False)
+        residual_train = residual_train.dropna()
+        arimax_forecasts = forecast_arimax_horizons(arimax_res, {
+            'test': test[['wind_speed']],
+            'validation': validation[['wind_speed']] if validation is not None else None,
+        })
+        y_true_test = test['wave_height'].values
+        y_true_val = validation['wave_height'].values if validation is not None else None
+        residual_val = None
+        if validation is not None:
+            residual_val = pd.Series(y_true_val - arimax_forecasts['validation'], index=validation.index).dropna()
+        
+        result = successive_halving_search(
+            residual_train,
+            residual_val,
+            arimax_forecasts['test'],
+            y_true_test,
+            arimax_forecasts.get('validation'),
+            y_true_val,
+            search_space,
+            n_configs=request.n_configs,
+            eta=request.eta,
+            min_epochs=request.min_epochs,
+            budget_epochs=request.budget_epochs,
+            time_budget_seconds=request.time_budget_seconds,
+            sample_seed=request.sample_seed,
+        )
+        return {
+            'status': 'success',
+            'arimax_order': list(order),
+            'arimax_mape': float(calculate_metrics(y_true_test, arimax_forecasts['test'])['mape']),
+            **result,
+        }
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        import traceback
+        error_detail = f'LSTM hyperparameter search error: {str(e)}\nTraceback: {traceback.format_exc()}'
+        raise HTTPException(status_code=500, detail=error_detail)
+
+
+class TrainingProfileVariant(BaseModel):
+    """Satu varian profil training untuk benchmark."""
+    profile: str = 'default'  # 'default' atau 'fast'
+    jit_compile: Optional[bool] = None  # Override XLA (None = sesuai profil)
+    deterministic: Optional[bool] = None  # Override op determinism (None = sesuai profil)
+
+
+class TrainingProfileBenchmarkRequest(BaseModel):
+    """Request model untuk benchmark profil training LSTM residual."""
+    variants: list[TrainingProfileVariant] = [
+        TrainingProfileVariant(profile='default'),
+        TrainingProfileVariant(profile='fast'),
+        TrainingProfileVariant(profile='fast', jit_compile=True),
+    ]
+    epochs: int = 15
+    window: int = 18
+    lstm_units: int = 24
+    batch_size: int = 16
+    learning_rate: float = 0.001
+    seed: int = 42
+    p: int | None = None  # Order ARIMAX (default: order tersimpan atau (2,1,1))
+    d: int | None = None
+    q: int | None = None
+
+
+# Benchmark waktu training per epoch: profil default vs fast (batch besar, XLA, non-deterministik)
+@app.post('/test/training-profiles')
+async def test_training_profiles(request: TrainingProfileBenchmarkRequest = Body(default=None)):
+    """
+    Membandingkan wall-clock training LSTM residual per epoch antar profil training pada data yang sama.
+    
+    Proses:
+    1. Train ARIMAX (order dari request, order tersimpan, atau (2,1,1)) tanpa menimpa model
+    2. Latih LSTM residual dengan setiap varian profil (jumlah epoch sama, tanpa early stopping)
+    3. Laporkan waktu epoch pertama (termasuk kompilasi), median epoch berikutnya, total waktu,
+       speedup terhadap varian pertama, serta val_loss dan Hybrid MAPE test
+    
+    Model hasil benchmark tidak disimpan.
+    
+    Returns:
+        Dictionary dengan pengaturan efektif dan hasil waktu setiap varian
+    """
+    return await training_pool.run(_test_training_profiles_job, request or TrainingProfileBenchmarkRequest())
+
+
+def _test_training_profiles_job(request: TrainingProfileBenchmarkRequest) -> dict:
+    """Training profile benchmark (runs in the training process pool)."""
+    if not request.variants:
+        raise HTTPException(status_code=400, detail='variants must not be empty')
+    if request.epochs < 2 or request.window < 1 or request.lstm_units < 1 or request.batch_size < 1:
+        raise HTTPException(status_code=400, detail='epochs must be >= 2; window, lstm_units and batch_size must be positive')
+    unknown = sorted({variant.profile for variant in request.variants} - set(TRAINING_PROFILES))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f'Unknown training profile: {", ".join(unknown)}. Use one of {", ".join(TRAINING_PROFILES)}.')
+
+    if not split_exists('train') or not split_exists('test'):
+        raise HTTPException(
+            status_code=404,
+            detail='Train or test dataset not found. Please upload dataset first.',
+        )
+    try:
+        train = load_split('train')
+        test = load_split('test')
+        validation = None
+        if split_exists('validation'):
+            validation = load_split('validation')
+        if validation is not None and len(validation) == 0:
+            validation = None
+        
+        if request.p is not None and request.d is not None and request.q is not None:
+            order = (request.p, request.d, request.q)
+        else:
+            order = load_arimax_order_metadata() or (2, 1, 1)
+        
+        # ARIMAX tidak disimpan ke direktori models (benchmark tidak mengubah model yang dilayani)
+        arimax_res, fitted_train, residual_train = train_arimax(train, order=order, save=False)
+        residual_train = residual_train.dropna()
+        arimax_forecasts = forecast_arimax_horizons(arimax_res, {
+            'test': test[['wind_speed']],
+            'validation': validation[['wind_speed']] if validation is not None else None,
+        })
+        residual_val = None
+        if validation is not None:
+            residual_val = pd.Series(
+                validation['wave_height'].values - arimax_forecasts['validation'], index=validation.index,
+            ).dropna()
+        
+        result = benchmark_training_profiles(
+            residual_train,
+            residual_val,
+            arimax_forecasts['test'],
+            test['wave_height'].values,
+            variants=[variant.model_dump() for variant in request.variants],
+            epochs=request.epochs,
+            window=request.window,
+            lstm_units=request.lstm_units,
+            batch_size=request.batch_size,
+            learning_rate=request.learning_rate,
+            seed=request.seed,
+        )
+        return {
+            'status': 'success',
+            'arimax_order': list(order),
+            **result,
+        }
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        import traceback
+        error_detail = f'Training profile benchmark error: {str(e)}\nTraceback: {traceback.format_exc()}'
+        raise HTTPException(status_code=500, detail=error_detail)
+
+
+class RefreshObservation(BaseModel):
+    """Satu observasi baru untuk refresh model."""
+    timestamp: str
+    wave_height: float
+    wind_speed: float
+
+
+class ARIMAXRefreshRequest(BaseModel):
+    """Request model untuk refresh inkremental ARIMAX."""
+    observations: list[RefreshObservation] = []
+    force_refit: bool = False  # True = selalu fitting penuh (MLE) pada seluruh history
+
+
+# Refresh inkremental ARIMAX dengan observasi baru (tanpa upload ulang dan training ulang)
+@app.post('/refresh/arimax')
+async def refresh_arimax_endpoint(request: ARIMAXRefreshRequest):
+    """
+    Memperbarui model ARIMAX yang sedang dilayani dengan observasi baru.
+    
+    Proses:
+    1. Observasi baru divalidasi dan ditambahkan ke dataset refresh_observations
+    2. Parameter ARIMAX dipertahankan; model diperpanjang (SARIMAXResults.extend) dengan
+       observasi yang belum dilihatnya, sehingga biaya sebanding dengan jumlah data baru
+    3. Fitting penuh pada seluruh history hanya jika diminta (force_refit), terjadwal
+       (ARIMAX_REFIT_INTERVAL_HOURS), atau drift terdeteksi (ARIMAX_DRIFT_RATIO)
+    4. Hasilnya dipublikasikan sebagai bundle serving baru bersama model LSTM yang sama;
+       forecast /predict dimulai setelah observasi terakhir
+    
+    Evaluasi test set (/evaluate) tetap milik bundle hasil training asal.
+    
+    Returns:
+        Dictionary dengan mode ('extended', 'refit', 'unchanged'), alasan refit, statistik drift, dan versi bundle
+    """
+    result = await training_pool.run(_refresh_arimax_job, request)
+    if result.get('version') is not None:
+        await reload_models_after_training()
+    return result
+
+
+def _refresh_arimax_job(request: ARIMAXRefreshRequest) -> dict:
+    """Incremental ARIMAX refresh (runs in the training process pool)."""
+    import tempfile
+
+    bundle_version, model_dir = resolve_serving_bundle()
+    if bundle_version is None:
+        raise HTTPException(status_code=404, detail='No published model bundle found. Please train the hybrid model first.')
+    try:
+        try:
+            observations = pd.DataFrame(
+                [observation.model_dump() for observation in request.observations],
+                columns=['timestamp', 'wave_height', 'wind_speed'],
+            )
+            observations.index = pd.DatetimeIndex(pd.to_datetime(observations.pop('timestamp')), name='timestamp')
+        except (ValueError, TypeError) as e:
+            raise InvalidObservationsError(f'Invalid observation timestamp: {e}')
+
+        with tempfile.TemporaryDirectory(dir=get_models_dir(), prefix='.refresh-') as staging_dir:
+            staging_dir = Path(staging_dir)
+            result = refresh_arimax(model_dir, observations, staging_dir, force_refit=request.force_refit)
+            version = None
+            if result['mode'] != 'unchanged':
+                # Model LSTM dan scaler tetap dari bundle asal; file ARIMAX dan seed residual dari refresh
+                files = {filename: model_dir / filename for filename in ('lstm_residual_model.h5', 'residual_scaler.save', 'lstm_training_history.json')}
+                files.update({filename: staging_dir / filename for filename in REFRESH_OUTPUT_FILES})
+                version = publish_model_bundle(
+                    {
+                        'source': 'refresh/arimax',
+                        'parent_version': bundle_version,
+                        'evaluation_base': get_evaluation_base(bundle_version),
+                        'mode': result['mode'],
+                        'refit_reason': result['refit_reason'],
+                        'sample_end': result['sample_end'],
+                    },
+                    files=files,
+                )
+        return {
+            'status': 'success',
+            'parent_version': bundle_version,
+            'version': version,
+            **result,
+        }
+    except InvalidObservationsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        import traceback
+        error_detail = f'ARIMAX refresh error: {str(e)}\nTraceback: {traceback.format_exc()}'
+        raise HTTPException(status_code=500, detail=error_detail)
+
+
+class LSTMFineTuneRequest(BaseModel):
+    """Request model untuk fine-tuning LSTM residual pada residual baru."""
+    epochs: int = 5
+    recent_rows: int = 500  # Jumlah maksimum residual baru (terakhir) yang dilatih
+    replay_ratio: float = 1.0  # Jumlah window replay (residual lama) relatif terhadap window baru
+    holdout_rows: int | None = None  # None = min(48, 25% residual baru)
+    learning_rate: float = 0.0005
+    batch_size: int = 16
+    seed: int = 42
+
+
+# Fine-tuning LSTM residual pada residual baru setelah refresh ARIMAX (tanpa training ulang penuh)
+@app.post('/refresh/lstm')
+async def refresh_lstm_endpoint(request: LSTMFineTuneRequest = Body(default=None)):
+    """
+    Fine-tune model LSTM yang sedang dilayani pada residual baru dari /refresh/arimax.
+    
+    Proses:
+    1. Muat model LSTM dan scaler bundle yang sedang dilayani (scaler di-fit ulang hanya jika
+       residual baru keluar dari rentangnya)
+    2. Latih beberapa epoch pada window residual terbaru + sampel replay window lama
+    3. Bandingkan Hybrid MAPE pada holdout (residual baru paling akhir) antara model saat ini
+       dan kandidat
+    4. Kandidat dipublikasikan sebagai bundle baru hanya jika MAPE holdout tidak memburuk
+    
+    Returns:
+        Dictionary dengan promoted, MAPE holdout saat ini vs kandidat, jumlah window, dan versi bundle
+    """
+    result = await training_pool.run(_refresh_lstm_job, request or LSTMFineTuneRequest())
+    if result.get('version') is not None:
+        await reload_models_after_training()
+    return result
+
+
+def _refresh_lstm_job(request: LSTMFineTuneRequest) -> dict:
+    """Incremental LSTM fine-tuning (runs in the training process pool)."""
+    import tempfile
+
+    if request.epochs < 1 or request.recent_rows < 1 or request.batch_size < 1 or request.replay_ratio < 0:
+        raise HTTPException(status_code=400, detail='epochs, recent_rows and batch_size must be positive; replay_ratio must be >= 0')
+    bundle_version, model_dir = resolve_serving_bundle()
+    if bundle_version is None:
+        raise HTTPException(status_code=404, detail='No published model bundle found. Please train the hybrid model first.')
+    try:
+        evaluation_base = get_evaluation_base(bundle_version)
+        actual = load_observation_history()['wave_height']
+        with tempfile.TemporaryDirectory(dir=get_models_dir(), prefix='.finetune-') as staging_dir:
+            staging_dir = Path(staging_dir)
+            result = finetune_lstm_residual(
+                model_dir,
+                actual,
+                staging_dir,
+                base_dir=get_bundle_dir(evaluation_base),
+                epochs=request.epochs,
+                recent_rows=request.recent_rows,
+                replay_ratio=request.replay_ratio,
+                holdout_rows=request.holdout_rows,
+                learning_rate=request.learning_rate,
+                batch_size=request.batch_size,
+                seed=request.seed,
+            )
+            version = None
+            if result['promoted']:
+                # File ARIMAX dan seed residual tetap dari bundle asal; file LSTM dari fine-tuning
+                files = {filename: model_dir / filename for filename in ('arimax_model.pkl', 'arimax_model_metadata.json')}
+                residual_path = get_residual_train_path(model_dir)
+                files[residual_path.name] = residual_path
+                files.update({filename: staging_dir / filename for filename in FINETUNE_OUTPUT_FILES})
+                version = publish_model_bundle(
+                    {
+                        'source': 'refresh/lstm',
+                        'parent_version': bundle_version,
+                        'evaluation_base': evaluation_base,
+                        'holdout_mape': result['candidate_holdout_mape'],
+                    },
+                    files=files,
+                )
+        return {
+            'status': 'success',
+            'parent_version': bundle_version,
+            'version': version,
+            **result,
+        }
+    except NotEnoughResidualsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        import traceback
+        error_detail = f'LSTM fine-tuning error: {str(e)}\nTraceback: {traceback.format_exc()}'
+        raise HTTPException(status_code=500, detail=error_detail)
+
+
+# Versi artefak evaluasi: berubah jika model atau test set berubah
+def get_evaluation_version(model_version: str | None = None) -> str | None:
+    """Return the evaluation version (model version + test dataset fingerprint)."""
+    model_version = model_version or get_model_version()
+    if model_version is None:
+        return None
+    # Bundle hasil refresh memakai evaluasi bundle training asalnya
+    if get_bundle_dir(model_version) is not None:
+        model_version = get_evaluation_base(model_version)
+    test_version = fingerprint_files(get_snapshot_paths())
+    return f'{model_version}:{test_version}'
+
+
+# Menghitung ulang evaluasi test set dari model di disk dan menyimpannya sebagai artefak
+def compute_evaluation_artifact() -> dict:
+    """
+    Compute the test-set evaluation from the saved models and persist it.
+
+    Menyimpan models/evaluation_artifact.json (dibaca oleh /evaluate dan /residual-predictions)
+    serta dataset hybrid_arimax_lstm_results (data/hybrid_arimax_lstm_results.npy).
+    """
+    global _evaluation_artifact
+    bundle_version, model_dir = resolve_serving_bundle()
+    version = get_evaluation_version(bundle_version)
+    if bundle_version is not None:
+        # ARIMAX bundle hasil refresh sudah melihat data test; evaluasi memakai bundle training asalnya
+        model_dir = get_bundle_dir(get_evaluation_base(bundle_version))
+        if model_dir is None:
+            raise FileNotFoundError(f'Evaluation base bundle not found: {get_evaluation_base(bundle_version)}')
+
+    # Load test dataset
+    test = load_split('test')
+
+    # Predict ARIMAX on test set
+    arimax_res = load_arimax_model(model_dir)
+    arimax_pred = forecast_arimax_mean(arimax_res, test[['wind_speed']])
+
+    # Load LSTM model and scaler
+    model_lstm = load_lstm_model(model_dir=model_dir)
+    scaler = load_residual_scaler(model_dir)
+
+    # Get seed from residual training data
+    residual_train = read_frame(get_residual_train_path(model_dir))
+    resid_vals = residual_train.values.reshape(-1, 1) if residual_train.ndim > 1 else residual_train.values.reshape(-1, 1)
+    resid_scaled = scaler.transform(resid_vals)
+    seed = resid_scaled[-18:].reshape(1, 18, 1)
+
+    # Predict residuals iteratively
+    predicted_resid = predict_residuals_iterative(
+        model_lstm,
+        scaler,
+        seed,
+        n_steps=len(test),
+        window=18,
+    )
+
+    artifact = build_evaluation_artifact(test, arimax_pred, predicted_resid, version)
+
+    # Save results
+    results = test.copy()
+    results['pred_arimax'] = arimax_pred
+    results['pred_hybrid'] = arimax_pred + predicted_resid
+    results['residual_pred'] = predicted_resid
+    save_dataset(results, 'hybrid_arimax_lstm_results.csv')
+    save_evaluation_artifact(artifact)
+
+    _evaluation_artifact = artifact
+    return artifact
+
+
+# Mengambil artefak evaluasi: memori -> disk -> hitung ulang di process pool (hanya jika versi berubah)
+async def get_evaluation_artifact() -> dict:
+    """Return the evaluation artifact for the current model version, recomputing only if stale."""
+    global _evaluation_artifact
+    version = get_evaluation_version()
+    if version is not None:
+        if _evaluation_artifact is not None and _evaluation_artifact.get('version') == version:
+            return _evaluation_artifact
+        artifact = load_evaluation_artifact(version)
+        if artifact is not None:
+            _evaluation_artifact = artifact
+            return artifact
+    _evaluation_artifact = await training_pool.run(compute_evaluation_artifact)
+    return _evaluation_artifact
+
+
+# Menulis artefak evaluasi setelah training (kegagalan tidak menggagalkan training)
+def refresh_evaluation_artifact():
+    """Recompute the evaluation artifact after training (best-effort)."""
+    try:
+        compute_evaluation_artifact()
+    except Exception as e:
+        import logging
+        logging.warning(f'Could not refresh evaluation artifact: {e}')
+
+
 # Mengevaluasi performa model ARIMAX dan Hybrid pada test set
 # DIPAKAI: Endpoint '/evaluate' dipanggil oleh FastAPIService.evaluate
 @app.get('/evaluate')
@@ -1328,81 +2055,22 @@ async def evaluate():
         Dictionary dengan metrik ARIMAX dan Hybrid (keduanya pada test set)
     """
     try:
-        # Load test dataset
-        test = load_dataset('test_dataset.csv')
-
-        # Load ARIMAX model
-        arimax_res = load_arimax_model()
-
-        # Predict ARIMAX on test set
-        arimax_forecast = arimax_res.get_forecast(steps=len(test), exog=test[['wind_speed']])
-        arimax_pred = arimax_forecast.predicted_mean.values
-
-        # Load LSTM model and scaler
-        model_lstm = load_lstm_model()
-        scaler = load_residual_scaler()
-
-        # Get seed from residual training data
-        data_dir = get_data_dir()
-        residual_train = pd.read_csv(data_dir / 'residual_train.csv', index_col=0, parse_dates=True)
-        resid_vals = residual_train.values.reshape(-1, 1) if residual_train.ndim > 1 else residual_train.values.reshape(-1, 1)
-        resid_scaled = scaler.transform(resid_vals)
-        seed = resid_scaled[-18:].reshape(1, 18, 1)
-
-        # Predict residuals iteratively
-        predicted_resid = predict_residuals_iterative(
-            model_lstm,
-            scaler,
-            seed,
-            n_steps=len(test),
-            window=18,
-        )
-
-        # Hybrid prediction
-        hybrid_pred = arimax_pred + predicted_resid
-
-        # Calculate metrics
-        y_true = test['wave_height'].values
-        arimax_metrics = calculate_metrics(y_true, arimax_pred)
-        hybrid_metrics = calculate_metrics(y_true, hybrid_pred)
-
-        # Residual aktual dan MAPE LSTM (residual): batasan error |residual_aktual - residual_pred| / |residual_aktual|
-        residual_actual = y_true - arimax_pred
-        lstm_residual_mape = float(mape(residual_actual, predicted_resid))
-
-        # Save results
-        results = test.copy()
-        results['pred_arimax'] = arimax_pred
-        results['pred_hybrid'] = hybrid_pred
-        results['residual_pred'] = predicted_resid
-        save_dataset(results, 'hybrid_arimax_lstm_results.csv')
-
-        # Prepare detailed results for response
-        results_detail = []
-        for i in range(len(test)):
-            results_detail.append({
-                'timestamp': str(test.index[i]),
-                'actual': float(y_true[i]),
-                'arimax_pred': float(arimax_pred[i]),
-                'residual_actual': float(residual_actual[i]),
-                'residual_pred': float(predicted_resid[i]),
-                'residual_error': float(residual_actual[i] - predicted_resid[i]),
-                'hybrid_pred': float(hybrid_pred[i]),
-            })
-
+        artifact = await get_evaluation_artifact()
         return {
             'status': 'success',
             'arimax': {
-                'mape': arimax_metrics['mape'],
+                'mape': artifact['metrics']['arimax_mape'],
             },
             'hybrid': {
-                'mape': hybrid_metrics['mape'],
+                'mape': artifact['metrics']['hybrid_mape'],
             },
             'lstm': {
-                'mape_residual': lstm_residual_mape,
+                'mape_residual': artifact['metrics']['lstm_mape_residual'],
             },
-            'results': results_detail,
+            'results': artifact['rows'],
         }
+    except QueueFullError:
+        raise
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -1430,27 +2098,27 @@ async def evaluate_arimax_models(request: ARIMAXOrderRequest):
     Returns:
         Dictionary dengan hasil untuk setiap model termasuk prediksi dan MAPE
     """
+    return await training_pool.run(_evaluate_arimax_models_job, request)
+
+
+def _evaluate_arimax_models_job(request: ARIMAXOrderRequest) -> dict:
+    """ARIMAX order comparison (runs in the training process pool)."""
     try:
         # Load train, validation (if available), and test datasets
-        data_dir = get_data_dir()
-        train_path = data_dir / 'train_dataset.csv'
-        validation_path = data_dir / 'validation_dataset.csv'
-        test_path = data_dir / 'test_dataset.csv'
-        
-        if not train_path.exists() or not test_path.exists():
+        if not split_exists('train') or not split_exists('test'):
             raise HTTPException(
                 status_code=404,
                 detail='Train or test dataset not found. Please upload dataset first.',
             )
         
-        train = load_dataset('train_dataset.csv')
-        test = load_dataset('test_dataset.csv')
+        train = load_split('train')
+        test = load_split('test')
         
         # Load validation dataset if available
         validation = None
-        if validation_path.exists():
+        if split_exists('validation'):
             try:
-                validation = load_dataset('validation_dataset.csv')
+                validation = load_split('validation')
             except Exception as e:
                 import logging
                 logging.warning(f'Failed to load validation dataset: {str(e)}')
@@ -1475,16 +2143,36 @@ async def evaluate_arimax_models(request: ARIMAXOrderRequest):
         # Set seed untuk reproducibility
         np.random.seed(42)
         
+        # Fit all orders in parallel (process pool, per-order time limit); models are not
+        # written to the models directory. Evaluation below stays sequential and in request order.
+        grid_orders = [tuple(order_list) for order_list in request.orders if len(order_list) == 3]
+        grid_fits = {outcome['order']: outcome for outcome in fit_arimax_grid(train, grid_orders)}
+        
         for order_list in request.orders:
             if len(order_list) != 3:
                 continue
             p, d, q = order_list
             order = (p, d, q)
             model_name = f'ARIMAX({p},{d},{q})'
+            grid_fit = grid_fits[order]
+            convergence = {
+                'converged': grid_fit['converged'],
+                'convergence_warnings': grid_fit['convergence_warnings'],
+                'timed_out': grid_fit['timed_out'],
+                'fit_seconds': round(grid_fit['fit_seconds'], 2) if grid_fit['fit_seconds'] is not None else None,
+            }
             
             try:
-                # Train ARIMAX model with this order
-                arimax_res, fitted_train, residual_train = train_arimax(train, order=order)
+                # ARIMAX model fitted with this order (raises the captured fit error, e.g. timeout)
+                if grid_fit['error'] is not None:
+                    raise RuntimeError(grid_fit['error'])
+                arimax_res, fitted_train, residual_train = grid_fit['result']
+                
+                # Forecast validation and test once per order (shared by all metrics below)
+                arimax_forecasts = forecast_arimax_horizons(arimax_res, {
+                    'test': test[['wind_speed']],
+                    'validation': validation[['wind_speed']] if validation is not None and len(validation) > 0 else None,
+                })
                 
                 # Get model summary for parameter evaluation
                 summary = arimax_res.summary()
@@ -1555,8 +2243,7 @@ async def evaluate_arimax_models(request: ARIMAXOrderRequest):
                 mape_val = None
                 if y_true_val is not None and validation is not None and len(validation) > 0:
                     try:
-                        arimax_forecast_val = arimax_res.get_forecast(steps=len(validation), exog=validation[['wind_speed']])
-                        arimax_pred_val = arimax_forecast_val.predicted_mean.values
+                        arimax_pred_val = arimax_forecasts['validation']
                         metrics_val = calculate_metrics(y_true_val, arimax_pred_val)
                         mape_val = float(metrics_val['mape'])
                     except Exception as e:
@@ -1582,6 +2269,7 @@ async def evaluate_arimax_models(request: ARIMAXOrderRequest):
                     'mape_val': round(mape_val, 2) if mape_val is not None else None,  # MAPE on validation set (for tuning)
                     'status': status,
                     'alasan': 'Semua kriteria terpenuhi' if not alasan else '; '.join(alasan),
+                    **convergence,
                 })
                 
                 # Store model result for later use
@@ -1599,8 +2287,7 @@ async def evaluate_arimax_models(request: ARIMAXOrderRequest):
                 }
                 
                 # Predict on test set
-                arimax_forecast = arimax_res.get_forecast(steps=len(test), exog=test[['wind_speed']])
-                arimax_pred = arimax_forecast.predicted_mean.values
+                arimax_pred = arimax_forecasts['test']
                 
                 # Calculate metrics on test set (FINAL EVALUATION - for generalization assessment)
                 metrics = calculate_metrics(y_true, arimax_pred)
@@ -1610,8 +2297,7 @@ async def evaluate_arimax_models(request: ARIMAXOrderRequest):
                 metrics_val = None
                 if y_true_val is not None and validation is not None and len(validation) > 0:
                     try:
-                        arimax_forecast_val = arimax_res.get_forecast(steps=len(validation), exog=validation[['wind_speed']])
-                        arimax_pred_val = arimax_forecast_val.predicted_mean.values
+                        arimax_pred_val = arimax_forecasts['validation']
                         metrics_val = calculate_metrics(y_true_val, arimax_pred_val)
                     except Exception as e:
                         # Log error for debugging
@@ -1640,6 +2326,7 @@ async def evaluate_arimax_models(request: ARIMAXOrderRequest):
                     'bic': None,
                     'status': 'Ditolak',
                     'alasan': str(e),
+                    **convergence,
                 })
                 results[model_name] = {
                     'mape': float('inf'),
@@ -1710,6 +2397,7 @@ async def evaluate_arimax_models(request: ARIMAXOrderRequest):
                     'mape': mape_test,  # MAPE on test set (FINAL EVALUATION - generalization)
                     'gap_val_test': gap_val_test,  # Gap between validation and test (stability indicator)
                     'complexity': complexity,  # Model complexity (p+d+q) for parsimony
+                    'converged': eval_data.get('converged') if eval_data else None,  # Optimizer convergence (informational)
                 })
         
         # Find best model: STRICTLY by Validation MAPE (MAPE validasi).
@@ -1869,6 +2557,45 @@ async def evaluate_arimax_models(request: ARIMAXOrderRequest):
         raise HTTPException(status_code=500, detail=f'Evaluation error: {str(e)}')
 
 
+# Memastikan model serving sudah ada di cache (memuat dari disk jika belum)
+def ensure_models_cached() -> dict:
+    """
+    Return a snapshot of the model cache, loading the serving bundle first if
+    it is not cached yet.
+    """
+    global _model_cache
+    # Ambil referensi sekali: semua akses berikutnya di request ini memakai versi yang sama
+    cache = _model_cache
+
+    # If models not cached, load them
+    if cache['arimax'] is None or cache['lstm'] is None or cache['scaler'] is None:
+        cache = build_model_cache()
+        _model_cache = cache
+
+    if cache['residual_seed'] is None:
+        raise FileNotFoundError(f"Residual training data not found: {get_residual_train_path()}")
+
+    return cache
+
+
+# Prediksi residual LSTM untuk n_steps (tidak bergantung pada wind_speed)
+def forecast_residuals(cache: dict, n_steps: int) -> np.ndarray:
+    """
+    Residual forecast for n_steps: a slice of the precomputed trajectory when the
+    horizon is covered, otherwise a full rollout from the cached residual seed.
+    """
+    residual_trajectory = cache['residual_trajectory']
+    if residual_trajectory is not None and n_steps <= len(residual_trajectory):
+        return residual_trajectory[:n_steps]
+    return predict_residuals_iterative(
+        cache['lstm'],
+        cache['scaler'],
+        cache['residual_seed'],
+        n_steps=n_steps,
+        window=18,
+    )
+
+
 # Membuat prediksi menggunakan model yang dilatih (dengan caching untuk performa)
 @app.post('/predict', response_model=PredictionResponse)
 async def predict(request: PredictionRequest):
@@ -1881,59 +2608,43 @@ async def predict(request: PredictionRequest):
     Returns:
         Predictions for wave height
     """
+    return await inference_pool.run(_predict_sync, request)
+
+
+def _predict_sync(request: PredictionRequest) -> PredictionResponse:
+    """Hybrid prediction for one request (runs in the inference thread pool)."""
     try:
-        # Try to use cached models, fallback to loading if not cached
-        arimax_res = _model_cache['arimax']
-        model_lstm = _model_cache['lstm']
-        scaler = _model_cache['scaler']
-        seed = _model_cache['residual_seed']
-        
-        # If models not cached, load them
-        if arimax_res is None or model_lstm is None or scaler is None:
-            arimax_res = load_arimax_model()
-            model_lstm = load_lstm_model()
-            scaler = load_residual_scaler()
-            
-            # Cache them
-            _model_cache['arimax'] = arimax_res
-            _model_cache['lstm'] = model_lstm
-            _model_cache['scaler'] = scaler
-            
-            # Load and cache residual seed
-            data_dir = get_data_dir()
-            residual_path = data_dir / 'residual_train.csv'
-            if residual_path.exists():
-                residual_train = pd.read_csv(residual_path, index_col=0, parse_dates=True)
-                resid_vals = residual_train.values.reshape(-1, 1) if residual_train.ndim > 1 else residual_train.values.reshape(-1, 1)
-                resid_scaled = scaler.transform(resid_vals)
-                seed = resid_scaled[-18:].reshape(1, 18, 1)
-                _model_cache['residual_seed'] = seed
-        
-        # Use cached seed if available
-        if seed is None:
-            data_dir = get_data_dir()
-            residual_path = data_dir / 'residual_train.csv'
-            if not residual_path.exists():
-                raise FileNotFoundError(f"Residual training data not found: {residual_path}")
-            residual_train = pd.read_csv(residual_path, index_col=0, parse_dates=True)
-            resid_vals = residual_train.values.reshape(-1, 1) if residual_train.ndim > 1 else residual_train.values.reshape(-1, 1)
-            resid_scaled = scaler.transform(resid_vals)
-            seed = resid_scaled[-18:].reshape(1, 18, 1)
-            _model_cache['residual_seed'] = seed
+        cache = ensure_models_cached()
+        arimax_res = cache['arimax']
 
         n_steps = request.n_steps
 
+        # Cek cache hasil forecast (key menyertakan versi model sehingga retrain otomatis invalidasi)
+        cache_key = (
+            cache['version'],
+            'default' if request.wind_speed is None else hash_vector(request.wind_speed),
+            n_steps,
+        )
+        cached = _forecast_cache.get(cache_key)
+        if cached is not None:
+            return PredictionResponse(**cached)
+
+        # Precompute trajectory jika model baru dimuat lewat jalur fallback di atas
+        if cache['residual_trajectory'] is None:
+            precompute_trajectories(cache)
+
         # Prepare exogenous variables
-        if request.wind_speed is None:
+        use_default_wind = request.wind_speed is None
+        if use_default_wind:
             # Use cached last wind speed if available
-            if _model_cache['last_wind_speed'] is not None:
-                last_wind_speed = _model_cache['last_wind_speed']
+            if cache['last_wind_speed'] is not None:
+                last_wind_speed = cache['last_wind_speed']
             else:
                 # Load train dataset and cache
-                train = load_dataset('train_dataset.csv')
-                _model_cache['train_dataset'] = train
+                train = load_split('train')
+                cache['train_dataset'] = train
                 last_wind_speed = float(train['wind_speed'].iloc[-1])
-                _model_cache['last_wind_speed'] = last_wind_speed
+                cache['last_wind_speed'] = last_wind_speed
             wind_speed = [last_wind_speed] * n_steps
         else:
             if len(request.wind_speed) != n_steps:
@@ -1943,34 +2654,104 @@ async def predict(request: PredictionRequest):
                 )
             wind_speed = request.wind_speed
 
-        # Predict ARIMAX
-        exog = pd.DataFrame({'wind_speed': wind_speed})
-        arimax_forecast = arimax_res.get_forecast(steps=n_steps, exog=exog)
-        arimax_pred = arimax_forecast.predicted_mean.values
+        # Predict ARIMAX (slice dari trajectory default-wind jika tersedia)
+        default_arimax_trajectory = cache['default_arimax_trajectory']
+        if use_default_wind and default_arimax_trajectory is not None and n_steps <= len(default_arimax_trajectory):
+            arimax_pred = default_arimax_trajectory[:n_steps]
+        else:
+            exog = pd.DataFrame({'wind_speed': wind_speed})
+            arimax_pred = forecast_arimax_mean(arimax_res, exog)
 
-        # Predict residuals
-        predicted_resid = predict_residuals_iterative(
-            model_lstm,
-            scaler,
-            seed,
-            n_steps=n_steps,
-            window=18,
-        )
+        # Predict residuals (slice dari residual trajectory jika horizon tercakup)
+        predicted_resid = forecast_residuals(cache, n_steps)
 
         # Hybrid prediction
         hybrid_pred = arimax_pred + predicted_resid
 
-        return PredictionResponse(
+        result = {
+            'predictions': hybrid_pred.tolist(),
+            'arimax_predictions': arimax_pred.tolist(),
+            'residual_predictions': predicted_resid.tolist(),
+        }
+        _forecast_cache.put(cache_key, result)
+        return PredictionResponse(**result)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f'Prediction error: {str(e)}')
+
+
+# Membuat prediksi untuk banyak skenario kecepatan angin dalam satu request
+@app.post('/predict/batch', response_model=BatchPredictionResponse)
+async def predict_batch(request: BatchPredictionRequest):
+    """
+    Make predictions for many wind-speed scenarios over the same horizon.
+
+    Forecast mean ARIMAX bersifat affine terhadap wind_speed (untuk state terfilter yang sama),
+    sehingga semua skenario dihitung dengan satu operasi ter-vektorisasi. Residual LSTM tidak
+    bergantung pada angin, jadi satu trajectory residual dipakai bersama oleh semua skenario.
+
+    Args:
+        request: wind_speed berupa matriks (n_scenarios x n_steps) dan n_steps
+
+    Returns:
+        Prediksi hybrid dan ARIMAX per skenario, plus residual bersama
+    """
+    return await inference_pool.run(_predict_batch_sync, request)
+
+
+def _predict_batch_sync(request: BatchPredictionRequest) -> BatchPredictionResponse:
+    """Hybrid prediction for many wind-speed scenarios (runs in the inference thread pool)."""
+    try:
+        n_steps = request.n_steps
+        if n_steps <= 0:
+            raise HTTPException(status_code=400, detail='n_steps must be a positive integer')
+        if not request.wind_speed:
+            raise HTTPException(status_code=400, detail='wind_speed must contain at least one scenario')
+        for i, scenario in enumerate(request.wind_speed):
+            if len(scenario) != n_steps:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f'wind_speed scenario {i} length ({len(scenario)}) must match n_steps ({n_steps})',
+                )
+
+        cache = ensure_models_cached()
+        arimax_res = cache['arimax']
+        if cache['residual_trajectory'] is None:
+            precompute_trajectories(cache)
+
+        wind_matrix = np.asarray(request.wind_speed, dtype=float)
+        arimax_pred = forecast_arimax_scenarios(arimax_res, wind_matrix)
+        predicted_resid = forecast_residuals(cache, n_steps)
+        hybrid_pred = arimax_pred + predicted_resid[np.newaxis, :]
+
+        return BatchPredictionResponse(
+            n_scenarios=len(wind_matrix),
+            n_steps=n_steps,
             predictions=hybrid_pred.tolist(),
             arimax_predictions=arimax_pred.tolist(),
             residual_predictions=predicted_resid.tolist(),
         )
+    except HTTPException:
+        raise
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f'Prediction error: {str(e)}')
 
 
+@app.get('/predict/cache')
+async def predict_cache_stats():
+    """
+    Statistik cache hasil /predict (ukuran, hit, miss, eviction) untuk versi model saat ini.
+    """
+    return {
+        'status': 'success',
+        'model_version': _model_cache['version'],
+        'cache': _forecast_cache.stats(),
+    }
+
+
 @app.get('/residual-predictions')
 async def get_residual_predictions():
     """
@@ -1984,76 +2765,17 @@ async def get_residual_predictions():
         - detailed_results: Hasil detail dengan timestamp, aktual, arimax_pred, residual_pred, hybrid_pred
     """
     try:
-        # Load test dataset
-        test = load_dataset('test_dataset.csv')
-
-        # Load ARIMAX model
-        arimax_res = load_arimax_model()
-
-        # Predict ARIMAX on test set
-        arimax_forecast = arimax_res.get_forecast(steps=len(test), exog=test[['wind_speed']])
-        arimax_pred = arimax_forecast.predicted_mean.values
-
-        # Load LSTM model and scaler
-        model_lstm = load_lstm_model()
-        scaler = load_residual_scaler()
-
-        # Get seed from residual training data
-        data_dir = get_data_dir()
-        residual_train = pd.read_csv(data_dir / 'residual_train.csv', index_col=0, parse_dates=True)
-        resid_vals = residual_train.values.reshape(-1, 1) if residual_train.ndim > 1 else residual_train.values.reshape(-1, 1)
-        resid_scaled = scaler.transform(resid_vals)
-        seed = resid_scaled[-18:].reshape(1, 18, 1)
-
-        # Predict residuals iteratively
-        predicted_resid = predict_residuals_iterative(
-            model_lstm,
-            scaler,
-            seed,
-            n_steps=len(test),
-            window=18,
-        )
-
-        # Calculate actual residuals
-        y_true = test['wave_height'].values
-        residual_actual = y_true - arimax_pred
-        
-        # Calculate residual error
-        residual_error = residual_actual - predicted_resid
-        
-        # Calculate statistics
-        residual_mae = np.mean(np.abs(residual_error))
-        residual_rmse = np.sqrt(np.mean(residual_error ** 2))
-        residual_mean_abs_actual = np.mean(np.abs(residual_actual))
-        residual_mean_abs_pred = np.mean(np.abs(predicted_resid))
-        
-        # Prepare detailed results
-        detailed_results = []
-        for i in range(len(test)):
-            detailed_results.append({
-                'nomor': i + 1,
-                'timestamp': str(test.index[i]),
-                'actual': float(y_true[i]),
-                'arimax_pred': float(arimax_pred[i]),
-                'residual_actual': float(residual_actual[i]),
-                'residual_pred': float(predicted_resid[i]),
-                'residual_error': float(residual_error[i]),
-                'hybrid_pred': float(arimax_pred[i] + predicted_resid[i]),
-            })
-
+        artifact = await get_evaluation_artifact()
+        rows = artifact['rows']
         return {
             'status': 'success',
-            'residual_predictions': predicted_resid.tolist(),
-            'residual_actual': residual_actual.tolist(),
-            'residual_statistics': {
-                'mae': float(residual_mae),
-                'rmse': float(residual_rmse),
-                'mean_abs_actual': float(residual_mean_abs_actual),
-                'mean_abs_pred': float(residual_mean_abs_pred),
-                'count': len(predicted_resid),
-            },
-            'detailed_results': detailed_results,
+            'residual_predictions': [row['residual_pred'] for row in rows],
+            'residual_actual': [row['residual_actual'] for row in rows],
+            'residual_statistics': artifact['residual_statistics'],
+            'detailed_results': [{'nomor': i + 1, **row} for i, row in enumerate(rows)],
         }
+    except QueueFullError:
+        raise
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -2107,6 +2829,11 @@ async def get_parameter_test():
         1. estimation_table: Evaluasi kondisi parameter (Stationarity/Invertibility)
         2. significance_table: Uji signifikansi (T-Hitung vs T-Tabel)
     """
+    return await inference_pool.run(_parameter_test_sync)
+
+
+def _parameter_test_sync() -> dict:
+    """Parameter estimation and significance tables (runs in the inference thread pool)."""
     try:
         # Load ARIMAX model
         arimax_res = load_arimax_model()
@@ -2202,13 +2929,17 @@ async def get_arimax_training_residuals():
     Mengembalikan tabel residual training ARIMAX (actual, fitted, residual per observasi data latih).
     Residual ini yang nantinya digunakan untuk melatih LSTM di model Hybrid.
     """
+    return await inference_pool.run(_arimax_training_residuals_sync)
+
+
+def _arimax_training_residuals_sync() -> dict:
+    """ARIMAX training residual table (runs in the inference thread pool)."""
     try:
-        train = load_dataset('train_dataset.csv')
-        data_dir = get_data_dir()
-        residual_path = data_dir / 'residual_train.csv'
+        train = load_split('train')
+        residual_path = get_residual_train_path()
         if not residual_path.exists():
             return {'status': 'success', 'data': []}
-        residual_train = pd.read_csv(residual_path, index_col=0, parse_dates=True)
+        residual_train = read_frame(residual_path)
         residual_train = residual_train.dropna()
         if len(residual_train) == 0:
             return {'status': 'success', 'data': []}
@@ -2235,6 +2966,32 @@ async def get_arimax_training_residuals():
         raise HTTPException(status_code=500, detail=f'Error: {str(e)}')
 
 
+# Melihat daftar bundle model di registry
+@app.get('/models')
+async def list_model_bundles():
+    """List model bundles in the registry (newest first) and the version being served."""
+    return {
+        'status': 'success',
+        'serving_version': _model_cache['version'],
+        'bundles': list_bundles(),
+    }
+
+
+# Mengaktifkan bundle model tertentu (contoh: rollback ke versi sebelumnya)
+@app.post('/models/{version}/activate')
+async def activate_model_bundle(version: str):
+    """Point the registry at an existing bundle and hot-swap the serving cache."""
+    try:
+        activate_bundle(version)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    await reload_models_after_training()
+    return {
+        'status': 'success',
+        'serving_version': _model_cache['version'],
+    }
+
+
 @app.get('/health')
 async def health():
     """Health check endpoint."""
@@ -2242,6 +2999,39 @@ async def health():
     return {'status': 'healthy'}
 
 
+@app.get('/health/queues')
+async def health_queues():
+    """
+    Kedalaman antrian worker pool.
+    
+    Returns:
+        Dictionary berisi statistik process pool training/evaluasi dan thread pool inference
+        (running, queued, submitted, completed, failed, rejected)
+    """
+    return {
+        'status': 'success',
+        'training': training_pool.stats(),
+        'inference': inference_pool.stats(),
+    }
+
+
+@app.get('/health/imports')
+async def health_imports():
+    """
+    Laporan waktu import / startup service.
+    
+    Returns:
+        Dictionary berisi durasi import main.py dan library ML berat yang sudah ter-import
+        (TensorFlow/statsmodels/sklearn seharusnya hanya muncul setelah training/inference pertama)
+    """
+    return {
+        'status': 'success',
+        'import_seconds': round(_IMPORT_SECONDS, 4),
+        'heavy_modules_loaded': loaded_heavy_modules(),
+        'models_cached': _model_cache['arimax'] is not None and _model_cache['lstm'] is not None,
+    }
+
+
 # Menjalankan aplikasi FastAPI jika file ini dijalankan langsung
 if __name__ == '__main__':
     import uvicorn
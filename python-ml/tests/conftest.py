@@ -0,0 +1,6 @@
+"""Konfigurasi pytest: direktori python-ml dimasukkan ke sys.path agar `utils` dan `training` dapat di-import."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
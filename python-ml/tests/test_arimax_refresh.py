@@ -0,0 +1,38 @@
+"""History observasi untuk refresh ARIMAX harus unik dan terurut sebelum extend/fitting penuh."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from training import arimax_refresh
+
+
+def _frame(start: str, periods: int, offset: float = 0.0) -> pd.DataFrame:
+    index = pd.date_range(start, periods=periods, freq='D', name='timestamp')
+    values = np.arange(periods, dtype=float) + offset
+    return pd.DataFrame({'wave_height': values, 'wind_speed': values}, index=index)
+
+
+def test_observation_history_drops_overlapping_rows(monkeypatch):
+    # Layout split lama: test hasil split ulang 70/30 ikut memuat baris validation
+    snapshot = pd.concat([_frame('2024-01-01', 10), _frame('2024-01-08', 3, offset=100.0)])
+    refresh = _frame('2024-01-11', 2)
+    monkeypatch.setattr(arimax_refresh, 'load_snapshot', lambda: snapshot)
+    monkeypatch.setattr(arimax_refresh, 'dataset_exists', lambda name: True)
+    monkeypatch.setattr(arimax_refresh, 'load_dataset', lambda name: refresh)
+
+    history = arimax_refresh.load_observation_history()
+
+    assert history.index.is_unique and history.index.is_monotonic_increasing
+    assert len(history) == 12
+    # Baris snapshot pertama dipertahankan untuk timestamp duplikat
+    assert history.loc['2024-01-08', 'wave_height'] == 7.0
+
+
+@pytest.mark.parametrize('history', [
+    pd.concat([_frame('2024-01-01', 5), _frame('2024-01-04', 2)]),
+    _frame('2024-01-01', 5).iloc[::-1],
+])
+def test_check_history_order_rejects_duplicates_and_unsorted(history):
+    with pytest.raises(ValueError):
+        arimax_refresh._check_history_order(history)
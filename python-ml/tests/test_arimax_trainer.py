@@ -0,0 +1,70 @@
+"""Training ARIMAX: baseline drift metadata dan grid paralel (worker yang macet harus dihentikan)."""
+
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from training import arimax_trainer
+from training.arimax_trainer import _terminate_workers
+
+
+def test_terminate_workers_kills_hung_processes():
+    executor = ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        futures = [executor.submit(time.sleep, 60) for _ in range(3)]
+        # Tunggu worker spawn berjalan
+        deadline = time.monotonic() + 30
+        while len(getattr(executor, '_processes', None) or {}) < 2 and time.monotonic() < deadline:
+            time.sleep(0.1)
+        processes = list(executor._processes.values())
+
+        # Gagal jika worker tidak ditemukan (contoh: atribut internal executor berubah)
+        assert _terminate_workers(executor) == 2
+        assert not any(process.is_alive() for process in processes)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    # Future ditandai gagal (BrokenProcessPool) secara asinkron oleh thread manajemen executor
+    _, pending = wait(futures, timeout=30)
+    assert not pending
+
+
+def _wave_frame(n: int = 385, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=n, freq='h', name='timestamp')
+    wind = 5 + np.sin(np.arange(n) / 12) + rng.normal(0, 0.3, n)
+    wave = 1.5 + 0.05 * wind + np.cumsum(rng.normal(0, 0.02, n))
+    return pd.DataFrame({'wave_height': wave, 'wind_speed': wind}, index=index)
+
+
+def test_drift_baseline_excludes_burn_in_residuals(tmp_path, monkeypatch):
+    monkeypatch.setattr(arimax_trainer, 'get_models_dir', lambda: tmp_path)
+    train = _wave_frame()
+
+    arimax_res, _, residual = arimax_trainer.train_arimax(train, order=(1, 1, 1), use_cache=False)
+
+    burn = int(arimax_res.loglikelihood_burn)
+    assert burn > 0
+    expected = float(np.sqrt(np.mean(np.square(np.asarray(arimax_res.resid)[burn:]))))
+    with open(tmp_path / 'arimax_model_metadata.json') as f:
+        metadata = json.load(f)
+    assert metadata['residual_rmse'] == pytest.approx(expected)
+    # Residual burn-in (d=1: resid[0] ~ y[0]) tidak boleh membesarkan baseline
+    assert metadata['residual_rmse'] < arimax_trainer.residual_rmse(residual)
+
+
+def test_refresh_metadata_fallback_excludes_burn_in_residuals(tmp_path):
+    from training.arimax_refresh import _load_refresh_metadata
+
+    train = _wave_frame()
+    arimax_res, _, _ = arimax_trainer.train_arimax(train, order=(1, 1, 1), save=False, use_cache=False)
+
+    # Bundle lama tanpa arimax_model_metadata.json
+    metadata = _load_refresh_metadata(tmp_path, arimax_res, train)
+
+    burn = int(arimax_res.loglikelihood_burn)
+    assert metadata['residual_rmse'] == pytest.approx(arimax_trainer.residual_rmse(arimax_res.resid[burn:]))
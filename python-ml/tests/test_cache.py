@@ -0,0 +1,38 @@
+"""DiskCache: batas jumlah entri dan total ukuran di disk."""
+
+import os
+
+from utils.cache import DiskCache
+
+
+def _put(cache: DiskCache, key: str, size: int, mtime: int) -> None:
+    cache.put(key, b'x' * size)
+    # mtime eksplisit agar urutan LRU tidak bergantung resolusi timestamp filesystem
+    os.utime(cache._path(key), ns=(mtime, mtime))
+    cache._evict()
+
+
+def test_evicts_least_recently_used_by_total_bytes(tmp_path):
+    cache = DiskCache(tmp_path, maxsize=10, max_bytes=2500)
+    for i, key in enumerate(['a', 'b', 'c']):
+        _put(cache, key, 1000, mtime=(i + 1) * 10**9)
+
+    assert cache.get('a') is None
+    assert cache.get('b') is not None and cache.get('c') is not None
+    stats = cache.stats()
+    assert stats['size'] == 2 and stats['bytes'] <= 2500
+
+
+def test_entry_larger_than_max_bytes_is_not_kept(tmp_path):
+    cache = DiskCache(tmp_path, maxsize=10, max_bytes=500)
+    cache.put('big', b'x' * 1000)
+    assert cache.get('big') is None
+    assert cache.stats()['size'] == 0
+
+
+def test_maxsize_still_applies_without_byte_limit(tmp_path):
+    cache = DiskCache(tmp_path, maxsize=2)
+    for i, key in enumerate(['a', 'b', 'c']):
+        _put(cache, key, 10, mtime=(i + 1) * 10**9)
+    assert cache.get('a') is None
+    assert cache.stats() == {'size': 2, 'maxsize': 2, 'bytes': cache.stats()['bytes'], 'max_bytes': None}
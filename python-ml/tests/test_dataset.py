@@ -0,0 +1,59 @@
+"""Migrasi dataset per split lama menjadi satu snapshot (migrate_split_datasets)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import dataset
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset, 'get_data_dir', lambda: tmp_path)
+    return tmp_path
+
+
+def _series(n: int = 100) -> pd.DataFrame:
+    index = pd.date_range('2024-01-01', periods=n, freq='h', name='timestamp')
+    values = np.arange(n, dtype=float)
+    return pd.DataFrame({'wave_height': values, 'wind_speed': values / 10}, index=index)
+
+
+def test_migrates_contiguous_splits(data_dir):
+    df = _series()
+    dataset.save_dataset(df.iloc[:70], 'train_dataset.csv')
+    dataset.save_dataset(df.iloc[70:85], 'validation_dataset.csv')
+    dataset.save_dataset(df.iloc[85:], 'test_dataset.csv')
+
+    assert dataset.migrate_split_datasets()
+
+    pd.testing.assert_frame_equal(dataset.load_snapshot(), df, check_freq=False)
+    assert dataset.load_snapshot_metadata()['splits'] == {'train': [0, 70], 'validation': [70, 85], 'test': [85, 100]}
+    assert not dataset.dataset_exists('train_dataset.csv')
+
+
+def test_migrates_overlapping_resplit_layout(data_dir):
+    # Layout lama setelah /train/arimax: test = split ulang 30% terakhir (memuat baris validation)
+    df = _series()
+    dataset.save_dataset(df.iloc[:70], 'train_dataset.csv')
+    dataset.save_dataset(df.iloc[70:85], 'validation_dataset.csv')
+    dataset.save_dataset(df.iloc[70:], 'test_dataset.csv')
+
+    assert dataset.migrate_split_datasets()
+
+    snapshot = dataset.load_snapshot()
+    assert snapshot.index.is_unique and snapshot.index.is_monotonic_increasing
+    pd.testing.assert_frame_equal(snapshot, df, check_freq=False)
+    assert dataset.load_snapshot_metadata()['splits'] == {'train': [0, 70], 'validation': [70, 85], 'test': [85, 100]}
+    pd.testing.assert_frame_equal(dataset.load_split('test'), df.iloc[85:], check_freq=False)
+
+
+def test_migrates_without_validation(data_dir):
+    df = _series()
+    dataset.save_dataset(df.iloc[:70], 'train_dataset.csv')
+    dataset.save_dataset(df.iloc[70:], 'test_dataset.csv')
+
+    assert dataset.migrate_split_datasets()
+
+    assert dataset.load_snapshot_metadata()['splits'] == {'train': [0, 70], 'validation': [70, 70], 'test': [70, 100]}
+    assert not dataset.split_exists('validation')
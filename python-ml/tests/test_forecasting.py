@@ -0,0 +1,73 @@
+"""Forecast mean ARIMAX (forecast_arimax_mean) harus identik dengan get_forecast(...).predicted_mean."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('statsmodels')
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+from utils.forecasting import _supports_affine_forecast, forecast_arimax_horizons, forecast_arimax_mean
+
+N_TRAIN = 240
+N_STEPS = 24
+
+
+def _series(n: int, seed: int = 0):
+    """Deret wave_height sintetis dengan eksogen wind_speed (index per jam)."""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=n, freq='h')
+    wind = pd.DataFrame({'wind_speed': 5 + np.sin(np.arange(n) / 12) + rng.normal(0, 0.3, n)}, index=index)
+    wave = pd.Series(1.5 + 0.1 * wind['wind_speed'] + np.cumsum(rng.normal(0, 0.02, n)), index=index, name='wave_height')
+    return wave, wind
+
+
+def _fit(order, trend=None, seed: int = 0):
+    wave, wind = _series(N_TRAIN + 2 * N_STEPS, seed)
+    model = SARIMAX(
+        wave.iloc[:N_TRAIN], exog=wind.iloc[:N_TRAIN], order=order, trend=trend,
+        enforce_stationarity=False, enforce_invertibility=False,
+    )
+    return model.fit(disp=False), wave, wind
+
+
+@pytest.mark.parametrize('order', [(2, 1, 1), (1, 0, 0), (0, 1, 2)])
+def test_forecast_mean_matches_get_forecast(order):
+    res, _, wind = _fit(order)
+    exog = wind.iloc[N_TRAIN:N_TRAIN + N_STEPS]
+    assert _supports_affine_forecast(res.model, exog.shape[1])
+
+    expected = res.get_forecast(steps=N_STEPS, exog=exog).predicted_mean.values
+    assert np.allclose(forecast_arimax_mean(res, exog), expected)
+    # Exog sebagai array (tanpa nama kolom) memberikan hasil yang sama
+    assert np.allclose(forecast_arimax_mean(res, exog.values), expected)
+
+
+def test_forecast_mean_after_extend():
+    res, wave, wind = _fit((2, 1, 1))
+    end = N_TRAIN + N_STEPS
+    extended = res.extend(wave.iloc[N_TRAIN:end], exog=wind.iloc[N_TRAIN:end])
+    exog = wind.iloc[end:end + N_STEPS]
+
+    expected = extended.get_forecast(steps=N_STEPS, exog=exog).predicted_mean.values
+    assert np.allclose(forecast_arimax_mean(extended, exog), expected)
+
+
+def test_forecast_mean_falls_back_for_trend_models():
+    res, _, wind = _fit((1, 0, 0), trend='c')
+    exog = wind.iloc[N_TRAIN:N_TRAIN + N_STEPS]
+    assert not _supports_affine_forecast(res.model, exog.shape[1])
+
+    expected = res.get_forecast(steps=N_STEPS, exog=exog).predicted_mean.values
+    assert np.allclose(forecast_arimax_mean(res, exog), expected)
+
+
+def test_forecast_horizons_match_get_forecast():
+    res, _, wind = _fit((2, 1, 1))
+    short = wind.iloc[N_TRAIN:N_TRAIN + N_STEPS // 2]
+    full = wind.iloc[N_TRAIN:N_TRAIN + N_STEPS]
+
+    horizons = forecast_arimax_horizons(res, {'short': short, 'full': full})
+
+    assert np.allclose(horizons['short'], res.get_forecast(steps=len(short), exog=short).predicted_mean.values)
+    assert np.allclose(horizons['full'], res.get_forecast(steps=len(full), exog=full).predicted_mean.values)
@@ -0,0 +1,52 @@
+"""Konfigurasi training LSTM residual (seed search, profil training)."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from training.hybrid_trainer import (
+    DEFAULT_SEED_SEARCH_WORKERS,
+    SeedSearch,
+    _get_op_determinism,
+    _set_op_determinism,
+    train_lstm_residual,
+)
+
+SEEDS = list(range(17))
+
+
+def _search(**kwargs) -> SeedSearch:
+    residual = pd.Series([0.0] * 50)
+    return SeedSearch(residual, None, SEEDS, n_steps=5, mode='process', **kwargs)
+
+
+@pytest.fixture
+def many_cpus(monkeypatch):
+    monkeypatch.setattr(os, 'sched_getaffinity', lambda pid: set(range(16)), raising=False)
+    monkeypatch.delenv('SEED_SEARCH_WORKERS', raising=False)
+
+
+def test_seed_search_default_workers_are_capped(many_cpus):
+    search = _search()
+    assert search.max_workers == DEFAULT_SEED_SEARCH_WORKERS
+    assert search.threads_per_worker == 16 // DEFAULT_SEED_SEARCH_WORKERS
+
+
+def test_seed_search_workers_env_opt_in(many_cpus, monkeypatch):
+    monkeypatch.setenv('SEED_SEARCH_WORKERS', '12')
+    assert _search().max_workers == 12
+    assert _search(max_workers=2).max_workers == 2
+
+
+def test_fast_profile_restores_op_determinism():
+    pytest.importorskip('tensorflow')
+    _set_op_determinism(True)
+    residual = pd.Series(np.sin(np.arange(120) / 5.0) * 0.1)
+
+    train_lstm_residual(residual, epochs=1, save=False, profile='fast')
+
+    # Profil fast hanya menonaktifkan determinism selama fit(); training berikutnya
+    # (contoh: finetune_lstm_residual) tetap memakai kernel deterministik
+    assert _get_op_determinism() is True
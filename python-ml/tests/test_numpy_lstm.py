@@ -0,0 +1,54 @@
+"""Regresi NumpyLSTM: output harus sama dengan model Keras asal (toleransi float32)."""
+
+import numpy as np
+import pytest
+
+tf = pytest.importorskip('tensorflow')
+
+from utils.numpy_lstm import NumpyLSTM
+
+WINDOW = 18
+ATOL = 1e-5
+
+
+@pytest.fixture(scope='module')
+def keras_model_path(tmp_path_factory):
+    """Model LSTM(24) + Dense(1) (arsitektur residual) dengan bobot acak, disimpan sebagai .h5."""
+    tf.keras.utils.set_random_seed(0)
+    model = tf.keras.Sequential([
+        tf.keras.Input(shape=(WINDOW, 1)),
+        tf.keras.layers.LSTM(24),
+        tf.keras.layers.Dense(1),
+    ])
+    path = tmp_path_factory.mktemp('lstm') / 'lstm_residual_model.h5'
+    model.save(str(path))
+    return model, path
+
+
+def test_predict_matches_keras(keras_model_path):
+    model, path = keras_model_path
+    x = np.random.default_rng(1).random((32, WINDOW, 1), dtype=np.float32)
+
+    expected = model.predict(x, verbose=0)
+    actual = NumpyLSTM.from_h5(path).predict(x)
+
+    assert actual.shape == expected.shape
+    np.testing.assert_allclose(actual, expected, atol=ATOL)
+
+
+def test_rollout_matches_keras(keras_model_path):
+    model, path = keras_model_path
+    seed = np.random.default_rng(2).random((1, WINDOW, 1), dtype=np.float32)
+    n_steps = 24
+
+    # Rollout referensi: prediksi Keras per step, geser window, tambahkan prediksi
+    current = seed.copy()
+    expected = []
+    for _ in range(n_steps):
+        p = float(model.predict(current, verbose=0)[0, 0])
+        expected.append(p)
+        current = np.concatenate([current[:, 1:, :], [[[p]]]], axis=1).astype(np.float32)
+
+    actual = NumpyLSTM.from_h5(path).rollout(seed, n_steps, window=WINDOW)
+
+    np.testing.assert_allclose(actual, np.array(expected), atol=ATOL)
@@ -0,0 +1,93 @@
+"""Kesetaraan clean_numeric (versi vektor) dengan implementasi lama berbasis apply per baris."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.preprocessing import clean_numeric
+
+
+def clean_numeric_reference(col: pd.Series) -> pd.Series:
+    """Implementasi clean_numeric sebelum vektorisasi (referensi perilaku)."""
+    col = col.astype(str).str.strip()
+    col = col.str.replace(',', '.', regex=False)
+    col = col.str.replace(r'[^0-9\.\-]', '', regex=True)
+
+    def fix_multi_dot(x: str) -> str:
+        if x.count('.') <= 1:
+            return x
+        parts = x.split('.')
+        return parts[0] + ''.join(parts[1:])
+
+    col = col.apply(fix_multi_dot)
+    return pd.to_numeric(col, errors='coerce')
+
+
+MESSY_STRINGS = [
+    '1,5', ' 2.75 ', '\t3,25\n', '-0,5',        # koma desimal dan whitespace
+    '1.5 m', '12 m/s', '0.8m', '≈ 4,2 knots',   # satuan
+    '1.2.3', '1.234.567,89', '..', '1..2',     # multi-dot
+    '-', '.', '-.', '+', '--1',                 # tanda tunggal
+    '', '   ',                                  # string kosong
+    'NaN', 'nan', 'None', 'null', 'abc',        # teks non-angka
+    '0', '-12', '007', '3.', '.5',
+]
+
+
+def assert_same(actual: pd.Series, expected: pd.Series) -> None:
+    pd.testing.assert_series_equal(actual.astype(float), expected.astype(float), check_names=False)
+
+
+@pytest.mark.parametrize('dtype', [object, 'str'])
+def test_messy_strings_match_reference(dtype):
+    col = pd.Series(MESSY_STRINGS, dtype=dtype)
+    assert_same(clean_numeric(col), clean_numeric_reference(col))
+
+
+@pytest.mark.parametrize('value', MESSY_STRINGS)
+def test_each_messy_string_matches_reference(value):
+    col = pd.Series([value], dtype=object)
+    assert_same(clean_numeric(col), clean_numeric_reference(col))
+
+
+def test_mixed_object_column_matches_reference():
+    col = pd.Series(['1,5', 2.5, 3, '4.1.2', ' 7 m', -1.25, 0, 'None'], dtype=object)
+    assert_same(clean_numeric(col), clean_numeric_reference(col))
+
+
+def test_random_strings_match_reference():
+    rng = np.random.default_rng(0)
+    alphabet = np.array(list('0123456789.,- m/sNa'))
+    values = [''.join(rng.choice(alphabet, size=rng.integers(0, 8))) for _ in range(2000)]
+    col = pd.Series(values, dtype=object)
+    assert_same(clean_numeric(col), clean_numeric_reference(col))
+
+
+@pytest.mark.parametrize('col', [
+    pd.Series([1, -2, 30, 0], dtype='int64'),
+    pd.Series([1.5, -2.25, 0.0, 1234.5]),
+    pd.Series([1.5, np.inf, -np.inf, 2.0]),
+    pd.Series([True, False, True]),
+])
+def test_numeric_columns_match_reference(col):
+    assert_same(clean_numeric(col), clean_numeric_reference(col))
+
+
+def test_int_column_keeps_dtype():
+    col = pd.Series([1, 2, 3], dtype='int64')
+    assert clean_numeric(col).dtype == np.int64
+
+
+def test_missing_values_in_object_column_become_nan():
+    # Perubahan perilaku: implementasi lama gagal (pandas 3) pada sel kosong NaN/None
+    col = pd.Series(['1,5', np.nan, None, '2'], dtype=object)
+    result = clean_numeric(col)
+    np.testing.assert_array_equal(result.values, [1.5, np.nan, np.nan, 2.0])
+
+
+def test_scientific_notation_float_column_keeps_value():
+    # Perubahan perilaku: implementasi lama mengubah float ke string ("1e-05" -> "1-05" -> NaN)
+    col = pd.Series([1e-05, 2.5e20, 3.0])
+    result = clean_numeric(col)
+    np.testing.assert_array_equal(result.values, col.values)
+    assert clean_numeric_reference(col).isna().iloc[0]
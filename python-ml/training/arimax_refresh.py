@@ -0,0 +1,259 @@
+"""
+Refresh Inkremental ARIMAX dengan Observasi Baru
+
+Saat observasi baru masuk (contoh: satu hari data sensor), model ARIMAX yang sedang dilayani
+tidak di-fit ulang dari awal. Parameter hasil MLE dipertahankan dan model diperpanjang dengan
+baris yang belum pernah dilihatnya (extend_arimax), sehingga biayanya sebanding dengan jumlah
+observasi baru dan forecast dimulai dari observasi terakhir.
+
+Fitting penuh (MLE pada seluruh history) hanya dijalankan jika:
+1. forced - diminta secara eksplisit
+2. scheduled - fitting penuh terakhir sudah lebih lama dari env ARIMAX_REFIT_INTERVAL_HOURS
+3. drift - RMSE residual one-step-ahead terbaru > env ARIMAX_DRIFT_RATIO x RMSE residual
+   saat fitting penuh terakhir
+
+Observasi baru disimpan di dataset refresh_observations (data/refresh_observations.npy, dihapus saat dataset baru diupload),
+sehingga history lengkap = snapshot dataset (train + validation + test) + observasi refresh.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.dataset import dataset_exists, load_dataset, load_snapshot, read_frame, save_dataset, write_frame
+from utils.forecasting import load_arimax_model
+from utils.registry import BUNDLE_RESIDUAL_FILE, get_residual_train_path
+from .arimax_trainer import build_arimax_metadata, extend_arimax, residual_rmse, train_arimax
+
+REFRESH_OBSERVATIONS_FILENAME = 'refresh_observations.csv'
+
+# File yang ditulis refresh_arimax ke output_dir (menggantikan file ARIMAX bundle asal)
+REFRESH_OUTPUT_FILES = ('arimax_model.pkl', 'arimax_model_metadata.json', BUNDLE_RESIDUAL_FILE)
+
+
+class InvalidObservationsError(ValueError):
+    """Observasi baru tidak valid (nilai kosong, timestamp rusak, atau tidak melanjutkan deret waktu)."""
+
+
+def load_observation_history() -> pd.DataFrame:
+    """
+    Memuat seluruh observasi yang diketahui: snapshot dataset (train + validation + test) + observasi refresh.
+
+    Timestamp duplikat (contoh: dataset split lama yang saling tumpang tindih) hanya diambil
+    sekali, dengan baris pertama (snapshot) yang dipertahankan.
+
+    Returns:
+        DataFrame (index timestamp unik, kolom wave_height dan wind_speed) terurut waktu
+
+    Raises:
+        FileNotFoundError: Jika dataset belum diupload
+    """
+    frames = [load_snapshot()]
+    if dataset_exists(REFRESH_OBSERVATIONS_FILENAME):
+        frames.append(load_dataset(REFRESH_OBSERVATIONS_FILENAME))
+    history = pd.concat([frame[['wave_height', 'wind_speed']] for frame in frames])
+    history = history.sort_index(kind='stable')
+    return history[~history.index.duplicated(keep='first')]
+
+
+def _check_history_order(history: pd.DataFrame) -> None:
+    """
+    Memastikan history terurut naik tanpa timestamp duplikat sebelum extend/fitting penuh.
+
+    Baris duplikat yang diteruskan ke SARIMAXResults.extend merusak state filter dan seed residual.
+
+    Raises:
+        ValueError: Jika index history tidak unik atau tidak terurut naik
+    """
+    if history.index.has_duplicates or not history.index.is_monotonic_increasing:
+        raise ValueError('Observation history must be sorted by timestamp without duplicates before refreshing ARIMAX.')
+
+
+def append_refresh_observations(history: pd.DataFrame, observations: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+    """
+    Memvalidasi observasi baru dan menambahkannya ke dataset refresh_observations.
+
+    Baris dengan timestamp <= observasi terakhir di history dilewati (sudah diketahui).
+    Jika history berfrekuensi tetap (contoh: harian), baris baru harus melanjutkan deret
+    tanpa celah.
+
+    Args:
+        history: Observasi yang sudah diketahui (load_observation_history)
+        observations: Observasi baru (index timestamp, kolom wave_height dan wind_speed)
+
+    Returns:
+        Tuple (baris yang ditambahkan, jumlah baris yang dilewati)
+
+    Raises:
+        InvalidObservationsError: Jika observasi tidak valid
+    """
+    observations = observations[['wave_height', 'wind_speed']].astype(float).sort_index()
+    if observations.isna().any().any() or not np.isfinite(observations.values).all():
+        raise InvalidObservationsError('Observations must have finite wave_height and wind_speed values')
+    if observations.index.has_duplicates:
+        raise InvalidObservationsError('Observations contain duplicate timestamps')
+
+    last_known = history.index[-1]
+    new_rows = observations[observations.index > last_known]
+    skipped = len(observations) - len(new_rows)
+    if len(new_rows) == 0:
+        return new_rows, skipped
+
+    freq = pd.infer_freq(history.index[-min(len(history), 50):]) if len(history) >= 3 else None
+    if freq is not None:
+        expected = pd.date_range(start=last_known, periods=len(new_rows) + 1, freq=freq)[1:]
+        if not new_rows.index.equals(expected):
+            raise InvalidObservationsError(
+                f'Observations must continue the series at frequency {freq} without gaps '
+                f'(expected {expected[0]} .. {expected[-1]}, got {new_rows.index[0]} .. {new_rows.index[-1]})'
+            )
+
+    log = load_dataset(REFRESH_OBSERVATIONS_FILENAME) if dataset_exists(REFRESH_OBSERVATIONS_FILENAME) else None
+    new_rows.index.name = history.index.name
+    save_dataset(pd.concat([log, new_rows]) if log is not None else new_rows, REFRESH_OBSERVATIONS_FILENAME)
+    return new_rows, skipped
+
+
+def _load_refresh_metadata(model_dir: Path, arimax_res, history: pd.DataFrame) -> dict:
+    """Metadata ARIMAX bundle, dilengkapi nilai fallback untuk model lama tanpa info refresh."""
+    metadata_path = model_dir / 'arimax_model_metadata.json'
+    metadata = {}
+    if metadata_path.exists():
+        with open(metadata_path, 'r') as f:
+            metadata = json.load(f)
+    if not metadata.get('order_tuple'):
+        metadata['order_tuple'] = list(arimax_res.model.order)
+    if not metadata.get('sample_end'):
+        # Model lama di-fit pada awal history (data train) sebanyak nobs baris
+        metadata['sample_end'] = str(history.index[min(int(arimax_res.nobs), len(history)) - 1])
+    if not metadata.get('fitted_at') and metadata_path.exists():
+        metadata['fitted_at'] = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(metadata_path.stat().st_mtime))
+    if metadata.get('residual_rmse') is None:
+        metadata['residual_rmse'] = residual_rmse(arimax_res.resid, int(arimax_res.loglikelihood_burn))
+    metadata.setdefault('rows_since_fit', 0)
+    return metadata
+
+
+def _scheduled_refit_due(metadata: dict) -> bool:
+    """Mengecek apakah fitting penuh terakhir sudah melewati ARIMAX_REFIT_INTERVAL_HOURS (0 = tanpa jadwal)."""
+    interval_hours = float(os.environ.get('ARIMAX_REFIT_INTERVAL_HOURS', '168'))
+    if interval_hours <= 0 or not metadata.get('fitted_at'):
+        return False
+    fitted_at = time.mktime(time.strptime(metadata['fitted_at'], '%Y-%m-%dT%H:%M:%S'))
+    return time.time() - fitted_at >= interval_hours * 3600
+
+
+def measure_drift(residual: pd.Series, rows_since_fit: int, baseline_rmse: float | None) -> dict:
+    """
+    Membandingkan RMSE residual one-step-ahead terbaru dengan RMSE residual saat fitting penuh.
+
+    Residual yang dinilai adalah maksimal env ARIMAX_DRIFT_WINDOW (default 48) baris terakhir
+    sejak fitting penuh; drift hanya dinilai jika jumlahnya >= env ARIMAX_DRIFT_MIN_ROWS (default 12).
+
+    Returns:
+        Dictionary {rows, rmse_recent, rmse_baseline, ratio, threshold, drift}
+    """
+    window = int(os.environ.get('ARIMAX_DRIFT_WINDOW', '48'))
+    min_rows = int(os.environ.get('ARIMAX_DRIFT_MIN_ROWS', '12'))
+    threshold = float(os.environ.get('ARIMAX_DRIFT_RATIO', '1.5'))
+    rows = min(rows_since_fit, window, len(residual))
+    result = {'rows': rows, 'rmse_recent': None, 'rmse_baseline': baseline_rmse, 'ratio': None, 'threshold': threshold, 'drift': False}
+    if rows < max(1, min_rows) or not baseline_rmse:
+        return result
+    rmse_recent = float(np.sqrt(np.mean(np.square(residual.values[-rows:]))))
+    ratio = rmse_recent / baseline_rmse
+    result.update(rmse_recent=rmse_recent, ratio=ratio, drift=ratio > threshold)
+    return result
+
+
+def refresh_arimax(
+    model_dir: Path,
+    observations: pd.DataFrame,
+    output_dir: Path,
+    force_refit: bool = False,
+) -> dict:
+    """
+    Memperbarui model ARIMAX bundle dengan observasi baru (extend, atau fitting penuh jika perlu).
+
+    File hasil (REFRESH_OUTPUT_FILES) ditulis ke output_dir untuk dipublikasikan sebagai bundle
+    baru bersama model LSTM bundle asal. Residual training hasil berisi residual bundle asal
+    ditambah residual one-step-ahead observasi baru (seed rollout LSTM dari observasi terakhir),
+    atau residual in-sample seluruh history setelah fitting penuh.
+
+    Args:
+        model_dir: Direktori bundle yang sedang dilayani
+        observations: Observasi baru (index timestamp, kolom wave_height dan wind_speed)
+        output_dir: Direktori tujuan file hasil refresh
+        force_refit: Jika True, selalu jalankan fitting penuh
+
+    Returns:
+        Dictionary ringkasan: mode ('extended', 'refit', atau 'unchanged'), refit_reason, jumlah
+        baris, sample_end, drift, dan fit_seconds
+
+    Raises:
+        InvalidObservationsError: Jika observasi tidak valid
+        FileNotFoundError: Jika dataset atau model belum ada
+    """
+    started = time.perf_counter()
+    history = load_observation_history()
+    appended, skipped = append_refresh_observations(history, observations)
+    history = pd.concat([history, appended]) if len(appended) else history
+    _check_history_order(history)
+
+    arimax_res = load_arimax_model(model_dir)
+    metadata = _load_refresh_metadata(model_dir, arimax_res, history)
+    order = tuple(int(value) for value in metadata['order_tuple'])
+    # Observasi yang belum dilihat model (validation/test untuk bundle hasil training, lalu observasi baru)
+    unseen = history[history.index > pd.Timestamp(metadata['sample_end'])]
+
+    summary = {
+        'rows_received': len(observations),
+        'rows_appended': len(appended),
+        'rows_skipped': skipped,
+        'rows_extended': 0,
+        'order': list(order),
+        'refit_reason': 'forced' if force_refit else ('scheduled' if _scheduled_refit_due(metadata) else None),
+        'drift': None,
+    }
+
+    residual = None
+    if summary['refit_reason'] is None:
+        if len(unseen) == 0:
+            summary.update(mode='unchanged', sample_end=metadata['sample_end'], fit_seconds=round(time.perf_counter() - started, 4))
+            return summary
+        base_residual = read_frame(get_residual_train_path(model_dir)).iloc[:, 0]
+        arimax_res, new_residual = extend_arimax(arimax_res, unseen)
+        residual = pd.concat([base_residual, new_residual])
+        metadata.update(
+            sample_end=str(unseen.index[-1]),
+            last_wind_speed=float(unseen['wind_speed'].iloc[-1]),
+            rows_since_fit=int(metadata['rows_since_fit']) + len(unseen),
+        )
+        summary['rows_extended'] = len(unseen)
+        summary['drift'] = measure_drift(residual, metadata['rows_since_fit'], metadata['residual_rmse'])
+        if summary['drift']['drift']:
+            summary['refit_reason'] = 'drift'
+
+    if summary['refit_reason'] is not None:
+        # Fitting penuh (MLE) pada seluruh history dengan order yang sama
+        arimax_res, _, residual = train_arimax(history, order=order, save=False)
+        metadata = build_arimax_metadata(order, history, residual, burn=int(arimax_res.loglikelihood_burn))
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    arimax_res.save(str(output_dir / 'arimax_model.pkl'))
+    with open(output_dir / 'arimax_model_metadata.json', 'w') as f:
+        json.dump(metadata, f)
+    write_frame(residual.rename(0), output_dir / BUNDLE_RESIDUAL_FILE)
+
+    summary.update(
+        mode='refit' if summary['refit_reason'] is not None else 'extended',
+        sample_end=metadata['sample_end'],
+        fit_seconds=round(time.perf_counter() - started, 4),
+    )
+    return summary
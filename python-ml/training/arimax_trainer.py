@@ -1,17 +1,102 @@
 """Modul untuk training model ARIMAX."""
 
+import hashlib
+import logging
+import math
+import multiprocessing
+import os
+import time
+import warnings
 import pandas as pd
 import numpy as np
-from statsmodels.tsa.statespace.sarimax import SARIMAX
 import joblib
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
 from pathlib import Path
+from utils.cache import DiskCache, hash_frame
 from utils.dataset import save_dataset, get_models_dir
 
+# Opsi fit SARIMAX; ikut menjadi bagian key cache hasil fitting
+ARIMAX_FIT_OPTIONS = {
+    'method': 'lbfgs',
+    'maxiter': 1000,
+    'enforce_stationarity': False,
+    'enforce_invertibility': False,
+}
+
+# Batas total ukuran cache fitting ARIMAX di disk (env ARIMAX_FIT_CACHE_BYTES)
+DEFAULT_ARIMAX_FIT_CACHE_BYTES = 512 * 1024 * 1024
+
+
+class ARIMAXFitTimeout(RuntimeError):
+    """Fitting ARIMAX melebihi batas waktu (wall-clock) per order."""
+
+
+def get_arimax_fit_cache() -> DiskCache:
+    """
+    Mendapatkan cache persisten hasil fitting ARIMAX (models/arimax_fit_cache).
+
+    Ukuran maksimum diatur dengan env ARIMAX_FIT_CACHE_SIZE (jumlah entri, default 32, 0 = nonaktif)
+    dan ARIMAX_FIT_CACHE_BYTES (total ukuran file, default 512 MiB, 0 = tanpa batas ukuran).
+    Satu entri berisi SARIMAXResults ter-pickle (~1.8 KB per baris training), sehingga batas
+    ukuran yang menjaga disk untuk dataset besar.
+
+    Returns:
+        DiskCache berisi tuple (model_terlatih, nilai_fitted, residual)
+    """
+    return DiskCache(
+        get_models_dir() / 'arimax_fit_cache',
+        maxsize=int(os.environ.get('ARIMAX_FIT_CACHE_SIZE', '32')),
+        max_bytes=int(os.environ.get('ARIMAX_FIT_CACHE_BYTES', str(DEFAULT_ARIMAX_FIT_CACHE_BYTES))) or None,
+    )
+
+
+def arimax_fit_cache_key(train: pd.DataFrame, order: tuple[int, int, int]) -> str:
+    """
+    Membuat key cache fitting ARIMAX dari isi data training, order, opsi fit, dan versi statsmodels.
+
+    Args:
+        train: DataFrame training (hanya kolom 'wave_height' dan 'wind_speed' yang dipakai)
+        order: Orde ARIMA (p, d, q)
+
+    Returns:
+        String hex SHA-1
+    """
+    import statsmodels
+
+    parts = [
+        hash_frame(train[['wave_height', 'wind_speed']]),
+        repr(tuple(int(value) for value in order)),
+        repr(sorted(ARIMAX_FIT_OPTIONS.items())),
+        statsmodels.__version__,
+    ]
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+
+class _FitDeadline:
+    """
+    Callback optimizer yang melempar ARIMAXFitTimeout setelah batas waktu terlewati.
+
+    Berupa class level modul (bukan closure) karena callback ikut tersimpan di hasil fit,
+    yang harus tetap dapat di-pickle (arimax_res.save dan process pool).
+    """
+
+    def __init__(self, order: tuple[int, int, int], max_seconds: float):
+        self.order = tuple(order)
+        self.max_seconds = max_seconds
+        self.deadline = time.monotonic() + max_seconds
+
+    def __call__(self, params):
+        if time.monotonic() > self.deadline:
+            raise ARIMAXFitTimeout(f'ARIMAX{self.order} fitting exceeded {self.max_seconds:g}s time limit')
+
 
 def train_arimax(
     train: pd.DataFrame,
     order: tuple[int, int, int] = (1, 0, 0),
     save_path: str | None = None,
+    save: bool = True,
+    max_seconds: float | None = None,
+    use_cache: bool = True,
 ) -> tuple[object, pd.Series, pd.Series]:
     """
     Melatih model ARIMAX pada data training.
@@ -26,6 +111,14 @@ def train_arimax(
                - d: derajat differencing (untuk membuat data stasioner)
                - q: jumlah lag error (moving average)
         save_path: Path opsional untuk menyimpan model (default: models/arimax_model.pkl)
+        save: Jika False, model dan metadata tidak ditulis ke direktori models
+              (dipakai oleh grid order di /evaluate/arimax-models)
+        max_seconds: Batas waktu optimasi (detik); None = tanpa batas
+        use_cache: Jika True, hasil fitting diambil dari / disimpan ke cache persisten
+              (lihat get_arimax_fit_cache), sehingga data dan order yang sama tidak di-fit ulang
+
+    Raises:
+        ARIMAXFitTimeout: Jika optimasi lbfgs belum selesai setelah max_seconds
 
     Returns:
         Tuple berisi (model_terlatih, nilai_fitted, residual)
@@ -40,27 +133,55 @@ def train_arimax(
     # Set seed untuk reproducibility (menggunakan numpy random seed)
     # Catatan: statsmodels menggunakan numpy random untuk optimasi, jadi set seed di sini
     np.random.seed(42)
-    
-    # Membuat dan melatih model SARIMAX
-    # SARIMAX adalah versi ARIMAX yang mendukung seasonal patterns
-    arimax = SARIMAX(
-        train['wave_height'],  # Variabel dependen: tinggi gelombang
-        order=order,  # Orde ARIMA (p, d, q)
-        exog=train[['wind_speed']],  # Variabel eksogen: kecepatan angin
-        enforce_stationarity=False,  # Tidak memaksa stasioneritas (sudah di-handle di preprocessing)
-        enforce_invertibility=False,  # Tidak memaksa invertibility
-    )
-    # Fit model ke data training
-    # Menggunakan method='lbfgs' dengan maxiter yang lebih tinggi untuk konsistensi
-    arimax_res = arimax.fit(disp=False, method='lbfgs', maxiter=1000)
 
-    # Menghitung nilai fitted (prediksi model pada data training)
-    fitted_train = arimax_res.fittedvalues
-    
-    # Menghitung residual (selisih aktual - prediksi)
-    # Residual ini akan digunakan untuk training model LSTM
-    residual_train = train['wave_height'] - fitted_train
-    residual_train = residual_train.dropna()  # Hapus nilai NaN
+    # Hasil fitting untuk data + order + opsi fit yang sama diambil dari cache persisten
+    fit_cache = get_arimax_fit_cache() if use_cache else None
+    cache_key = arimax_fit_cache_key(train, order) if fit_cache is not None else None
+    cached = fit_cache.get(cache_key) if fit_cache is not None else None
+    if cached is not None:
+        arimax_res, fitted_train, residual_train = cached
+    else:
+        # Import statsmodels hanya saat training dijalankan (startup API tetap cepat)
+        from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+        # Membuat dan melatih model SARIMAX
+        # SARIMAX adalah versi ARIMAX yang mendukung seasonal patterns
+        arimax = SARIMAX(
+            train['wave_height'],  # Variabel dependen: tinggi gelombang
+            order=order,  # Orde ARIMA (p, d, q)
+            exog=train[['wind_speed']],  # Variabel eksogen: kecepatan angin
+            enforce_stationarity=ARIMAX_FIT_OPTIONS['enforce_stationarity'],  # Tidak memaksa stasioneritas (sudah di-handle di preprocessing)
+            enforce_invertibility=ARIMAX_FIT_OPTIONS['enforce_invertibility'],  # Tidak memaksa invertibility
+        )
+        # Batas waktu dicek di callback optimizer (dipanggil setiap iterasi lbfgs)
+        callback = _FitDeadline(order, max_seconds) if max_seconds is not None else None
+
+        # Fit model ke data training
+        # Menggunakan method='lbfgs' dengan maxiter yang lebih tinggi untuk konsistensi
+        arimax_res = arimax.fit(
+            disp=False,
+            method=ARIMAX_FIT_OPTIONS['method'],
+            maxiter=ARIMAX_FIT_OPTIONS['maxiter'],
+            callback=callback,
+        )
+
+        # Menghitung nilai fitted (prediksi model pada data training)
+        fitted_train = arimax_res.fittedvalues
+        
+        # Menghitung residual (selisih aktual - prediksi)
+        # Residual ini akan digunakan untuk training model LSTM
+        residual_train = train['wave_height'] - fitted_train
+        residual_train = residual_train.dropna()  # Hapus nilai NaN
+
+        if fit_cache is not None:
+            try:
+                fit_cache.put(cache_key, (arimax_res, fitted_train, residual_train))
+            except OSError:
+                # Cache hanya optimasi; kegagalan menulis (contoh: disk penuh) tidak menggagalkan training
+                pass
+
+    if not save:
+        return arimax_res, fitted_train, residual_train
 
     # Menyimpan model ke file
     models_dir = get_models_dir()
@@ -74,16 +195,224 @@ def train_arimax(
     # Ini memungkinkan kita membandingkan order saat evaluasi
     import json
     metadata_path = models_dir / 'arimax_model_metadata.json'
-    metadata = {
+    metadata = build_arimax_metadata(order, train, residual_train, burn=int(arimax_res.loglikelihood_burn))
+    with open(metadata_path, 'w') as f:
+        json.dump(metadata, f)
+
+    return arimax_res, fitted_train, residual_train
+
+
+def residual_rmse(residual, burn: int = 0) -> float | None:
+    """
+    RMSE residual in-sample tanpa residual periode burn-in Kalman filter.
+
+    Residual awal selama inisialisasi diffuse (arimax_res.loglikelihood_burn, contoh: d=1
+    membuat resid[0] ~ y[0]) bukan error one-step-ahead dan akan membesarkan baseline drift.
+
+    Args:
+        residual: Residual in-sample model
+        burn: Jumlah residual awal yang diabaikan
+
+    Returns:
+        RMSE residual, atau None jika tidak ada residual setelah burn-in
+    """
+    values = np.asarray(residual, dtype=float)[burn:]
+    return float(np.sqrt(np.mean(np.square(values)))) if len(values) else None
+
+
+def build_arimax_metadata(order: tuple[int, int, int], data: pd.DataFrame, residual: pd.Series, burn: int = 0) -> dict:
+    """
+    Membuat metadata model ARIMAX setelah fitting penuh (MLE).
+
+    Selain order, metadata mencatat akhir sampel model (observasi terakhir yang sudah
+    dilihat model) dan RMSE residual in-sample (tanpa burn-in) sebagai baseline deteksi
+    drift saat refresh.
+
+    Args:
+        order: Orde ARIMA (p, d, q)
+        data: DataFrame yang dipakai untuk fitting
+        residual: Residual in-sample model
+        burn: Jumlah residual burn-in awal (arimax_res.loglikelihood_burn)
+
+    Returns:
+        Dictionary metadata (disimpan sebagai arimax_model_metadata.json)
+    """
+    return {
         'order': {
             'p': order[0],
             'd': order[1],
             'q': order[2],
         },
         'order_tuple': order,
+        'sample_end': str(data.index[-1]),
+        'last_wind_speed': float(data['wind_speed'].iloc[-1]),
+        'fitted_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'residual_rmse': residual_rmse(residual, burn),
+        'rows_since_fit': 0,
     }
-    with open(metadata_path, 'w') as f:
-        json.dump(metadata, f)
 
-    return arimax_res, fitted_train, residual_train
 
+def extend_arimax(arimax_res, new_data: pd.DataFrame) -> tuple[object, pd.Series]:
+    """
+    Memperpanjang model ARIMAX dengan observasi baru tanpa estimasi ulang parameter.
+
+    SARIMAXResults.extend menjalankan Kalman filter hanya pada baris baru, mulai dari state
+    akhir model, sehingga biayanya sebanding dengan jumlah observasi baru (bukan seluruh
+    history). Forecast model hasil extend dimulai setelah observasi terakhir.
+
+    Args:
+        arimax_res: Model ARIMAX terlatih (SARIMAXResults)
+        new_data: Observasi baru (kolom 'wave_height' dan 'wind_speed'), lanjutan langsung
+                  dari akhir sampel model
+
+    Returns:
+        Tuple (model_diperpanjang, residual one-step-ahead pada observasi baru)
+    """
+    # Array (bukan Series) agar statsmodels tidak menuntut frekuensi index pada data baru
+    extended = arimax_res.extend(
+        new_data['wave_height'].to_numpy(dtype=float),
+        exog=new_data[['wind_speed']].to_numpy(dtype=float),
+    )
+    residual = new_data['wave_height'].to_numpy(dtype=float) - np.asarray(extended.fittedvalues, dtype=float)
+    return extended, pd.Series(residual, index=new_data.index)
+
+
+
+def _failed_outcome(order: tuple[int, int, int], error: str | None, timed_out: bool = False) -> dict:
+    """Hasil fit_arimax_order() tanpa model (juga dipakai sebagai nilai awal)."""
+    return {
+        'order': tuple(order),
+        'result': None,
+        'error': error,
+        'timed_out': timed_out,
+        'converged': None,
+        'convergence_warnings': [],
+        'fit_seconds': None,
+    }
+
+
+def fit_arimax_order(
+    train: pd.DataFrame,
+    order: tuple[int, int, int],
+    max_seconds: float | None = None,
+) -> dict:
+    """
+    Melatih satu order ARIMAX tanpa menyimpan model, sambil mencatat status konvergensi.
+
+    Fungsi level modul agar dapat dijalankan di process pool grid order. Error (termasuk
+    timeout) tidak dilempar, tetapi dikembalikan di kolom 'error'.
+
+    Args:
+        train: DataFrame training
+        order: Orde ARIMA (p, d, q)
+        max_seconds: Batas waktu fitting (detik); None = tanpa batas
+
+    Returns:
+        Dictionary berisi:
+        - order: Orde yang dilatih
+        - result: Tuple (model_terlatih, nilai_fitted, residual), atau None jika gagal
+        - error: Pesan error, atau None jika berhasil
+        - timed_out: True jika fitting dihentikan karena melebihi max_seconds
+        - converged: Status konvergensi optimizer (mle_retvals['converged']), None jika gagal
+        - convergence_warnings: Pesan ConvergenceWarning dari statsmodels
+        - fit_seconds: Lama fitting (detik)
+    """
+    from statsmodels.tools.sm_exceptions import ConvergenceWarning
+
+    outcome = _failed_outcome(order, None)
+    started = time.monotonic()
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always', ConvergenceWarning)
+        try:
+            outcome['result'] = train_arimax(train, order=tuple(order), save=False, max_seconds=max_seconds)
+        except ARIMAXFitTimeout as e:
+            outcome['error'] = str(e)
+            outcome['timed_out'] = True
+        except Exception as e:
+            outcome['error'] = str(e)
+    outcome['fit_seconds'] = time.monotonic() - started
+    outcome['convergence_warnings'] = sorted({
+        str(warning.message) for warning in caught if issubclass(warning.category, ConvergenceWarning)
+    })
+    if outcome['result'] is not None:
+        retvals = getattr(outcome['result'][0], 'mle_retvals', None) or {}
+        outcome['converged'] = bool(retvals.get('converged', not outcome['convergence_warnings']))
+    return outcome
+
+
+def fit_arimax_grid(
+    train: pd.DataFrame,
+    orders: list[tuple[int, int, int]],
+    max_workers: int | None = None,
+    max_seconds: float | None = None,
+) -> list[dict]:
+    """
+    Melatih sekumpulan order ARIMAX secara paralel di process pool, dengan batas waktu per order.
+
+    Setiap order diberi batas waktu optimasi max_seconds (env ARIMAX_ORDER_TIMEOUT, default 60,
+    0 = tanpa batas). Sebagai pengaman untuk order yang macet di luar iterasi optimizer, hasil
+    yang belum selesai setelah max_seconds * jumlah putaran worker juga dianggap timeout, dan
+    proses worker-nya dihentikan paksa.
+
+    Args:
+        train: DataFrame training
+        orders: List orde (p, d, q)
+        max_workers: Jumlah proses (default: env ARIMAX_GRID_WORKERS atau jumlah CPU; 1 = berurutan)
+        max_seconds: Batas waktu per order (detik)
+
+    Returns:
+        List hasil fit_arimax_order(), urutannya sama dengan orders
+    """
+    orders = [tuple(order) for order in orders]
+    if max_seconds is None:
+        max_seconds = float(os.environ.get('ARIMAX_ORDER_TIMEOUT', '60')) or None
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+    if max_workers is None:
+        max_workers = int(os.environ.get('ARIMAX_GRID_WORKERS', '0')) or cpus
+    max_workers = max(1, min(max_workers, len(orders)))
+    if max_workers <= 1:
+        return [fit_arimax_order(train, order, max_seconds) for order in orders]
+
+    executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+    futures = [executor.submit(fit_arimax_order, train, order, max_seconds) for order in orders]
+    deadline = None
+    if max_seconds is not None:
+        # +30 detik untuk start proses spawn dan import statsmodels
+        deadline = time.monotonic() + max_seconds * math.ceil(len(orders) / max_workers) + 30
+    outcomes = []
+    try:
+        for order, future in zip(orders, futures):
+            try:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                outcomes.append(future.result(timeout=timeout))
+            except FutureTimeoutError:
+                outcomes.append(_failed_outcome(order, f'ARIMAX{order} fitting exceeded {max_seconds:g}s time limit', timed_out=True))
+            except Exception as e:
+                # Contoh: proses worker mati (BrokenProcessPool)
+                outcomes.append(_failed_outcome(order, str(e) or type(e).__name__))
+    finally:
+        # Order yang macet melewati deadline: hentikan proses worker-nya agar tidak terus
+        # memakai CPU di belakang (batas waktu berlaku untuk CPU, bukan hanya wall-clock)
+        if not all(future.done() for future in futures) and _terminate_workers(executor) == 0:
+            logging.warning('ARIMAX grid deadline exceeded but no worker processes were found to terminate')
+        # Jangan menunggu order yang macet; order yang belum mulai dibatalkan
+        executor.shutdown(wait=False, cancel_futures=True)
+    return outcomes
+
+
+def _terminate_workers(executor: ProcessPoolExecutor) -> int:
+    """
+    Menghentikan paksa semua proses worker process pool (untuk order yang macet).
+
+    ProcessPoolExecutor tidak menyediakan API publik untuk worker-nya, sehingga proses diambil
+    dari atribut _processes (dijaga oleh tests/test_arimax_trainer.py).
+
+    Returns:
+        Jumlah proses worker yang dihentikan
+    """
+    processes = [process for process in (getattr(executor, '_processes', None) or {}).values() if process.is_alive()]
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join(timeout=5)
+    return len(processes)
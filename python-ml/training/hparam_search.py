@@ -0,0 +1,297 @@
+"""
+Pencarian Hyperparameter LSTM Residual dengan Successive Halving
+
+Ruang pencarian: window, lstm_units, learning_rate, batch_size, dan seed. Setiap konfigurasi
+dilatih dengan train_lstm_residual dalam beberapa rung dengan jumlah epoch yang meningkat
+(contoh: 2 -> 6 -> 10 epoch, rung terakhir = budget quick_eval). Setelah setiap rung hanya
+1/eta konfigurasi terbaik yang dilanjutkan; konfigurasi yang kalah berhenti lebih awal.
+
+Konfigurasi yang dipromosikan tidak dilatih ulang dari awal: training dilanjutkan dari state
+akhir rung sebelumnya (bobot, state optimizer, early stopping) lewat
+train_lstm_residual(warm_start=...).
+
+Seluruh pencarian dibatasi oleh budget total (jumlah epoch training, dan opsional waktu).
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.evaluation import calculate_metrics
+from utils.forecasting import predict_residuals_iterative
+from .hybrid_trainer import (
+    QUICK_EVAL_EPOCHS,
+    QUICK_EVAL_PATIENCE,
+    _training_state_capture_class,
+    train_lstm_residual,
+)
+
+# Nama hyperparameter di ruang pencarian (urutan kolom leaderboard)
+SEARCH_SPACE_KEYS = ('window', 'lstm_units', 'learning_rate', 'batch_size', 'seed')
+
+
+def sample_configs(search_space: dict, n_configs: int, sample_seed: int = 0) -> list[dict]:
+    """
+    Mengambil sampel konfigurasi (tanpa pengulangan) dari grid ruang pencarian.
+
+    Args:
+        search_space: Dictionary {nama hyperparameter: list nilai} untuk SEARCH_SPACE_KEYS
+        n_configs: Jumlah konfigurasi (semua kombinasi jika grid lebih kecil)
+        sample_seed: Seed pengambilan sampel
+
+    Returns:
+        List konfigurasi (dictionary berisi SEARCH_SPACE_KEYS)
+    """
+    grid = [
+        dict(zip(SEARCH_SPACE_KEYS, values))
+        for values in itertools.product(*(search_space[key] for key in SEARCH_SPACE_KEYS))
+    ]
+    if n_configs >= len(grid):
+        return grid
+    return random.Random(sample_seed).sample(grid, n_configs)
+
+
+def rung_schedule(min_epochs: int, eta: int, max_epochs: int = QUICK_EVAL_EPOCHS) -> list[int]:
+    """
+    Jumlah epoch kumulatif per rung: min_epochs * eta^k, dibatasi max_epochs (rung terakhir).
+
+    Contoh: min_epochs=2, eta=3, max_epochs=10 -> [2, 6, 10]
+    """
+    rungs = []
+    epochs = max(1, min_epochs)
+    while epochs < max_epochs:
+        rungs.append(epochs)
+        epochs *= eta
+    rungs.append(max_epochs)
+    return rungs
+
+
+def planned_epochs(n_configs: int, rungs: list[int], eta: int) -> int:
+    """Jumlah epoch training maksimum untuk n_configs konfigurasi pada jadwal rung (tanpa early stopping)."""
+    total = 0
+    previous = 0
+    survivors = n_configs
+    for epochs in rungs:
+        total += survivors * (epochs - previous)
+        previous = epochs
+        survivors = max(1, math.ceil(survivors / eta))
+    return total
+
+
+def train_trial(
+    residual_train: pd.Series,
+    residual_val: pd.Series | None,
+    config: dict,
+    epochs: int,
+    n_steps: int,
+    warm_start: dict | None = None,
+) -> dict:
+    """
+    Melatih satu konfigurasi sampai `epochs` (melanjutkan warm_start jika ada) dan memprediksi
+    residual n_steps ke depan dari akhir data training.
+
+    Returns:
+        Dictionary {predicted_resid, weights, final_weights, optimizer_state, scaler,
+        training_history}, dapat dipakai sebagai warm_start rung berikutnya
+    """
+    capture = _training_state_capture_class()()
+    model_lstm, scaler, training_history = train_lstm_residual(
+        residual_train,
+        window=config['window'],
+        lstm_units=config['lstm_units'],
+        epochs=epochs,
+        batch_size=config['batch_size'],
+        patience=QUICK_EVAL_PATIENCE,
+        seed=config['seed'],
+        residual_val=residual_val,
+        learning_rate=config['learning_rate'],
+        save=False,
+        callbacks=[capture],
+        warm_start=warm_start,
+    )
+    window = config['window']
+    resid_scaled = scaler.transform(residual_train.values.reshape(-1, 1))
+    predicted_resid = predict_residuals_iterative(
+        model_lstm,
+        scaler,
+        resid_scaled[-window:].reshape(1, window, 1),
+        n_steps=n_steps,
+        window=window,
+    )
+    return {
+        'predicted_resid': predicted_resid,
+        'weights': model_lstm.get_weights(),
+        # Jika training dilewati (warm start yang sudah early stop), state lama tetap berlaku
+        'final_weights': capture.final_weights if capture.final_weights is not None else warm_start['final_weights'],
+        'optimizer_state': capture.optimizer_state if capture.optimizer_state is not None else warm_start['optimizer_state'],
+        'scaler': scaler,
+        'training_history': training_history,
+    }
+
+
+def successive_halving_search(
+    residual_train: pd.Series,
+    residual_val: pd.Series | None,
+    arimax_pred_test: np.ndarray,
+    y_true_test: np.ndarray,
+    arimax_pred_val: np.ndarray | None,
+    y_true_val: np.ndarray | None,
+    search_space: dict,
+    n_configs: int = 27,
+    eta: int = 3,
+    min_epochs: int = 2,
+    budget_epochs: int = 150,
+    time_budget_seconds: float | None = None,
+    sample_seed: int = 0,
+) -> dict:
+    """
+    Menjalankan pencarian hyperparameter successive halving.
+
+    Skor konfigurasi adalah Hybrid MAPE pada validation set (ARIMAX + residual LSTM yang
+    di-rollout dari akhir data training), atau pada test set jika validation tidak tersedia.
+    Jika rencana epoch melebihi budget_epochs, jumlah konfigurasi dikurangi; jika budget
+    (epoch atau waktu) habis di tengah pencarian, konfigurasi yang belum dilatih ditandai
+    'budget_exhausted' dan pencarian berhenti.
+
+    Args:
+        residual_train: Residual training ARIMAX
+        residual_val: Residual validation ARIMAX (untuk early stopping), opsional
+        arimax_pred_test, y_true_test: Forecast ARIMAX dan nilai aktual test set
+        arimax_pred_val, y_true_val: Forecast ARIMAX dan nilai aktual validation set (opsional)
+        search_space: Dictionary {nama hyperparameter: list nilai} untuk SEARCH_SPACE_KEYS
+        n_configs: Jumlah konfigurasi awal
+        eta: Faktor halving (1/eta konfigurasi terbaik dilanjutkan ke rung berikutnya)
+        min_epochs: Jumlah epoch rung pertama
+        budget_epochs: Budget total epoch training
+        time_budget_seconds: Budget waktu total (detik), None = tanpa batas
+        sample_seed: Seed pengambilan sampel konfigurasi
+
+    Returns:
+        Dictionary berisi metric, rungs, budget, leaderboard (terurut, terbaik di depan), dan best
+    """
+    started = time.monotonic()
+    eta = max(2, eta)
+    rungs = rung_schedule(min_epochs, eta)
+    use_validation = y_true_val is not None and arimax_pred_val is not None and len(y_true_val) > 0
+    metric = 'hybrid_mape_val' if use_validation else 'hybrid_mape_test'
+    n_steps = max(len(y_true_test), len(y_true_val) if use_validation else 0)
+
+    # Kurangi jumlah konfigurasi sampai rencana epoch muat di budget
+    n_configs = max(1, n_configs)
+    while n_configs > 1 and planned_epochs(n_configs, rungs, eta) > budget_epochs:
+        n_configs -= 1
+    configs = sample_configs(search_space, n_configs, sample_seed)
+
+    trials = [
+        {'trial': i, 'config': config, 'status': 'pending', 'rung': None, 'epochs': 0, 'state': None}
+        for i, config in enumerate(configs)
+    ]
+    epochs_used = 0
+    budget_exhausted = False
+    active = list(trials)
+
+    for rung_index, rung_epochs in enumerate(rungs):
+        for trial in active:
+            over_time = time_budget_seconds is not None and time.monotonic() - started > time_budget_seconds
+            if over_time or epochs_used + (rung_epochs - trial['epochs']) > budget_epochs:
+                budget_exhausted = True
+                break
+            try:
+                state = train_trial(
+                    residual_train,
+                    residual_val,
+                    trial['config'],
+                    epochs=rung_epochs,
+                    n_steps=n_steps,
+                    warm_start=trial['state'],
+                )
+            except Exception as e:
+                trial.update(status='error', error=str(e), state=None)
+                continue
+            history = state['training_history']
+            epochs_used += history['epochs_trained'] - trial['epochs']
+            predicted_resid = state['predicted_resid']
+            scores = {
+                'hybrid_mape_test': float(calculate_metrics(
+                    y_true_test, arimax_pred_test + predicted_resid[:len(y_true_test)],
+                )['mape']),
+            }
+            if use_validation:
+                scores['hybrid_mape_val'] = float(calculate_metrics(
+                    y_true_val, arimax_pred_val + predicted_resid[:len(y_true_val)],
+                )['mape'])
+            trial.update(
+                status='running',
+                rung=rung_index,
+                epochs=history['epochs_trained'],
+                state=state,
+                best_val_loss=min(history['val_loss']) if history.get('val_loss') else None,
+                early_stopped=history['early_stopped'],
+                **scores,
+            )
+
+        finished = [trial for trial in active if trial['rung'] == rung_index and trial['status'] == 'running']
+        if budget_exhausted or rung_index == len(rungs) - 1:
+            break
+        # Promosikan 1/eta konfigurasi terbaik; sisanya berhenti di rung ini
+        finished.sort(key=lambda trial: trial[metric])
+        survivors = finished[:max(1, math.ceil(len(finished) / eta))]
+        for trial in finished[len(survivors):]:
+            trial.update(status='stopped', state=None)
+        active = survivors
+
+    for trial in trials:
+        if trial['status'] == 'running':
+            trial['status'] = 'completed' if trial['rung'] == len(rungs) - 1 else 'budget_exhausted'
+        elif trial['status'] == 'pending':
+            trial['status'] = 'budget_exhausted'
+        trial.pop('state', None)
+
+    # Leaderboard: rung tertinggi lebih dulu, lalu skor terendah
+    ranked = sorted(
+        trials,
+        key=lambda trial: (
+            -(trial['rung'] if trial['rung'] is not None else -1),
+            trial.get(metric, float('inf')),
+        ),
+    )
+    leaderboard = []
+    for rank, trial in enumerate(ranked, start=1):
+        entry = {
+            'rank': rank,
+            **trial['config'],
+            'status': trial['status'],
+            'rung': trial['rung'],
+            'epochs_trained': trial['epochs'],
+            'hybrid_mape_val': trial.get('hybrid_mape_val'),
+            'hybrid_mape_test': trial.get('hybrid_mape_test'),
+            'best_val_loss': trial.get('best_val_loss'),
+            'early_stopped': trial.get('early_stopped'),
+        }
+        if 'error' in trial:
+            entry['error'] = trial['error']
+        leaderboard.append(entry)
+
+    best = next((entry for entry in leaderboard if entry.get(metric) is not None), None)
+    return {
+        'metric': metric,
+        'rungs': rungs,
+        'eta': eta,
+        'n_configs': len(configs),
+        'budget': {
+            'budget_epochs': budget_epochs,
+            'epochs_used': epochs_used,
+            'planned_epochs': planned_epochs(len(configs), rungs, eta),
+            'time_budget_seconds': time_budget_seconds,
+            'elapsed_seconds': round(time.monotonic() - started, 2),
+            'exhausted': budget_exhausted,
+        },
+        'leaderboard': leaderboard,
+        'best': best,
+    }
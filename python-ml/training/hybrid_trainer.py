@@ -1,21 +1,43 @@
 """Modul untuk training model LSTM pada residual ARIMAX (bagian dari model Hybrid)."""
 
+from __future__ import annotations
+
 import random
 import os
+import multiprocessing
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
 import joblib
-import tensorflow as tf
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense
-from tensorflow.keras.callbacks import EarlyStopping
-from tensorflow.keras.optimizers import Adam
 from pathlib import Path
+from typing import TYPE_CHECKING
 import json
-from utils.forecasting import create_sequences
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from utils.forecasting import create_sequences, make_sequence_dataset, predict_residuals_iterative
 from utils.dataset import get_models_dir
 
+if TYPE_CHECKING:
+    import tensorflow as tf
+    from sklearn.preprocessing import MinMaxScaler
+
+
+# Budget training mode quick_eval (seed search, pencarian hyperparameter)
+QUICK_EVAL_EPOCHS = 10
+QUICK_EVAL_PATIENCE = 5
+
+# Profil training LSTM: 'default' (konfigurasi asli, deterministik) atau 'fast' (throughput)
+TRAINING_PROFILES = ('default', 'fast')
+# Profil fast: batch dibesarkan sampai tersisa minimal FAST_MIN_STEPS_PER_EPOCH step per epoch
+FAST_MIN_STEPS_PER_EPOCH = 8
+FAST_MAX_BATCH_SIZE = 256
+
+# Batas default jumlah proses seed search: setiap proses meng-import TensorFlow sendiri
+# (ratusan MB RSS), sehingga lebih banyak proses hanya lewat env SEED_SEARCH_WORKERS
+DEFAULT_SEED_SEARCH_WORKERS = 4
+
+# Event pembatalan seed search di proses worker (diset oleh _init_seed_search_worker)
+_seed_search_cancel_event = None
+
 
 def train_lstm_residual(
     residual_train: pd.Series,
@@ -28,6 +50,13 @@ def train_lstm_residual(
     residual_val: pd.Series | None = None,
     quick_eval: bool = False,  # Jika True, gunakan epochs lebih sedikit untuk evaluasi cepat
     learning_rate: float = 0.001,  # Learning rate default Adam
+    save: bool = True,
+    callbacks: list | None = None,
+    warm_start: dict | None = None,
+    streaming: bool | None = None,
+    profile: str | None = None,
+    deterministic: bool | None = None,
+    jit_compile: bool | None = None,
 ) -> tuple[tf.keras.Model, MinMaxScaler, dict]:
     """
     Melatih model LSTM pada residual dari model ARIMAX.
@@ -48,8 +77,22 @@ def train_lstm_residual(
         patience: Jumlah epoch tanpa improvement sebelum early stopping
         seed: Random seed untuk reproducibility
         residual_val: Residual validation data (opsional). Jika tersedia, digunakan untuk early stopping
-        quick_eval: Jika True, gunakan epochs lebih sedikit (10) untuk evaluasi cepat saat seed search
+        quick_eval: Jika True, gunakan epochs lebih sedikit (QUICK_EVAL_EPOCHS) untuk evaluasi cepat saat seed search
         learning_rate: Learning rate untuk Adam optimizer (default 0.001)
+        save: Jika False, model, scaler, dan history tidak ditulis ke direktori models
+              (dipakai oleh kandidat seed search yang berjalan paralel)
+        callbacks: Callback Keras tambahan (contoh: pembatalan seed search)
+        warm_start: Hasil train_seed_candidate() dengan seed yang sama (opsional). Jika diberikan,
+              training dilanjutkan dari state akhir kandidat (bobot epoch terakhir, state optimizer,
+              state early stopping) mulai dari epoch berikutnya sampai `epochs`, bukan dari awal.
+              History kandidat digabung dengan epoch lanjutan.
+        streaming: Jika True, data training/validation diberikan sebagai pipeline tf.data
+              (make_sequence_dataset) alih-alih array window. None = otomatis, streaming jika
+              jumlah window >= env LSTM_STREAMING_MIN_WINDOWS (default 200000)
+        profile: Profil training ('default' atau 'fast', lihat resolve_training_profile).
+              None = env LSTM_TRAINING_PROFILE (default 'default')
+        deterministic: Override op determinism profil (None = sesuai profil)
+        jit_compile: Override kompilasi XLA train step profil (None = sesuai profil)
 
     Returns:
         Tuple berisi (model_lstm_terlatih, scaler_yang_digunakan, training_history)
@@ -57,6 +100,14 @@ def train_lstm_residual(
         - scaler: Scaler yang digunakan untuk normalisasi (diperlukan saat prediksi)
         - training_history: Dictionary berisi history training (loss, val_loss per epoch)
     """
+    # Import TensorFlow dan sklearn hanya saat training dijalankan (startup API tetap cepat)
+    import tensorflow as tf
+    from sklearn.preprocessing import MinMaxScaler
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import LSTM, Dense
+    from tensorflow.keras.callbacks import EarlyStopping
+    from tensorflow.keras.optimizers import Adam
+
     # Siapkan data residual: ubah ke format numpy array dengan shape (n_samples, 1)
     resid_vals = residual_train.values.reshape(-1, 1)
 
@@ -65,11 +116,28 @@ def train_lstm_residual(
     scaler = MinMaxScaler(feature_range=(0, 1))
     resid_scaled = scaler.fit_transform(resid_vals)
 
+    # Series yang sangat panjang di-stream lewat tf.data (window dibentuk per batch)
+    if streaming is None:
+        streaming = len(resid_scaled) - window >= int(os.environ.get('LSTM_STREAMING_MIN_WINDOWS', '200000'))
+
+    # Pengaturan profil training (batch size, learning rate, XLA, determinism)
+    settings = resolve_training_profile(
+        profile,
+        max(0, len(resid_scaled) - window),
+        batch_size,
+        learning_rate,
+        deterministic=deterministic,
+        jit_compile=jit_compile,
+    )
+    batch_size = settings['batch_size']
+    learning_rate = settings['learning_rate']
+
     # Buat sequence data untuk LSTM
     # LSTM membutuhkan data dalam bentuk sequence (X, y) dimana:
     # - X: window data sebelumnya
     # - y: nilai yang akan diprediksi
-    X_train, y_train = create_sequences(resid_scaled, window)
+    # create_sequences mengembalikan view (tanpa salinan) ke resid_scaled
+    X_train, y_train = (None, None) if streaming else create_sequences(resid_scaled, window)
 
     # Siapkan validation data jika tersedia
     X_val = None
@@ -81,8 +149,11 @@ def train_lstm_residual(
         # Normalisasi validation residual menggunakan scaler yang sama dengan training
         resid_val_vals = residual_val.values.reshape(-1, 1) if residual_val.ndim > 1 else residual_val.values.reshape(-1, 1)
         resid_val_scaled = scaler.transform(resid_val_vals)
-        X_val, y_val = create_sequences(resid_val_scaled, window)
-        validation_data = (X_val, y_val)
+        if streaming:
+            validation_data = make_sequence_dataset(resid_val_scaled, window, batch_size)
+        else:
+            X_val, y_val = create_sequences(resid_val_scaled, window)
+            validation_data = (X_val, y_val)
         monitor_metric = 'val_loss'  # Monitor validation loss jika validation data tersedia
 
     # Set ALL random seeds untuk reproducibility (PENTING: SEBELUM membuat model!)
@@ -94,14 +165,6 @@ def train_lstm_residual(
     # Set environment variable untuk reproducibility
     os.environ['PYTHONHASHSEED'] = str(seed)
     
-    # Enable TensorFlow determinism (jika tersedia)
-    # Ini memastikan operasi TensorFlow deterministik
-    try:
-        tf.config.experimental.enable_op_determinism()
-    except (AttributeError, ValueError):
-        # TensorFlow determinism tidak tersedia di versi lama atau sudah di-set
-        pass
-    
     # Bangun arsitektur model LSTM (single layer, tanpa dropout - konfigurasi 27% MAPE)
     model_lstm = Sequential([
         # Layer LSTM dengan lstm_units neuron
@@ -113,7 +176,8 @@ def train_lstm_residual(
     # Compile model dengan optimizer Adam dan loss function MSE (Mean Squared Error)
     # Adam optimizer dengan learning rate yang dapat diatur
     optimizer = Adam(learning_rate=learning_rate)
-    model_lstm.compile(optimizer=optimizer, loss='mse')
+    # jit_compile=True: train step dikompilasi XLA (profil fast pada data besar)
+    model_lstm.compile(optimizer=optimizer, loss='mse', jit_compile=settings['jit_compile'])
 
     # Setup Early Stopping untuk mencegah overfitting
     # Akan berhenti training jika loss tidak membaik selama 'patience' epoch
@@ -125,8 +189,8 @@ def train_lstm_residual(
         verbose=0,  # Tidak tampilkan log
     )
     # Adjust epochs untuk quick evaluation (seed search)
-    actual_epochs = 10 if quick_eval else epochs
-    actual_patience = 5 if quick_eval else patience
+    actual_epochs = QUICK_EVAL_EPOCHS if quick_eval else epochs
+    actual_patience = QUICK_EVAL_PATIENCE if quick_eval else patience
     
     # Update early stopping patience untuk quick eval
     if quick_eval:
@@ -136,54 +200,702 @@ def train_lstm_residual(
             restore_best_weights=True,
             verbose=0,
         )
-    
-    # Training model LSTM
-    # Menggunakan history untuk menyimpan loss per epoch
-    history = model_lstm.fit(
-        X_train,  # Input features (sequences)
-        y_train,  # Target values (nilai residual yang akan diprediksi)
-        epochs=actual_epochs,  # Maksimum jumlah epoch (dikurangi untuk quick eval)
-        batch_size=batch_size,  # Ukuran batch
-        validation_data=validation_data,  # Validation data (jika tersedia)
-        callbacks=[es],  # Gunakan early stopping callback
-        verbose=0,  # Tidak tampilkan log training
-    )
+
+    # History loss per epoch (diawali history kandidat seed search jika warm start)
+    history_dict = {}
+    initial_epoch = 0
+    if warm_start is not None:
+        warm_history = warm_start['training_history']
+        history_dict = {
+            key: list(warm_history[key]) for key in ('loss', 'val_loss') if key in warm_history
+        }
+        initial_epoch = warm_history['epochs_trained']
+        # Lanjutkan dari bobot epoch terakhir dan state Adam (moment, iterations) kandidat
+        model_lstm.set_weights(warm_start['final_weights'])
+        optimizer.build(model_lstm.trainable_variables)
+        for variable, value in zip(optimizer.variables, warm_start['optimizer_state']):
+            variable.assign(value)
+        # Early stopping melanjutkan best/wait dari kandidat, sehingga bobot yang dipulihkan
+        # tidak pernah lebih buruk (pada monitor_metric) dari model hasil seed search
+        es = _warm_start_early_stopping_class()(
+            history_dict.get(monitor_metric, []),
+            warm_start['weights'],
+            monitor=monitor_metric,
+            patience=actual_patience,
+            restore_best_weights=True,
+            verbose=0,
+        )
+
+    if warm_start is not None and (warm_history['early_stopped'] or initial_epoch >= actual_epochs):
+        # Kandidat sudah berhenti oleh early stopping: training penuh dengan seed yang sama
+        # akan berhenti di epoch yang sama, jadi cukup pakai bobot terbaik kandidat
+        model_lstm.set_weights(warm_start['weights'])
+    else:
+        # Training model LSTM
+        # Menggunakan history untuk menyimpan loss per epoch
+        if streaming:
+            # Dataset (X, y) ter-batch dan di-prefetch; window diacak ulang setiap epoch
+            train_inputs = {'x': make_sequence_dataset(resid_scaled, window, batch_size, shuffle=True, seed=seed)}
+        else:
+            train_inputs = {
+                'x': X_train,  # Input features (sequences)
+                'y': y_train,  # Target values (nilai residual yang akan diprediksi)
+                'batch_size': batch_size,  # Ukuran batch
+            }
+        # Op determinism TensorFlow selama training (profil fast menonaktifkannya); state
+        # sebelumnya dikembalikan setelah fit() karena setting ini berlaku untuk seluruh proses
+        with _op_determinism(settings['deterministic']):
+            history = model_lstm.fit(
+                **train_inputs,
+                epochs=actual_epochs,  # Maksimum jumlah epoch (dikurangi untuk quick eval)
+                initial_epoch=initial_epoch,  # > 0 jika melanjutkan kandidat seed search
+                validation_data=validation_data,  # Validation data (jika tersedia)
+                callbacks=[es] + list(callbacks or []),  # Gunakan early stopping callback
+                verbose=0,  # Tidak tampilkan log training
+            )
+        for key, values in history.history.items():
+            if key in ('loss', 'val_loss'):
+                history_dict.setdefault(key, []).extend(values)
 
     # Simpan model dan scaler ke file
     models_dir = get_models_dir()
-    models_dir.mkdir(exist_ok=True)  # Buat folder jika belum ada
-    # Simpan model LSTM ke format .h5 (format Keras/TensorFlow)
-    model_lstm.save(str(models_dir / 'lstm_residual_model.h5'))
-    # Simpan scaler menggunakan joblib (diperlukan untuk denormalisasi saat prediksi)
-    joblib.dump(scaler, str(models_dir / 'residual_scaler.save'))
+    if save:
+        models_dir.mkdir(exist_ok=True)  # Buat folder jika belum ada
+        # Simpan model LSTM ke format .h5 (format Keras/TensorFlow)
+        model_lstm.save(str(models_dir / 'lstm_residual_model.h5'))
+        # Simpan scaler menggunakan joblib (diperlukan untuk denormalisasi saat prediksi)
+        joblib.dump(scaler, str(models_dir / 'residual_scaler.save'))
 
     # Extract training history
     training_history = {
-        'loss': [float(x) for x in history.history['loss']],
-        'epochs_trained': len(history.history['loss']),
+        'loss': [float(x) for x in history_dict['loss']],
+        'epochs_trained': len(history_dict['loss']),
         'max_epochs': actual_epochs,
-        'early_stopped': len(history.history['loss']) < actual_epochs,
+        'early_stopped': len(history_dict['loss']) < actual_epochs,
+        'training_profile': settings,
     }
+    if warm_start is not None:
+        training_history['warm_start_epoch'] = initial_epoch
+    if isinstance(residual_train.index, pd.DatetimeIndex) and len(residual_train):
+        # Residual terakhir yang dilatih (batas residual baru untuk fine-tuning, lihat lstm_finetune)
+        training_history['residual_end'] = str(residual_train.index[-1])
     
     # Add validation loss if available
-    if 'val_loss' in history.history:
-        training_history['val_loss'] = [float(x) for x in history.history['val_loss']]
+    if 'val_loss' in history_dict:
+        training_history['val_loss'] = [float(x) for x in history_dict['val_loss']]
     
     # Create detailed epoch-by-epoch data
     training_history['epochs'] = []
-    for epoch in range(len(history.history['loss'])):
+    for epoch in range(len(history_dict['loss'])):
         epoch_data = {
             'epoch': epoch + 1,
-            'loss': float(history.history['loss'][epoch]),
+            'loss': float(history_dict['loss'][epoch]),
         }
-        if 'val_loss' in history.history:
-            epoch_data['val_loss'] = float(history.history['val_loss'][epoch])
+        if 'val_loss' in history_dict:
+            epoch_data['val_loss'] = float(history_dict['val_loss'][epoch])
         training_history['epochs'].append(epoch_data)
     
     # Save training history to JSON file
-    history_path = models_dir / 'lstm_training_history.json'
-    with open(history_path, 'w') as f:
-        json.dump(training_history, f, indent=2)
+    if save:
+        history_path = models_dir / 'lstm_training_history.json'
+        with open(history_path, 'w') as f:
+            json.dump(training_history, f, indent=2)
 
     return model_lstm, scaler, training_history
 
+
+def resolve_training_profile(
+    profile: str | None,
+    n_windows: int,
+    batch_size: int,
+    learning_rate: float,
+    deterministic: bool | None = None,
+    jit_compile: bool | None = None,
+) -> dict:
+    """
+    Menentukan pengaturan training untuk sebuah profil.
+
+    - default: batch_size dan learning_rate apa adanya, jit_compile default Keras ('auto',
+      XLA hanya di GPU), op determinism aktif (hasil identik untuk seed yang sama)
+    - fast: batch terbesar (pangkat 2) yang masih menyisakan FAST_MIN_STEPS_PER_EPOCH step per
+      epoch (minimal batch_size, maksimal FAST_MAX_BATCH_SIZE), learning rate diskalakan
+      sqrt(batch baru / batch_size), op determinism nonaktif, dan train step dikompilasi XLA
+      jika jumlah window >= env LSTM_JIT_MIN_WINDOWS (default 50000). Pada data kecil, waktu
+      kompilasi XLA (~1-2 detik di epoch pertama) lebih besar dari penghematan per epoch.
+      Hasil tidak bit-identik antar run; loss akhir dapat sedikit berbeda dari profil default.
+
+    Args:
+        profile: 'default', 'fast', atau None (env LSTM_TRAINING_PROFILE, default 'default')
+        n_windows: Jumlah window training
+        batch_size: Ukuran batch dasar
+        learning_rate: Learning rate dasar
+        deterministic: Override op determinism (None = sesuai profil)
+        jit_compile: Override kompilasi XLA (None = sesuai profil)
+
+    Returns:
+        Dictionary {profile, batch_size, learning_rate, jit_compile, deterministic}
+
+    Raises:
+        ValueError: Jika profil tidak dikenal
+    """
+    profile = profile or os.environ.get('LSTM_TRAINING_PROFILE', 'default')
+    if profile not in TRAINING_PROFILES:
+        raise ValueError(f"Unknown training profile: {profile}. Use one of {', '.join(TRAINING_PROFILES)}.")
+
+    settings = {
+        'profile': profile,
+        'batch_size': batch_size,
+        'learning_rate': learning_rate,
+        'jit_compile': 'auto',
+        'deterministic': True,
+    }
+    if profile == 'fast':
+        fast_batch_size = batch_size
+        while fast_batch_size * 2 <= min(FAST_MAX_BATCH_SIZE, n_windows // FAST_MIN_STEPS_PER_EPOCH):
+            fast_batch_size *= 2
+        settings.update(
+            batch_size=fast_batch_size,
+            learning_rate=float(learning_rate * np.sqrt(fast_batch_size / batch_size)),
+            jit_compile=n_windows >= int(os.environ.get('LSTM_JIT_MIN_WINDOWS', '50000')),
+            deterministic=False,
+        )
+    if deterministic is not None:
+        settings['deterministic'] = deterministic
+    if jit_compile is not None:
+        settings['jit_compile'] = jit_compile
+    return settings
+
+
+def _get_op_determinism() -> bool | None:
+    """Status op determinism TensorFlow saat ini (None jika tidak dapat dibaca di versi ini)."""
+    try:
+        from tensorflow.python.framework import config as tf_config
+        return bool(tf_config.is_op_determinism_enabled())
+    except (AttributeError, ImportError):
+        return None
+
+
+@contextmanager
+def _op_determinism(enabled: bool):
+    """
+    Mengatur op determinism TensorFlow selama blok with, lalu mengembalikan status sebelumnya.
+
+    Setting ini berlaku untuk seluruh proses (worker training yang berumur panjang), sehingga
+    profil fast tidak boleh mewariskan kernel non-deterministik ke training berikutnya
+    (contoh: finetune_lstm_residual).
+    """
+    previous = _get_op_determinism()
+    _set_op_determinism(enabled)
+    try:
+        yield
+    finally:
+        if previous is not None and previous != enabled:
+            _set_op_determinism(previous)
+
+
+def _set_op_determinism(enabled: bool):
+    """Mengaktifkan/menonaktifkan op determinism TensorFlow untuk proses ini."""
+    import tensorflow as tf
+
+    try:
+        if enabled:
+            tf.config.experimental.enable_op_determinism()
+        else:
+            # Tidak ada API publik untuk menonaktifkan; setting ini berlaku untuk seluruh proses
+            from tensorflow.python.framework import config as tf_config
+            tf_config.disable_op_determinism()
+    except (AttributeError, ImportError, ValueError):
+        # TensorFlow determinism tidak tersedia di versi ini
+        pass
+
+
+def restore_lstm_model(weights: list[np.ndarray], window: int = 18, lstm_units: int = 24) -> tf.keras.Model:
+    """
+    Membangun ulang model LSTM residual dari bobot hasil training (contoh: kandidat seed search).
+
+    Args:
+        weights: Bobot model (hasil model.get_weights())
+        window: Ukuran window input
+        lstm_units: Jumlah unit LSTM
+
+    Returns:
+        Model Keras dengan arsitektur yang sama seperti train_lstm_residual()
+    """
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import LSTM, Dense
+
+    model_lstm = Sequential([
+        LSTM(lstm_units, input_shape=(window, 1)),
+        Dense(1),
+    ])
+    model_lstm.set_weights(weights)
+    return model_lstm
+
+
+def train_lstm_replicas(
+    residual_train: pd.Series,
+    seeds: list[int],
+    window: int = 18,
+    lstm_units: int = 24,
+    epochs: int = 15,
+    batch_size: int = 16,
+    patience: int = 5,
+    residual_val: pd.Series | None = None,
+    quick_eval: bool = False,
+    learning_rate: float = 0.001,
+    callbacks: list | None = None,
+) -> tuple[list[tf.keras.Model], MinMaxScaler, list[dict]]:
+    """
+    Melatih K replika LSTM (satu per seed) sekaligus dalam satu pemanggilan fit().
+
+    Setiap replika adalah model LSTM + Dense yang sama dengan train_lstm_residual() dan
+    diinisialisasi dengan seed-nya sendiri. Semua replika digabung menjadi satu model
+    multi-output yang berbagi input, sehingga pipeline data, tracing graph, dan overhead
+    per-batch hanya terjadi sekali untuk semua seed. Loss total adalah jumlah loss per
+    replika; karena bobot replika tidak berbagi parameter, gradien (dan update Adam) setiap
+    replika hanya bergantung pada loss replika itu sendiri.
+
+    Early stopping dilakukan per replika (patience, restore best weights); fit() berhenti
+    setelah semua replika berhenti. Urutan batch sama untuk semua replika, sehingga hasil
+    satu replika tidak identik bit-per-bit dengan train_lstm_residual(seed) yang diacak sendiri.
+
+    Args:
+        residual_train: Residual dari model ARIMAX
+        seeds: List seed, satu replika per seed
+        window: Ukuran window untuk sequence
+        lstm_units: Jumlah unit LSTM per replika
+        epochs: Maksimum jumlah epoch
+        batch_size: Ukuran batch
+        patience: Jumlah epoch tanpa improvement sebelum replika dihentikan
+        residual_val: Residual validation (opsional, untuk early stopping)
+        quick_eval: Jika True, gunakan QUICK_EVAL_EPOCHS (seperti seed search)
+        learning_rate: Learning rate Adam
+        callbacks: Callback Keras tambahan
+
+    Returns:
+        Tuple (list model replika, scaler, list training_history per replika).
+        Setiap training_history memiliki format yang sama dengan train_lstm_residual()
+        ditambah 'seed' dan 'best_monitor' (nilai loss terbaik yang dimonitor).
+    """
+    import tensorflow as tf
+    from sklearn.preprocessing import MinMaxScaler
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import LSTM, Dense
+    from tensorflow.keras.optimizers import Adam
+
+    # Data dan scaler sama untuk semua replika
+    scaler = MinMaxScaler(feature_range=(0, 1))
+    resid_scaled = scaler.fit_transform(residual_train.values.reshape(-1, 1))
+    X_train, y_train = create_sequences(resid_scaled, window)
+
+    validation_data = None
+    if residual_val is not None and len(residual_val) > 0:
+        resid_val_scaled = scaler.transform(residual_val.values.reshape(-1, 1))
+        X_val, y_val = create_sequences(resid_val_scaled, window)
+        validation_data = (X_val, [y_val] * len(seeds))
+
+    try:
+        tf.config.experimental.enable_op_determinism()
+    except (AttributeError, ValueError):
+        pass
+
+    # Bangun setiap replika tepat setelah seed-nya di-set (inisialisasi bobot sama seperti
+    # train_lstm_residual dengan seed tersebut)
+    replicas = []
+    for i, seed in enumerate(seeds):
+        random.seed(seed)
+        np.random.seed(seed)
+        tf.random.set_seed(seed)
+        replicas.append(Sequential([
+            LSTM(lstm_units, input_shape=(window, 1)),
+            Dense(1),
+        ], name=f'replica_{i}'))
+
+    inputs = tf.keras.Input(shape=(window, 1))
+    model = tf.keras.Model(inputs, [replica(inputs) for replica in replicas])
+    model.compile(optimizer=Adam(learning_rate=learning_rate), loss=['mse'] * len(replicas))
+
+    actual_epochs = QUICK_EVAL_EPOCHS if quick_eval else epochs
+    prefix = 'val_' if validation_data is not None else ''
+    early_stopping = _replica_early_stopping_class()(
+        replicas,
+        [f'{prefix}replica_{i}_loss' for i in range(len(replicas))],
+        patience=QUICK_EVAL_PATIENCE if quick_eval else patience,
+    )
+    history = model.fit(
+        X_train,
+        [y_train] * len(replicas),
+        epochs=actual_epochs,
+        batch_size=batch_size,
+        validation_data=validation_data,
+        callbacks=[early_stopping] + list(callbacks or []),
+        verbose=0,
+    )
+
+    histories = []
+    for i, seed in enumerate(seeds):
+        epochs_trained = early_stopping.stopped_epochs[i] or len(history.history['loss'])
+        loss = [float(x) for x in history.history[f'replica_{i}_loss'][:epochs_trained]]
+        training_history = {
+            'seed': seed,
+            'loss': loss,
+            'epochs_trained': epochs_trained,
+            'max_epochs': actual_epochs,
+            'early_stopped': epochs_trained < actual_epochs,
+            'best_monitor': float(early_stopping.best[i]),
+        }
+        if validation_data is not None:
+            training_history['val_loss'] = [
+                float(x) for x in history.history[f'val_replica_{i}_loss'][:epochs_trained]
+            ]
+        training_history['epochs'] = []
+        for epoch in range(epochs_trained):
+            epoch_data = {'epoch': epoch + 1, 'loss': loss[epoch]}
+            if 'val_loss' in training_history:
+                epoch_data['val_loss'] = training_history['val_loss'][epoch]
+            training_history['epochs'].append(epoch_data)
+        histories.append(training_history)
+
+    return replicas, scaler, histories
+
+
+def _training_state_capture_class():
+    """Membuat class callback pencatat state training (TensorFlow di-import saat dibutuhkan)."""
+    import tensorflow as tf
+
+    class TrainingStateCapture(tf.keras.callbacks.Callback):
+        """
+        Mencatat bobot dan state optimizer di akhir epoch terakhir (sebelum restore_best_weights),
+        untuk melanjutkan training dengan train_lstm_residual(warm_start=...).
+        """
+
+        final_weights = None
+        optimizer_state = None
+
+        def on_epoch_end(self, epoch, logs=None):
+            self.final_weights = self.model.get_weights()
+            self.optimizer_state = [variable.numpy() for variable in self.model.optimizer.variables]
+
+    return TrainingStateCapture
+
+
+def _warm_start_early_stopping_class():
+    """Membuat class EarlyStopping yang melanjutkan state kandidat seed search (TensorFlow di-import saat dibutuhkan)."""
+    from tensorflow.keras.callbacks import EarlyStopping
+
+    class WarmStartEarlyStopping(EarlyStopping):
+        """
+        EarlyStopping yang diawali best/wait dari history sebelumnya.
+
+        EarlyStopping keras me-reset state di on_train_begin, sehingga tanpa class ini
+        fit(initial_epoch=...) akan menganggap epoch lanjutan pertama sebagai yang terbaik.
+        """
+
+        def __init__(self, monitor_history: list[float], best_weights: list[np.ndarray], **kwargs):
+            super().__init__(**kwargs)
+            self.monitor_history = list(monitor_history)
+            self.initial_best_weights = best_weights
+
+        def on_train_begin(self, logs=None):
+            super().on_train_begin(logs)
+            if self.monitor_history:
+                # Improvement keras bersifat strict (<), jadi best_epoch = kemunculan minimum pertama
+                self.best_epoch = int(np.argmin(self.monitor_history))
+                self.best = self.monitor_history[self.best_epoch]
+                self.best_weights = self.initial_best_weights
+                self.wait = len(self.monitor_history) - 1 - self.best_epoch
+
+    return WarmStartEarlyStopping
+
+
+def _replica_early_stopping_class():
+    """Membuat class callback early stopping per replika (TensorFlow di-import saat dibutuhkan)."""
+    import tensorflow as tf
+
+    class ReplicaEarlyStopping(tf.keras.callbacks.Callback):
+        """
+        Early stopping per replika dengan aturan yang sama seperti keras EarlyStopping
+        (restore_best_weights=True): replika yang tidak membaik selama `patience` epoch
+        dibekukan (bobot terbaiknya dicatat), dan fit() berhenti jika semua replika berhenti.
+        """
+
+        def __init__(self, replicas, monitors: list[str], patience: int):
+            super().__init__()
+            self.replicas = replicas
+            self.monitors = monitors
+            self.patience = patience
+
+        def on_train_begin(self, logs=None):
+            count = len(self.replicas)
+            self.best = [np.inf] * count
+            self.wait = [0] * count
+            self.best_weights = [None] * count
+            self.stopped_epochs = [None] * count
+
+        def on_epoch_end(self, epoch, logs=None):
+            logs = logs or {}
+            for i, replica in enumerate(self.replicas):
+                if self.stopped_epochs[i] is not None or self.monitors[i] not in logs:
+                    continue
+                current = float(logs[self.monitors[i]])
+                if self.best_weights[i] is None:
+                    self.best_weights[i] = replica.get_weights()
+                self.wait[i] += 1
+                if current < self.best[i]:
+                    self.best[i] = current
+                    self.best_weights[i] = replica.get_weights()
+                    self.wait[i] = 0
+                    continue
+                if self.wait[i] >= self.patience and epoch > 0:
+                    self.stopped_epochs[i] = epoch + 1
+            if all(stopped is not None for stopped in self.stopped_epochs):
+                self.model.stop_training = True
+
+        def on_train_end(self, logs=None):
+            for replica, weights in zip(self.replicas, self.best_weights):
+                if weights is not None:
+                    replica.set_weights(weights)
+
+    return ReplicaEarlyStopping
+
+
+def _init_seed_search_worker(threads: int, cancel_event):
+    """
+    Initializer proses worker seed search: batasi thread TensorFlow per proses.
+
+    Dijalankan sebelum TensorFlow di-import di proses worker, sehingga setiap proses hanya
+    memakai `threads` core dan beberapa kandidat dapat berjalan bersamaan tanpa saling berebut CPU.
+    """
+    global _seed_search_cancel_event
+    _seed_search_cancel_event = cancel_event
+    for name in ('OMP_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS'):
+        os.environ[name] = str(threads)
+    os.environ['TF_NUM_INTEROP_THREADS'] = '1'
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def train_seed_candidate(
+    residual_train: pd.Series,
+    residual_val: pd.Series | None,
+    seed: int,
+    n_steps: int,
+    window: int = 18,
+    lstm_units: int = 24,
+    batch_size: int = 16,
+) -> dict | None:
+    """
+    Melatih satu kandidat seed (quick eval) dan memprediksi residual n_steps ke depan.
+
+    Fungsi level modul agar dapat dijalankan di process pool seed search. Model tidak disimpan
+    ke disk; bobot dan scaler dikembalikan agar proses utama dapat memakai kandidat terbaik.
+
+    Args:
+        residual_train: Residual training ARIMAX
+        residual_val: Residual validation ARIMAX (opsional, untuk early stopping)
+        seed: Seed kandidat
+        n_steps: Jumlah step rollout residual (panjang test set)
+        window: Ukuran window
+        lstm_units: Jumlah unit LSTM
+        batch_size: Ukuran batch
+
+    Returns:
+        Dictionary {seed, predicted_resid, weights, final_weights, optimizer_state, scaler,
+        training_history}, atau None jika seed search sudah dibatalkan. final_weights dan
+        optimizer_state adalah state epoch terakhir (untuk warm start train_lstm_residual)
+    """
+    cancel_event = _seed_search_cancel_event
+    if cancel_event is not None and cancel_event.is_set():
+        return None
+
+    import tensorflow as tf
+
+    capture = _training_state_capture_class()()
+    callbacks = [capture]
+    if cancel_event is not None:
+
+        class _CancelSeedSearch(tf.keras.callbacks.Callback):
+            """Menghentikan training jika seed search sudah menemukan pemenang."""
+
+            def on_train_batch_end(self, batch, logs=None):
+                if cancel_event.is_set():
+                    self.model.stop_training = True
+
+        callbacks.append(_CancelSeedSearch())
+
+    model_lstm, scaler, training_history = train_lstm_residual(
+        residual_train,
+        window=window,
+        lstm_units=lstm_units,
+        epochs=15,  # Akan di-override oleh quick_eval=True menjadi QUICK_EVAL_EPOCHS
+        batch_size=batch_size,
+        patience=5,
+        seed=seed,
+        residual_val=residual_val,
+        quick_eval=True,  # Quick evaluation untuk seed search
+        save=False,
+        callbacks=callbacks,
+    )
+    if cancel_event is not None and cancel_event.is_set():
+        return None
+
+    resid_scaled = scaler.transform(residual_train.values.reshape(-1, 1))
+    seed_data = resid_scaled[-window:].reshape(1, window, 1)
+    predicted_resid = predict_residuals_iterative(
+        model_lstm,
+        scaler,
+        seed_data,
+        n_steps=n_steps,
+        window=window,
+    )
+    return {
+        'seed': seed,
+        'predicted_resid': predicted_resid,
+        'weights': model_lstm.get_weights(),
+        'final_weights': capture.final_weights,
+        'optimizer_state': capture.optimizer_state,
+        'scaler': scaler,
+        'training_history': training_history,
+    }
+
+
+class _InlineCandidate:
+    """Kandidat seed yang dilatih di proses ini saat result() dipanggil (mode tanpa pool)."""
+
+    def __init__(self, args: tuple):
+        self._args = args
+
+    def result(self) -> dict | None:
+        return train_seed_candidate(*self._args)
+
+
+class _ReplicaCandidate:
+    """Kandidat seed dari train_lstm_replicas(); rollout residual dihitung saat result() dipanggil."""
+
+    def __init__(self, model_lstm, scaler, training_history: dict, residual_train: pd.Series, n_steps: int, window: int):
+        self._model_lstm = model_lstm
+        self._scaler = scaler
+        self._training_history = training_history
+        self._residual_train = residual_train
+        self._n_steps = n_steps
+        self._window = window
+
+    def result(self) -> dict:
+        resid_scaled = self._scaler.transform(self._residual_train.values.reshape(-1, 1))
+        seed_data = resid_scaled[-self._window:].reshape(1, self._window, 1)
+        predicted_resid = predict_residuals_iterative(
+            self._model_lstm,
+            self._scaler,
+            seed_data,
+            n_steps=self._n_steps,
+            window=self._window,
+        )
+        return {
+            'seed': self._training_history['seed'],
+            'predicted_resid': predicted_resid,
+            'weights': self._model_lstm.get_weights(),
+            # Optimizer dipakai bersama semua replika, sehingga tidak ada state per kandidat
+            # untuk warm start (training final dilakukan dari awal)
+            'final_weights': None,
+            'optimizer_state': None,
+            'scaler': self._scaler,
+            'training_history': self._training_history,
+        }
+
+
+class SeedSearch:
+    """
+    Menjalankan kandidat seed search secara paralel.
+
+    Mode (parameter mode atau env SEED_SEARCH_MODE):
+    - 'process' (default): setiap kandidat dilatih di process pool
+    - 'replicas': semua kandidat dilatih sekaligus sebagai replika dalam satu fit()
+      (lihat train_lstm_replicas); rollout residual tiap kandidat dihitung saat dikonsumsi
+
+    Semua kandidat di-submit sekaligus, tetapi hasilnya dikonsumsi sesuai urutan kandidat,
+    sehingga aturan early-exit di pemanggil tetap sama seperti pencarian berurutan. Saat
+    pemanggil berhenti (keluar dari blok `with`), kandidat yang belum selesai dibatalkan:
+    kandidat yang belum mulai tidak dijalankan, dan training yang sedang berjalan dihentikan
+    lewat callback pembatalan.
+
+    Contoh:
+        with SeedSearch(residual_train, residual_val, seeds, n_steps=len(test)) as search:
+            for seed, candidate in search:
+                result = candidate.result()  # dict dari train_seed_candidate()
+                ...
+                if found: break
+    """
+
+    def __init__(
+        self,
+        residual_train: pd.Series,
+        residual_val: pd.Series | None,
+        seeds: list[int],
+        n_steps: int,
+        window: int = 18,
+        max_workers: int | None = None,
+        mode: str | None = None,
+    ):
+        self.mode = mode or os.environ.get('SEED_SEARCH_MODE', 'process')
+        if self.mode not in ('process', 'replicas'):
+            raise ValueError(f"Unknown seed search mode: {self.mode}. Use 'process' or 'replicas'.")
+        self.seeds = list(seeds)
+        self._residual_train = residual_train
+        self._residual_val = residual_val
+        self._n_steps = n_steps
+        self._window = window
+        self._args = [(residual_train, residual_val, seed, n_steps, window) for seed in self.seeds]
+        cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+        if max_workers is None:
+            max_workers = int(os.environ.get('SEED_SEARCH_WORKERS', '0')) or min(cpus, DEFAULT_SEED_SEARCH_WORKERS)
+        self.max_workers = max(1, min(max_workers, len(self.seeds)))
+        # Budget thread TensorFlow per proses: bagi core yang tersedia ke semua worker
+        self.threads_per_worker = max(1, cpus // self.max_workers)
+        self._executor = None
+        self._cancel_event = None
+        self._candidates = []
+
+    def __enter__(self) -> 'SeedSearch':
+        if self.mode == 'replicas':
+            replicas, scaler, histories = train_lstm_replicas(
+                self._residual_train,
+                self.seeds,
+                window=self._window,
+                residual_val=self._residual_val,
+                quick_eval=True,
+            )
+            self._candidates = [
+                _ReplicaCandidate(replica, scaler, history, self._residual_train, self._n_steps, self._window)
+                for replica, history in zip(replicas, histories)
+            ]
+            return self
+        if self.max_workers <= 1:
+            self._candidates = [_InlineCandidate(args) for args in self._args]
+            return self
+        ctx = multiprocessing.get_context('spawn')
+        self._cancel_event = ctx.Event()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=ctx,
+            initializer=_init_seed_search_worker,
+            initargs=(self.threads_per_worker, self._cancel_event),
+        )
+        self._candidates = [self._executor.submit(train_seed_candidate, *args) for args in self._args]
+        return self
+
+    def __iter__(self):
+        return iter(zip(self.seeds, self._candidates))
+
+    def cancel(self):
+        """Membatalkan semua kandidat yang belum selesai."""
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cancel()
+        return False
+
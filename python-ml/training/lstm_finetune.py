@@ -0,0 +1,198 @@
+"""
+Fine-Tuning Inkremental LSTM Residual pada Residual Baru
+
+Setelah refresh ARIMAX (training.arimax_refresh), residual one-step-ahead observasi baru
+ditambahkan ke residual training bundle. Alih-alih training ulang penuh (dengan seed search),
+model LSTM bundle yang sedang dilayani dilatih beberapa epoch lagi pada:
+
+1. Window terbaru - window dengan target residual baru (maksimal recent_rows terakhir)
+2. Replay - sampel acak window dari residual yang sudah pernah dilatih, agar model tidak
+   melupakan pola lama (catastrophic forgetting)
+
+Residual baru paling akhir (holdout) tidak ikut dilatih. Model kandidat hanya dipromosikan
+jika Hybrid MAPE pada holdout (rollout iteratif dari window sebelum holdout, seperti /predict)
+tidak lebih buruk dari model saat ini.
+
+Scaler residual dipertahankan; scaler hanya di-fit ulang jika residual baru keluar dari
+rentang scaler lebih dari SCALER_REFIT_MARGIN (MinMaxScaler tidak dapat mengekstrapolasi).
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from utils.dataset import read_frame
+from utils.evaluation import calculate_metrics
+from utils.forecasting import create_sequences, load_lstm_model, load_residual_scaler, predict_residuals_iterative
+from utils.registry import get_residual_train_path
+
+# Scaler di-fit ulang jika residual baru (setelah scaling) berada di luar [-margin, 1 + margin]
+SCALER_REFIT_MARGIN = 0.1
+
+# File yang ditulis finetune_lstm_residual ke output_dir (menggantikan file LSTM bundle asal)
+FINETUNE_OUTPUT_FILES = ('lstm_residual_model.h5', 'residual_scaler.save', 'lstm_training_history.json')
+
+
+class NotEnoughResidualsError(ValueError):
+    """Residual baru belum cukup untuk fine-tuning (window training + holdout)."""
+
+
+def _residual_end(model_dir: Path, base_dir: Path | None) -> pd.Timestamp:
+    """Timestamp residual terakhir yang sudah dilatih LSTM bundle (history LSTM, atau residual bundle dasar)."""
+    history_path = model_dir / 'lstm_training_history.json'
+    if history_path.exists():
+        with open(history_path, 'r') as f:
+            residual_end = json.load(f).get('residual_end')
+        if residual_end:
+            return pd.Timestamp(residual_end)
+    # LSTM bundle hasil training dilatih pada residual training bundle tersebut
+    base_residual = read_frame(get_residual_train_path(base_dir or model_dir))
+    return base_residual.index[-1]
+
+
+def finetune_lstm_residual(
+    model_dir: Path,
+    actual: pd.Series,
+    output_dir: Path,
+    base_dir: Path | None = None,
+    window: int = 18,
+    epochs: int = 5,
+    recent_rows: int = 500,
+    replay_ratio: float = 1.0,
+    holdout_rows: int | None = None,
+    learning_rate: float = 0.0005,
+    batch_size: int = 16,
+    seed: int = 42,
+) -> dict:
+    """
+    Fine-tune model LSTM bundle pada residual baru + replay, lalu bandingkan di holdout.
+
+    Jika kandidat dipromosikan, file FINETUNE_OUTPUT_FILES ditulis ke output_dir.
+
+    Args:
+        model_dir: Direktori bundle yang sedang dilayani
+        actual: Nilai aktual wave_height (index timestamp), untuk Hybrid MAPE holdout
+        output_dir: Direktori tujuan file model hasil fine-tuning
+        base_dir: Direktori bundle hasil training asal (fallback batas residual yang sudah dilatih)
+        window: Ukuran window LSTM
+        epochs: Jumlah epoch fine-tuning
+        recent_rows: Jumlah maksimum residual baru (terakhir) yang menjadi target training
+        replay_ratio: Jumlah window replay relatif terhadap jumlah window baru
+        holdout_rows: Jumlah residual baru terakhir untuk holdout (None = min(48, 25% residual baru))
+        learning_rate: Learning rate Adam untuk fine-tuning (lebih kecil dari training awal)
+        batch_size: Ukuran batch
+        seed: Random seed
+
+    Returns:
+        Dictionary berisi promoted, scaler_refit, jumlah window, holdout (MAPE saat ini vs
+        kandidat), training_history, dan seconds
+
+    Raises:
+        NotEnoughResidualsError: Jika residual baru belum cukup
+        FileNotFoundError: Jika model atau residual bundle tidak ditemukan
+    """
+    started = time.perf_counter()
+    residual = read_frame(get_residual_train_path(model_dir)).iloc[:, 0]
+    residual_end = _residual_end(model_dir, base_dir)
+
+    # Posisi residual baru pertama dan awal holdout
+    fresh_start = int(np.searchsorted(residual.index.values, np.datetime64(residual_end), side='right'))
+    n_fresh = len(residual) - fresh_start
+    holdout_rows = min(48, n_fresh // 4) if holdout_rows is None else min(holdout_rows, n_fresh)
+    holdout_start = len(residual) - holdout_rows
+    train_start = max(fresh_start, holdout_start - recent_rows, window)
+    if holdout_rows < 1 or holdout_start - train_start < 1:
+        raise NotEnoughResidualsError(
+            f'Not enough new residuals to fine-tune: {n_fresh} new residuals since {residual_end} '
+            f'(need at least {holdout_rows or 1} holdout + 1 training residuals). Refresh ARIMAX with new observations first.'
+        )
+    holdout_index = residual.index[holdout_start:]
+    y_true = actual.reindex(holdout_index).values
+    if np.isnan(y_true).any():
+        raise FileNotFoundError('Observations for the holdout residuals not found. Refresh ARIMAX first.')
+    # Prediksi ARIMAX one-step-ahead = aktual - residual
+    arimax_pred = y_true - residual.values[holdout_start:]
+
+    import tensorflow as tf
+    from tensorflow.keras.optimizers import Adam
+
+    model_lstm = load_lstm_model(backend='keras', model_dir=model_dir)
+    scaler = load_residual_scaler(model_dir)
+    values = residual.values.reshape(-1, 1)
+
+    def holdout_mape(model, fitted_scaler) -> float:
+        """Hybrid MAPE holdout: rollout iteratif dari window sebelum holdout."""
+        seed_window = fitted_scaler.transform(values[holdout_start - window:holdout_start]).reshape(1, window, 1)
+        predicted_resid = predict_residuals_iterative(model, fitted_scaler, seed_window, n_steps=holdout_rows, window=window)
+        return float(calculate_metrics(y_true, arimax_pred + predicted_resid)['mape'])
+
+    current_mape = holdout_mape(model_lstm, scaler)
+
+    # Scaler hanya di-fit ulang jika residual baru keluar dari rentangnya
+    fresh_scaled = scaler.transform(values[fresh_start:holdout_start])
+    scaler_refit = bool(fresh_scaled.min() < -SCALER_REFIT_MARGIN or fresh_scaled.max() > 1 + SCALER_REFIT_MARGIN)
+    if scaler_refit:
+        from sklearn.preprocessing import MinMaxScaler
+        scaler = MinMaxScaler(feature_range=(0, 1)).fit(values[:holdout_start])
+    scaled = scaler.transform(values[:holdout_start])
+
+    # Window terbaru (target = residual baru) + replay window lama
+    X_recent, y_recent = create_sequences(scaled[train_start - window:], window)
+    X_old, y_old = create_sequences(scaled[:fresh_start], window) if fresh_start > window else (None, None)
+    rng = np.random.default_rng(seed)
+    n_replay = min(int(round(replay_ratio * len(y_recent))), len(y_old) if y_old is not None else 0)
+    replay_idx = np.sort(rng.choice(len(y_old), size=n_replay, replace=False)) if n_replay else np.array([], dtype=int)
+    X_train = np.concatenate([X_recent] + ([X_old[replay_idx]] if n_replay else []))
+    y_train = np.concatenate([y_recent] + ([y_old[replay_idx]] if n_replay else []))
+
+    random.seed(seed)
+    np.random.seed(seed)
+    tf.random.set_seed(seed)
+    candidate = tf.keras.models.clone_model(model_lstm)
+    candidate.set_weights(model_lstm.get_weights())
+    candidate.compile(optimizer=Adam(learning_rate=learning_rate), loss='mse')
+    history = candidate.fit(X_train, y_train, epochs=epochs, batch_size=batch_size, shuffle=True, verbose=0)
+
+    candidate_mape = holdout_mape(candidate, scaler)
+    promoted = candidate_mape <= current_mape
+
+    finetune = {
+        'epochs': epochs,
+        'learning_rate': learning_rate,
+        'recent_windows': int(len(y_recent)),
+        'replay_windows': int(n_replay),
+        'holdout_rows': int(holdout_rows),
+        'scaler_refit': scaler_refit,
+        'loss': [float(x) for x in history.history['loss']],
+        'current_holdout_mape': current_mape,
+        'candidate_holdout_mape': candidate_mape,
+    }
+    if promoted:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        candidate.save(str(output_dir / 'lstm_residual_model.h5'))
+        joblib.dump(scaler, str(output_dir / 'residual_scaler.save'))
+        training_history = {}
+        history_path = model_dir / 'lstm_training_history.json'
+        if history_path.exists():
+            with open(history_path, 'r') as f:
+                training_history = json.load(f)
+        # Holdout belum dilatih: fine-tuning berikutnya memakainya sebagai residual baru
+        training_history['residual_end'] = str(residual.index[holdout_start - 1])
+        training_history['finetune'] = finetune
+        with open(output_dir / 'lstm_training_history.json', 'w') as f:
+            json.dump(training_history, f, indent=2)
+
+    return {
+        'promoted': promoted,
+        'residual_end': str(residual_end),
+        'new_residuals': int(n_fresh),
+        **finetune,
+        'seconds': round(time.perf_counter() - started, 4),
+    }
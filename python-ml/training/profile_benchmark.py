@@ -0,0 +1,140 @@
+"""
+Benchmark Profil Training LSTM Residual
+
+Membandingkan waktu training per epoch (wall-clock) antar profil training
+(lihat hybrid_trainer.resolve_training_profile) pada data residual yang sama:
+
+- first_epoch_seconds: epoch pertama, termasuk tracing/kompilasi (XLA jika jit_compile aktif)
+- steady_epoch_seconds: median epoch berikutnya (biaya per epoch setelah warm-up)
+- total_seconds: durasi fit() seluruhnya
+
+Early stopping dinonaktifkan (patience = epochs) agar semua varian melatih jumlah epoch yang
+sama. Kualitas model tetap dilaporkan (val_loss terbaik dan Hybrid MAPE test) karena profil
+fast mengubah batch size, learning rate, dan determinism.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.evaluation import calculate_metrics
+from utils.forecasting import predict_residuals_iterative
+from .hybrid_trainer import train_lstm_residual
+
+# Varian default: konfigurasi saat ini, profil fast, dan profil fast dengan XLA dipaksa aktif
+DEFAULT_BENCHMARK_VARIANTS = (
+    {'profile': 'default'},
+    {'profile': 'fast'},
+    {'profile': 'fast', 'jit_compile': True},
+)
+
+
+def _epoch_timer_class():
+    """Membuat class callback pencatat durasi epoch (TensorFlow di-import saat dibutuhkan)."""
+    import tensorflow as tf
+
+    class EpochTimer(tf.keras.callbacks.Callback):
+        """Mencatat durasi wall-clock setiap epoch."""
+
+        def on_train_begin(self, logs=None):
+            self.durations = []
+
+        def on_epoch_begin(self, epoch, logs=None):
+            self._started = time.perf_counter()
+
+        def on_epoch_end(self, epoch, logs=None):
+            self.durations.append(time.perf_counter() - self._started)
+
+    return EpochTimer
+
+
+def benchmark_training_profiles(
+    residual_train: pd.Series,
+    residual_val: pd.Series | None,
+    arimax_pred_test: np.ndarray,
+    y_true_test: np.ndarray,
+    variants: list[dict] | None = None,
+    epochs: int = 15,
+    window: int = 18,
+    lstm_units: int = 24,
+    batch_size: int = 16,
+    learning_rate: float = 0.001,
+    seed: int = 42,
+) -> dict:
+    """
+    Melatih model LSTM residual dengan setiap varian profil dan mengukur waktu per epoch.
+
+    Args:
+        residual_train: Residual training ARIMAX
+        residual_val: Residual validation ARIMAX (opsional)
+        arimax_pred_test, y_true_test: Forecast ARIMAX dan nilai aktual test set (untuk Hybrid MAPE)
+        variants: List {profile, jit_compile (opsional), deterministic (opsional)};
+                  None = DEFAULT_BENCHMARK_VARIANTS
+        epochs: Jumlah epoch per varian (tanpa early stopping)
+        window, lstm_units, batch_size, learning_rate, seed: Konfigurasi dasar model
+
+    Returns:
+        Dictionary berisi n_windows, epochs, dan results (satu entri per varian, dengan
+        speedup relatif terhadap varian pertama)
+    """
+    variants = list(variants or DEFAULT_BENCHMARK_VARIANTS)
+    timer_class = _epoch_timer_class()
+    resid_vals = residual_train.values.reshape(-1, 1)
+    results = []
+
+    for variant in variants:
+        timer = timer_class()
+        started = time.perf_counter()
+        model_lstm, scaler, training_history = train_lstm_residual(
+            residual_train,
+            window=window,
+            lstm_units=lstm_units,
+            epochs=epochs,
+            batch_size=batch_size,
+            patience=epochs,
+            seed=seed,
+            residual_val=residual_val,
+            learning_rate=learning_rate,
+            save=False,
+            callbacks=[timer],
+            profile=variant.get('profile'),
+            deterministic=variant.get('deterministic'),
+            jit_compile=variant.get('jit_compile'),
+        )
+        total_seconds = time.perf_counter() - started
+
+        resid_scaled = scaler.transform(resid_vals)
+        predicted_resid = predict_residuals_iterative(
+            model_lstm,
+            scaler,
+            resid_scaled[-window:].reshape(1, window, 1),
+            n_steps=len(y_true_test),
+            window=window,
+        )
+        durations = timer.durations
+        results.append({
+            'variant': dict(variant),
+            'settings': training_history['training_profile'],
+            'epochs_trained': training_history['epochs_trained'],
+            'first_epoch_seconds': round(durations[0], 4) if durations else None,
+            'steady_epoch_seconds': round(float(np.median(durations[1:])), 4) if len(durations) > 1 else None,
+            'total_seconds': round(total_seconds, 4),
+            'final_loss': training_history['loss'][-1],
+            'best_val_loss': min(training_history['val_loss']) if training_history.get('val_loss') else None,
+            'hybrid_mape_test': float(calculate_metrics(y_true_test, arimax_pred_test + predicted_resid)['mape']),
+        })
+
+    # Speedup relatif terhadap varian pertama (> 1 = lebih cepat)
+    for entry in results:
+        for key, speedup_key in (('steady_epoch_seconds', 'steady_epoch_speedup'), ('total_seconds', 'total_speedup')):
+            baseline = results[0][key]
+            entry[speedup_key] = round(baseline / entry[key], 3) if baseline and entry[key] else None
+
+    return {
+        'n_windows': max(0, len(residual_train) - window),
+        'epochs': epochs,
+        'results': results,
+    }
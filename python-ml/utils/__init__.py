@@ -17,20 +17,38 @@ Dengan mengimpor dari modul ini, semua fungsi utility dapat diakses dengan mudah
 from .preprocessing import load_and_clean_data, split_train_test, check_stationarity
 
 # Import fungsi-fungsi dari modul dataset
-# - save_dataset: Menyimpan DataFrame ke CSV
-# - load_dataset: Memuat DataFrame dari CSV
-# - save_uploaded_file: Menyimpan file yang diupload dari Laravel
-from .dataset import save_dataset, load_dataset, save_uploaded_file
+# - save_dataset: Menyimpan DataFrame ke dataset biner kolumnar (.npy)
+# - load_dataset: Memuat DataFrame dari dataset biner (memory-map)
+# - dataset_exists: Mengecek apakah dataset sudah tersimpan
+# - load_split: Memuat split train/validation/test sebagai slice snapshot upload
+# - split_exists: Mengecek apakah split tersedia
+# - save_upload_stream: Menyimpan file upload ke disk per chunk
+from .dataset import (
+    save_dataset,
+    load_dataset,
+    dataset_exists,
+    load_split,
+    split_exists,
+    save_upload_stream,
+)
 
 # Import fungsi-fungsi dari modul forecasting
 # - create_sequences: Membuat sequence data untuk LSTM
+# - make_sequence_dataset: Pipeline tf.data streaming untuk sequence LSTM
 # - predict_residuals_iterative: Prediksi residual secara iteratif
 # - load_arimax_model: Memuat model ARIMAX yang sudah dilatih
 # - load_lstm_model: Memuat model LSTM yang sudah dilatih
 # - load_residual_scaler: Memuat scaler untuk normalisasi residual
+# - forecast_arimax_mean: Forecast mean ARIMAX tanpa kovarians (pengganti get_forecast().predicted_mean)
+# - forecast_arimax_horizons: Forecast ARIMAX untuk beberapa horizon (validation, test) dalam satu pass
+# - forecast_arimax_scenarios: Forecast ARIMAX untuk banyak skenario kecepatan angin sekaligus
 from .forecasting import (
     create_sequences,
+    make_sequence_dataset,
     predict_residuals_iterative,
+    forecast_arimax_mean,
+    forecast_arimax_horizons,
+    forecast_arimax_scenarios,
     load_arimax_model,
     load_lstm_model,
     load_residual_scaler,
@@ -50,13 +68,20 @@ __all__ = [
     'check_stationarity',        # Mengecek stasioneritas data
     
     # Dataset functions
-    'save_dataset',              # Menyimpan dataset ke CSV
-    'load_dataset',              # Memuat dataset dari CSV
-    'save_uploaded_file',        # Menyimpan file yang diupload
+    'save_dataset',              # Menyimpan dataset biner
+    'load_dataset',              # Memuat dataset biner
+    'dataset_exists',            # Mengecek keberadaan dataset
+    'load_split',                # Memuat split snapshot (view)
+    'split_exists',              # Mengecek keberadaan split
+    'save_upload_stream',        # Menyimpan file upload per chunk
     
     # Forecasting functions
     'create_sequences',          # Membuat sequence untuk LSTM
+    'make_sequence_dataset',     # Pipeline tf.data untuk sequence LSTM
     'predict_residuals_iterative',  # Prediksi residual iteratif
+    'forecast_arimax_mean',      # Forecast mean ARIMAX (tanpa kovarians)
+    'forecast_arimax_horizons',  # Forecast ARIMAX validation + test dalam satu pass
+    'forecast_arimax_scenarios',  # Forecast ARIMAX multi-skenario
     'load_arimax_model',         # Memuat model ARIMAX
     'load_lstm_model',           # Memuat model LSTM
     'load_residual_scaler',      # Memuat scaler residual
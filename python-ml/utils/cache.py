@@ -0,0 +1,213 @@
+"""
+Utility Cache - Hasil Forecast dan Hasil Fitting Model
+
+Modul ini menyediakan:
+1. ForecastCache - cache LRU + TTL di dalam proses untuk hasil /predict. Key cache selalu
+   menyertakan versi model (lihat utils.forecasting.get_model_version), sehingga hasil dari
+   model lama tidak pernah dipakai setelah retrain.
+2. DiskCache - cache persisten (file pickle per key) dengan batas jumlah entri dan total ukuran, dipakai untuk
+   hasil fitting ARIMAX yang dapat dibagi antar proses worker dan bertahan setelah restart.
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable
+
+import numpy as np
+import pandas as pd
+
+
+def hash_vector(values) -> str:
+    """
+    Membuat hash stabil dari vektor numerik (contoh: wind_speed pada request /predict).
+
+    Args:
+        values: List atau array numerik
+
+    Returns:
+        String hex SHA-1 dari representasi float64 vektor
+    """
+    return hashlib.sha1(np.asarray(values, dtype=np.float64).tobytes()).hexdigest()
+
+
+def hash_frame(df: pd.DataFrame) -> str:
+    """
+    Membuat hash stabil dari isi DataFrame (index, nama kolom, dan nilai).
+
+    Args:
+        df: DataFrame (contoh: data training ARIMAX)
+
+    Returns:
+        String hex SHA-1 dari isi DataFrame
+    """
+    digest = hashlib.sha1()
+    digest.update(repr(list(df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+class ForecastCache:
+    """
+    Cache LRU dengan TTL dan counter hit/miss.
+
+    - maxsize: jumlah entri maksimum; entri yang paling lama tidak dipakai dibuang lebih dulu
+    - ttl_seconds: umur maksimum entri; entri kedaluwarsa dianggap miss dan dibuang
+    """
+
+    def __init__(self, maxsize: int = 256, ttl_seconds: float = 600.0):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """Mengambil nilai dari cache (None jika tidak ada atau sudah kedaluwarsa)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, value = entry
+            if self.ttl_seconds > 0 and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+            # Tandai sebagai paling baru dipakai
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Menyimpan nilai ke cache dan membuang entri LRU jika melebihi maxsize."""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Menghapus semua entri (counter hit/miss tetap dipertahankan)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Statistik cache untuk monitoring."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+
+class DiskCache:
+    """
+    Cache persisten: satu file pickle per key di sebuah direktori.
+
+    - maxsize: jumlah entri maksimum; entri yang paling lama tidak dipakai (mtime) dibuang lebih dulu
+    - max_bytes: total ukuran file maksimum (None = tanpa batas ukuran); entri LRU dibuang sampai
+      total ukuran tidak melebihi batas. Entri yang sendirian lebih besar dari batas tidak disimpan
+    - File ditulis ke file sementara lalu os.replace, sehingga aman dipakai bersama oleh
+      beberapa proses worker (pembaca tidak pernah melihat file setengah jadi)
+    - Entri yang rusak atau tidak dapat di-unpickle dianggap miss dan dihapus
+    """
+
+    SUFFIX = '.pkl'
+
+    def __init__(self, directory: str | Path, maxsize: int = 64, max_bytes: int | None = None):
+        self.directory = Path(directory)
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}{self.SUFFIX}'
+
+    def get(self, key: str) -> Any | None:
+        """Mengambil nilai dari cache (None jika tidak ada)."""
+        if self.maxsize <= 0:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            path.unlink(missing_ok=True)
+            return None
+        # Tandai sebagai paling baru dipakai
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Menyimpan nilai ke cache dan membuang entri LRU jika melebihi maxsize atau max_bytes."""
+        if self.maxsize <= 0:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.directory / f'.{key}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.glob(f'*{self.SUFFIX}'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        # Entri terbaru dipertahankan lebih dulu, selama jumlah dan total ukuran masih di bawah batas
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+        kept = 0
+        total_bytes = 0
+        for _, size, path in entries:
+            if kept < self.maxsize and (self.max_bytes is None or total_bytes + size <= self.max_bytes):
+                kept += 1
+                total_bytes += size
+            else:
+                path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Menghapus semua entri."""
+        if not self.directory.exists():
+            return
+        for path in self.directory.glob(f'*{self.SUFFIX}'):
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        """Statistik cache untuk monitoring (jumlah entri dan ukuran di disk)."""
+        paths = list(self.directory.glob(f'*{self.SUFFIX}')) if self.directory.exists() else []
+        size_bytes = 0
+        for path in paths:
+            try:
+                size_bytes += path.stat().st_size
+            except FileNotFoundError:
+                continue
+        return {
+            'size': len(paths),
+            'maxsize': self.maxsize,
+            'bytes': size_bytes,
+            'max_bytes': self.max_bytes,
+        }
@@ -3,13 +3,63 @@ Utility untuk Menyimpan dan Memuat Dataset
 
 Modul ini menyediakan fungsi-fungsi untuk:
 1. Mengelola direktori data dan model
-2. Menyimpan dan memuat dataset dalam format CSV
-3. Menyimpan file yang diupload dari Laravel
+2. Menyimpan dan memuat dataset dalam format biner kolumnar (.npy, dapat di-memory-map)
+3. Menyimpan file yang diupload dari Laravel (sekaligus atau streaming per chunk)
+
+Format dataset: satu file .npy berisi satu record numpy terstruktur. Setiap field adalah
+satu kolom utuh (subarray sepanjang jumlah baris) yang tersimpan berurutan di file:
+field pertama adalah index (timestamp datetime64 / int64), field berikutnya kolom data.
+Nama field = nama index/kolom dan tipe data tersimpan di header .npy, sehingga file dapat
+dimuat dengan np.load(mmap_mode=...) dan setiap kolom menjadi view langsung ke file
+(tanpa parsing CSV dan tanpa inferensi tanggal).
+
+Dataset CSV lama (train_dataset.csv, dst.) dikonversi sekali ke format ini
+(migrate_csv_datasets saat startup, atau saat pertama kali dimuat dengan load_dataset).
+
+Setiap upload disimpan sebagai satu snapshot yang sudah dibersihkan (data/dataset_snapshot.npy).
+Batas train/validation/test dicatat sebagai offset baris di data/dataset_snapshot.json, dan
+load_split mengembalikan slice snapshot (view, tanpa salinan per split).
 """
 
 import pandas as pd
+import numpy as np
+import hashlib
+import json
 import os
+import shutil
+import tempfile
 from pathlib import Path
+from typing import BinaryIO
+
+# Nama dasar file upload di direktori data (ekstensi mengikuti format file: upload.xlsx, upload.csv, ...)
+UPLOAD_BASENAME = 'upload'
+
+# Ukuran chunk saat menyalin file upload ke disk (1 MB)
+UPLOAD_CHUNK_BYTES = 1 << 20
+
+# Ekstensi file dataset biner (nama dataset seperti 'train_dataset.csv' dipetakan ke 'train_dataset.npy')
+DATASET_SUFFIX = '.npy'
+
+# Nama field index jika index tidak bernama
+INDEX_FIELD = '__index__'
+
+# Snapshot dataset hasil upload (satu file) dan metadata offset split-nya
+SNAPSHOT_DATASET = 'dataset_snapshot'
+SNAPSHOT_METADATA_FILENAME = 'dataset_snapshot.json'
+
+# Nama split dan dataset per split lama (sebelum snapshot) yang dikonversi oleh migrate_split_datasets
+SPLITS = ('train', 'validation', 'test')
+LEGACY_SPLIT_DATASETS = {split: f'{split}_dataset.csv' for split in SPLITS}
+
+# Dataset yang disimpan dengan save_dataset (dikonversi dari CSV lama oleh migrate_csv_datasets)
+DATASET_FILES = (
+    'train_dataset.csv',
+    'validation_dataset.csv',
+    'test_dataset.csv',
+    'residual_train.csv',
+    'refresh_observations.csv',
+    'hybrid_arimax_lstm_results.csv',
+)
 
 
 def get_data_dir() -> Path:
@@ -41,72 +91,398 @@ def get_models_dir() -> Path:
     return Path(__file__).parent.parent / 'models'
 
 
-def save_dataset(df: pd.DataFrame, filename: str) -> str:
+def fingerprint_files(paths: list[Path]) -> str | None:
     """
-    Menyimpan DataFrame ke file CSV di direktori data.
+    Membuat fingerprint dari sekumpulan file berdasarkan nama, ukuran, dan waktu modifikasi.
+    
+    Fingerprint berubah setiap kali salah satu file ditulis ulang, sehingga dapat dipakai
+    sebagai versi (contoh: versi model atau versi dataset) tanpa membaca isi file.
+    
+    Args:
+        paths: List path file (file yang tidak ada diabaikan)
+
+    Returns:
+        String hex 16 karakter, atau None jika tidak ada satu pun file yang ada
+    """
+    digest = hashlib.sha1()
+    found = False
+    for path in paths:
+        if path.exists():
+            stat = path.stat()
+            digest.update(f'{path.name}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+            found = True
+    return digest.hexdigest()[:16] if found else None
+
+
+def _use_mmap() -> bool:
+    """
+    Mengecek apakah dataset dimuat dengan memory-map (env DATASET_MMAP).
+
+    Default aktif kecuali di Windows: file yang sedang di-memory-map tidak dapat
+    diganti (os.replace) di Windows, sehingga upload dataset baru akan gagal.
+    """
+    default = '0' if os.name == 'nt' else '1'
+    return os.environ.get('DATASET_MMAP', default).lower() not in ('0', 'false', 'no')
+
+
+def write_frame(data: pd.DataFrame | pd.Series, path: Path) -> Path:
+    """
+    Menulis DataFrame/Series ke file .npy kolumnar (ditulis ke file sementara lalu os.replace).
+
+    Args:
+        data: DataFrame (atau Series) dengan index datetime/numerik dan kolom numerik
+        path: Path file tujuan (.npy)
+
+    Returns:
+        Path file yang ditulis
+
+    Raises:
+        TypeError: Jika index atau kolom bukan numerik/boolean/datetime (tz-naive)
+    """
+    df = data.to_frame() if isinstance(data, pd.Series) else data
+    index_name = df.index.name if df.index.name is not None else INDEX_FIELD
+    fields = [(str(index_name), np.asarray(df.index))]
+    fields += [(str(column), df[column].to_numpy()) for column in df.columns]
+    for name, values in fields:
+        if values.dtype.kind not in 'biufM':
+            raise TypeError(f'Column {name!r} has unsupported dtype {values.dtype} for the binary dataset store')
+
+    # Satu record dengan satu subarray per kolom: setiap kolom tersimpan berurutan di file
+    # (dtype dibangun ulang dari dtype.str agar metadata dtype, contoh dari index statsmodels, tidak ikut)
+    record = np.empty(1, dtype=[(name, np.dtype(values.dtype.str), (len(df),)) for name, values in fields])
+    for name, values in fields:
+        record[name][0] = values
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.stem}-', suffix=DATASET_SUFFIX)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, record, allow_pickle=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return path
+
+
+def read_frame(path: Path, mmap: bool | None = None) -> pd.DataFrame:
+    """
+    Memuat DataFrame dari file .npy kolumnar (atau file CSV lama, berdasarkan ekstensi).
+
+    Dengan memory-map, kolom dan index adalah view langsung ke file (zero-copy). Mode
+    copy-on-write dipakai: perubahan pada DataFrame tidak pernah ditulis ke file.
+
+    Args:
+        path: Path file .npy (atau .csv untuk file lama)
+        mmap: Gunakan memory-map (None = env DATASET_MMAP)
+
+    Returns:
+        DataFrame dengan index dan kolom sesuai saat disimpan
+    """
+    path = Path(path)
+    if path.suffix == '.csv':
+        return pd.read_csv(path, index_col=0, parse_dates=True)
+    mmap = _use_mmap() if mmap is None else mmap
+    record = np.load(path, mmap_mode='c' if mmap else None, allow_pickle=False)
+    columns = {name: record[name][0].view(np.ndarray) for name in record.dtype.names}
+    index_name = record.dtype.names[0]
+    index = pd.Index(columns.pop(index_name), name=None if index_name == INDEX_FIELD else index_name, copy=False)
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+def get_dataset_path(filename: str) -> Path:
+    """
+    Mendapatkan path file biner sebuah dataset di direktori data.
+
+    Args:
+        filename: Nama dataset (contoh: 'train_dataset.csv'; ekstensi diganti .npy)
+
+    Returns:
+        Path file dataset (contoh: data/train_dataset.npy)
+    """
+    return get_data_dir() / (Path(filename).stem + DATASET_SUFFIX)
+
+
+def _legacy_csv_path(filename: str) -> Path:
+    """Path file CSV lama sebuah dataset (sebelum format biner)."""
+    return get_data_dir() / (Path(filename).stem + '.csv')
+
+
+def dataset_exists(filename: str) -> bool:
+    """
+    Mengecek apakah dataset sudah tersimpan (format biner, atau CSV lama yang belum dikonversi).
+
+    Args:
+        filename: Nama dataset (contoh: 'train_dataset.csv')
+
+    Returns:
+        True jika dataset ada
+    """
+    return get_dataset_path(filename).exists() or _legacy_csv_path(filename).exists()
+
+
+def migrate_dataset(filename: str) -> pd.DataFrame | None:
+    """
+    Mengkonversi dataset CSV lama ke format biner (sekali), lalu menghapus file CSV.
+
+    Args:
+        filename: Nama dataset (contoh: 'train_dataset.csv')
+
+    Returns:
+        DataFrame hasil konversi, atau None jika tidak ada CSV lama
+    """
+    legacy_path = _legacy_csv_path(filename)
+    if not legacy_path.exists():
+        return None
+    df = read_frame(legacy_path)
+    write_frame(df, get_dataset_path(filename))
+    legacy_path.unlink(missing_ok=True)
+    return df
+
+
+def migrate_csv_datasets() -> list[str]:
+    """
+    Mengkonversi semua dataset CSV lama (DATASET_FILES) di direktori data ke format biner.
+
+    Dataset yang gagal dikonversi dibiarkan sebagai CSV (tetap dapat dimuat oleh load_dataset).
+
+    Returns:
+        List nama dataset yang dikonversi
+    """
+    import logging
+
+    migrated = []
+    for filename in DATASET_FILES:
+        try:
+            if migrate_dataset(filename) is not None:
+                migrated.append(filename)
+        except Exception as e:
+            logging.warning(f'Could not migrate {filename} to the binary dataset store: {e}')
+    return migrated
+
+
+def save_dataset(df: pd.DataFrame | pd.Series, filename: str) -> str:
+    """
+    Menyimpan DataFrame ke file dataset biner (.npy kolumnar) di direktori data.
     
     Fungsi ini digunakan untuk menyimpan dataset yang sudah diproses
-    ke dalam format CSV untuk digunakan dalam training model.
+    untuk digunakan dalam training model. File CSV lama dengan nama yang sama dihapus.
     
     Args:
-        df: DataFrame pandas yang akan disimpan
-        filename: Nama file (contoh: 'train_dataset.csv')
+        df: DataFrame (atau Series) pandas yang akan disimpan
+        filename: Nama dataset (contoh: 'train_dataset.csv' -> data/train_dataset.npy)
 
     Returns:
         Path lengkap ke file yang sudah disimpan
     """
     data_dir = get_data_dir()
     data_dir.mkdir(exist_ok=True)  # Buat direktori jika belum ada
-    file_path = data_dir / filename
-    df.to_csv(file_path)  # Simpan DataFrame ke CSV
+    file_path = write_frame(df, get_dataset_path(filename))
+    _legacy_csv_path(filename).unlink(missing_ok=True)
     return str(file_path)
 
 
 def load_dataset(filename: str) -> pd.DataFrame:
     """
-    Memuat DataFrame dari file CSV di direktori data.
+    Memuat DataFrame dari file dataset biner di direktori data.
     
     Fungsi ini digunakan untuk memuat dataset yang sudah disimpan
-    untuk digunakan dalam training atau evaluasi model.
+    untuk digunakan dalam training atau evaluasi model. File di-memory-map (lihat
+    read_frame) sehingga tidak ada parsing; CSV lama dikonversi sekali saat pertama dimuat.
     
     Args:
-        filename: Nama file (contoh: 'train_dataset.csv')
+        filename: Nama dataset (contoh: 'train_dataset.csv')
 
     Returns:
-        DataFrame yang sudah dimuat dari CSV
+        DataFrame yang sudah dimuat
         
     Raises:
         FileNotFoundError: Jika file tidak ditemukan
     """
-    data_dir = get_data_dir()
-    file_path = data_dir / filename
-    if not file_path.exists():
+    file_path = get_dataset_path(filename)
+    if file_path.exists():
+        return read_frame(file_path)
+    df = migrate_dataset(filename)
+    if df is None:
         raise FileNotFoundError(f"Dataset file not found: {file_path}")
-    # Baca CSV dengan index_col=0 (gunakan kolom pertama sebagai index)
-    # parse_dates=True untuk mengkonversi kolom tanggal ke datetime
-    df = pd.read_csv(file_path, index_col=0, parse_dates=True)
     return df
 
 
-def save_uploaded_file(file_content: bytes, filename: str = 'upload.xlsx') -> str:
+def save_snapshot(df: pd.DataFrame, train_end: int, validation_end: int) -> dict:
     """
-    Menyimpan file yang diupload dari Laravel ke direktori data.
-    
-    Fungsi ini digunakan saat Laravel mengupload file Excel ke FastAPI.
-    File akan disimpan di direktori data untuk diproses lebih lanjut.
-    
+    Menyimpan dataset hasil upload sebagai satu snapshot beserta offset split-nya.
+
+    Split: train = baris [0, train_end), validation = [train_end, validation_end),
+    test = [validation_end, len(df)). Dataset per split lama dihapus.
+
+    Args:
+        df: DataFrame yang sudah dibersihkan (index timestamp terurut)
+        train_end: Offset baris akhir data training (eksklusif)
+        validation_end: Offset baris akhir data validation (eksklusif)
+
+    Returns:
+        Dictionary metadata snapshot {rows, splits: {nama split: [awal, akhir]}}
+    """
+    n = len(df)
+    if not 0 <= train_end <= validation_end <= n:
+        raise ValueError(f'Invalid split offsets: train_end={train_end}, validation_end={validation_end}, rows={n}')
+    metadata = {
+        'rows': n,
+        'splits': {
+            'train': [0, int(train_end)],
+            'validation': [int(train_end), int(validation_end)],
+            'test': [int(validation_end), n],
+        },
+    }
+    save_dataset(df, SNAPSHOT_DATASET)
+    metadata_path = get_data_dir() / SNAPSHOT_METADATA_FILENAME
+    tmp_path = metadata_path.with_name(f'.{metadata_path.name}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(tmp_path, metadata_path)
+
+    for filename in LEGACY_SPLIT_DATASETS.values():
+        get_dataset_path(filename).unlink(missing_ok=True)
+        _legacy_csv_path(filename).unlink(missing_ok=True)
+    return metadata
+
+
+def load_snapshot_metadata() -> dict | None:
+    """
+    Membaca metadata snapshot (offset split). Dataset per split lama dikonversi lebih dulu.
+
+    Returns:
+        Dictionary metadata snapshot, atau None jika belum ada dataset yang diupload
+    """
+    metadata_path = get_data_dir() / SNAPSHOT_METADATA_FILENAME
+    if not metadata_path.exists() and not migrate_split_datasets():
+        return None
+    with open(metadata_path, 'r') as f:
+        return json.load(f)
+
+
+def load_snapshot() -> pd.DataFrame:
+    """
+    Memuat seluruh snapshot dataset hasil upload (train + validation + test).
+
+    Raises:
+        FileNotFoundError: Jika dataset belum diupload
+    """
+    if load_snapshot_metadata() is None:
+        raise FileNotFoundError('Dataset not found. Please upload dataset first.')
+    return load_dataset(SNAPSHOT_DATASET)
+
+
+def split_exists(split: str) -> bool:
+    """
+    Mengecek apakah split ('train', 'validation', 'test') tersedia dan tidak kosong.
+
+    Args:
+        split: Nama split
+
+    Returns:
+        True jika snapshot ada dan split berisi minimal satu baris
+    """
+    metadata = load_snapshot_metadata()
+    if metadata is None or split not in metadata['splits']:
+        return False
+    start, end = metadata['splits'][split]
+    return end > start
+
+
+def load_split(split: str) -> pd.DataFrame:
+    """
+    Memuat satu split dataset sebagai slice snapshot (view tanpa salinan).
+
+    Args:
+        split: Nama split ('train', 'validation', atau 'test')
+
+    Returns:
+        DataFrame split (index timestamp)
+
+    Raises:
+        FileNotFoundError: Jika dataset belum diupload
+        ValueError: Jika nama split tidak dikenal
+    """
+    if split not in SPLITS:
+        raise ValueError(f'Unknown split: {split}. Use one of {", ".join(SPLITS)}.')
+    metadata = load_snapshot_metadata()
+    if metadata is None:
+        raise FileNotFoundError(f'Dataset not found for split {split!r}. Please upload dataset first.')
+    start, end = metadata['splits'][split]
+    return load_dataset(SNAPSHOT_DATASET).iloc[start:end]
+
+
+def get_snapshot_paths() -> list[Path]:
+    """Path file snapshot dan metadata-nya (untuk fingerprint versi dataset)."""
+    return [get_dataset_path(SNAPSHOT_DATASET), get_data_dir() / SNAPSHOT_METADATA_FILENAME]
+
+
+def migrate_split_datasets() -> bool:
+    """
+    Menggabungkan dataset per split lama (train/validation/test) menjadi satu snapshot (sekali).
+
+    Dataset lama bisa saling tumpang tindih: /train/arimax versi lama men-split ulang data 70/30
+    dan menulis ulang test, sehingga test juga memuat baris validation. Jika split tidak
+    berurutan tanpa overlap, snapshot dibangun ulang tanpa timestamp duplikat dan diurutkan.
+    Offset split diambil dari timestamp batas akhir train dan validation lama.
+
+    Returns:
+        True jika snapshot dibuat, False jika tidak ada dataset lama (train dan test)
+    """
+    if not dataset_exists(LEGACY_SPLIT_DATASETS['train']) or not dataset_exists(LEGACY_SPLIT_DATASETS['test']):
+        return False
+    frames = {
+        split: load_dataset(filename) if dataset_exists(filename) else None
+        for split, filename in LEGACY_SPLIT_DATASETS.items()
+    }
+    train, test = frames['train'], frames['test']
+    validation = frames['validation'] if frames['validation'] is not None else train.iloc[:0]
+
+    snapshot = pd.concat([train, validation, test])
+    parts = [frame.index for frame in (train, validation, test) if len(frame)]
+    contiguous = all(index.is_monotonic_increasing and index.is_unique for index in parts) and all(
+        before[-1] < after[0] for before, after in zip(parts, parts[1:])
+    )
+    if not contiguous:
+        snapshot = snapshot[~snapshot.index.duplicated(keep='first')].sort_index(kind='stable')
+
+    # Baris sampai timestamp terakhir train (dan validation) lama termasuk split tersebut
+    train_end = int(snapshot.index.searchsorted(train.index[-1], side='right')) if len(train) else 0
+    validation_end = (
+        int(snapshot.index.searchsorted(validation.index[-1], side='right')) if len(validation) else train_end
+    )
+    save_snapshot(snapshot, train_end, max(train_end, validation_end))
+    return True
+
+
+def save_upload_stream(fileobj: BinaryIO, suffix: str) -> str:
+    """
+    Menyimpan file upload ke direktori data dengan menyalin per chunk (tanpa membaca seluruh isi ke memori).
+
+    File ditulis ke file sementara lalu dipindahkan secara atomik ke data/upload<suffix>.
+    File upload lama dengan ekstensi lain dihapus agar hanya ada satu file upload.
+
     Args:
-        file_content: Konten file dalam format bytes (dari Laravel)
-        filename: Nama file untuk disimpan (default: 'upload.xlsx')
+        fileobj: File-like object yang dapat dibaca (contoh: UploadFile.file dari FastAPI)
+        suffix: Ekstensi file (contoh: '.xlsx', '.csv', '.parquet')
 
     Returns:
         Path lengkap ke file yang sudah disimpan
     """
     data_dir = get_data_dir()
     data_dir.mkdir(exist_ok=True)  # Buat direktori jika belum ada
-    file_path = data_dir / filename
-    # Tulis file dalam mode binary ('wb')
-    with open(file_path, 'wb') as f:
-        f.write(file_content)
+    file_path = data_dir / f'{UPLOAD_BASENAME}{suffix}'
+    fd, tmp_path = tempfile.mkstemp(dir=data_dir, prefix='.upload-', suffix=suffix)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            shutil.copyfileobj(fileobj, f, UPLOAD_CHUNK_BYTES)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    for old_upload in data_dir.glob(f'{UPLOAD_BASENAME}.*'):
+        if old_upload != file_path:
+            old_upload.unlink(missing_ok=True)
     return str(file_path)
-
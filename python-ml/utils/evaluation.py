@@ -2,10 +2,21 @@
 Utility untuk Evaluasi Model - Menghitung Metrik Akurasi
 
 Modul ini menyediakan fungsi-fungsi untuk menghitung metrik evaluasi
-yang digunakan untuk mengukur akurasi model prediksi.
+yang digunakan untuk mengukur akurasi model prediksi, serta menyimpan
+artefak evaluasi (prediksi per baris, metrik, statistik residual) agar
+endpoint /evaluate dan /residual-predictions tidak perlu menghitung ulang.
 """
 
+import json
+import os
+
 import numpy as np
+import pandas as pd
+
+from .dataset import get_models_dir
+
+# Nama file artefak evaluasi di direktori models
+EVALUATION_ARTIFACT_FILENAME = 'evaluation_artifact.json'
 
 
 def mape(y_true: np.ndarray, y_pred: np.ndarray) -> float:
@@ -53,3 +64,107 @@ def calculate_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> dict:
         'mape': mape(y_true, y_pred),  # Mean Absolute Percentage Error
     }
 
+
+
+def build_evaluation_artifact(
+    test: pd.DataFrame,
+    arimax_pred: np.ndarray,
+    predicted_resid: np.ndarray,
+    version: str | None,
+) -> dict:
+    """
+    Membangun artefak evaluasi model Hybrid pada test set.
+
+    Artefak berisi prediksi per baris, metrik MAPE (ARIMAX, Hybrid, residual LSTM),
+    dan statistik residual. Artefak diberi versi sehingga pembaca dapat mendeteksi
+    apakah artefak masih sesuai dengan model dan test set saat ini.
+
+    Args:
+        test: DataFrame test set (index timestamp, kolom wave_height)
+        arimax_pred: Prediksi ARIMAX pada test set
+        predicted_resid: Prediksi residual LSTM pada test set
+        version: Versi model + dataset yang dipakai untuk menghitung artefak
+
+    Returns:
+        Dictionary artefak evaluasi (JSON-serializable)
+    """
+    y_true = test['wave_height'].values
+    hybrid_pred = arimax_pred + predicted_resid
+    residual_actual = y_true - arimax_pred
+    residual_error = residual_actual - predicted_resid
+
+    rows = [
+        {
+            'timestamp': str(test.index[i]),
+            'actual': float(y_true[i]),
+            'arimax_pred': float(arimax_pred[i]),
+            'residual_actual': float(residual_actual[i]),
+            'residual_pred': float(predicted_resid[i]),
+            'residual_error': float(residual_error[i]),
+            'hybrid_pred': float(hybrid_pred[i]),
+        }
+        for i in range(len(test))
+    ]
+
+    return {
+        'version': version,
+        'metrics': {
+            'arimax_mape': calculate_metrics(y_true, arimax_pred)['mape'],
+            'hybrid_mape': calculate_metrics(y_true, hybrid_pred)['mape'],
+            'lstm_mape_residual': float(mape(residual_actual, predicted_resid)),
+        },
+        'residual_statistics': {
+            'mae': float(np.mean(np.abs(residual_error))),
+            'rmse': float(np.sqrt(np.mean(residual_error ** 2))),
+            'mean_abs_actual': float(np.mean(np.abs(residual_actual))),
+            'mean_abs_pred': float(np.mean(np.abs(predicted_resid))),
+            'count': len(predicted_resid),
+        },
+        'rows': rows,
+    }
+
+
+def save_evaluation_artifact(artifact: dict) -> str:
+    """
+    Menyimpan artefak evaluasi ke models/evaluation_artifact.json.
+
+    File ditulis ke file sementara lalu di-rename (atomic), sehingga pembaca tidak
+    pernah melihat file yang setengah tertulis.
+
+    Args:
+        artifact: Artefak evaluasi dari build_evaluation_artifact()
+
+    Returns:
+        Path lengkap ke file artefak
+    """
+    models_dir = get_models_dir()
+    models_dir.mkdir(exist_ok=True)
+    artifact_path = models_dir / EVALUATION_ARTIFACT_FILENAME
+    tmp_path = artifact_path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(artifact, f)
+    os.replace(tmp_path, artifact_path)
+    return str(artifact_path)
+
+
+def load_evaluation_artifact(version: str | None = None) -> dict | None:
+    """
+    Memuat artefak evaluasi dari disk.
+
+    Args:
+        version: Jika diberikan, artefak hanya dikembalikan jika versinya sama
+
+    Returns:
+        Dictionary artefak, atau None jika tidak ada / versi tidak cocok / file rusak
+    """
+    artifact_path = get_models_dir() / EVALUATION_ARTIFACT_FILENAME
+    if not artifact_path.exists():
+        return None
+    try:
+        with open(artifact_path, 'r') as f:
+            artifact = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return None
+    if version is not None and artifact.get('version') != version:
+        return None
+    return artifact
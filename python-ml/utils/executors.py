@@ -0,0 +1,172 @@
+"""
+Utility Eksekusi Pekerjaan CPU-Bound di Luar Event Loop
+
+Endpoint FastAPI adalah `async def`, sehingga fitting statsmodels, training Keras, dan
+forecast iteratif yang dijalankan langsung di dalamnya akan memblokir event loop
+(/health dan /predict ikut berhenti). Modul ini menyediakan WorkerPool:
+
+1. WorkerPool('process') - process pool (start method 'spawn') untuk training dan evaluasi;
+   pekerjaan berjalan di proses terpisah sehingga tidak berebut GIL dengan event loop
+2. WorkerPool('thread') - thread pool berukuran terbatas untuk inference (/predict),
+   yang sebagian besar waktunya dihabiskan di NumPy (melepas GIL)
+
+Setiap pool membatasi jumlah pekerjaan yang menunggu (max_pending) dan mencatat
+kedalaman antrian untuk monitoring.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException
+
+# True di dalam proses worker (diset oleh initializer process pool)
+_IN_WORKER_PROCESS = False
+
+
+class QueueFullError(RuntimeError):
+    """Antrian pool sudah penuh (jumlah pekerjaan yang menunggu mencapai max_pending)."""
+
+
+class JobError(Exception):
+    """
+    HTTPException yang dilempar di proses worker.
+
+    HTTPException tidak dapat di-pickle, sehingga dibungkus sebagai (status_code, detail)
+    dan dikembalikan menjadi HTTPException di proses utama.
+    """
+
+    def __init__(self, status_code: int, detail):
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def in_worker_process() -> bool:
+    """Mengecek apakah kode sedang berjalan di proses worker WorkerPool('process')."""
+    return _IN_WORKER_PROCESS
+
+
+def _init_worker_process():
+    """Initializer proses worker."""
+    global _IN_WORKER_PROCESS
+    _IN_WORKER_PROCESS = True
+
+
+def _call_job(fn, args: tuple, kwargs: dict):
+    """Menjalankan pekerjaan di proses worker dan membungkus HTTPException menjadi JobError."""
+    try:
+        return fn(*args, **kwargs)
+    except HTTPException as e:
+        raise JobError(e.status_code, e.detail) from None
+
+
+class WorkerPool:
+    """
+    Pool eksekusi (process atau thread) dengan batas antrian dan statistik kedalaman antrian.
+
+    - kind: 'process' (training/evaluasi) atau 'thread' (inference)
+    - max_workers: jumlah worker
+    - max_pending: jumlah maksimum pekerjaan yang sedang berjalan + menunggu;
+      pekerjaan baru ditolak dengan QueueFullError jika batas tercapai
+    """
+
+    def __init__(self, name: str, kind: str, max_workers: int, max_pending: int):
+        if kind not in ('process', 'thread'):
+            raise ValueError(f"Unknown pool kind: {kind}. Use 'process' or 'thread'.")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(1, max_pending)
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        """Membuat executor saat pertama kali dipakai (proses worker tidak dibuat saat import)."""
+        with self._lock:
+            if self._executor is None:
+                if self.kind == 'process':
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context('spawn'),
+                        initializer=_init_worker_process,
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix=self.name,
+                    )
+            return self._executor
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Menjalankan fn(*args, **kwargs) di pool dan menunggu hasilnya tanpa memblokir event loop.
+
+        Untuk process pool, fn dan argumennya harus dapat di-pickle (fungsi level modul).
+
+        Raises:
+            QueueFullError: Jika antrian penuh
+            HTTPException: Jika pekerjaan di proses worker melempar HTTPException
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise QueueFullError(f'{self.name} queue is full ({self._pending} pending jobs)')
+            self._pending += 1
+            self.submitted += 1
+        try:
+            executor = self._get_executor()
+            if self.kind == 'process':
+                future = executor.submit(_call_job, fn, args, kwargs)
+            else:
+                future = executor.submit(fn, *args, **kwargs)
+            result = await asyncio.wrap_future(future)
+            with self._lock:
+                self.completed += 1
+            return result
+        except JobError as e:
+            with self._lock:
+                self.failed += 1
+            raise HTTPException(status_code=e.status_code, detail=e.detail) from None
+        except BrokenProcessPool:
+            # Worker mati (contoh: OOM); buat ulang pool untuk pekerjaan berikutnya
+            with self._lock:
+                self.failed += 1
+                self._executor = None
+            raise
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def stats(self) -> dict:
+        """Statistik pool untuk monitoring (kedalaman antrian, jumlah pekerjaan)."""
+        with self._lock:
+            return {
+                'kind': self.kind,
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'running': min(self._pending, self.max_workers),
+                'queued': max(0, self._pending - self.max_workers),
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+            }
+
+    def shutdown(self, wait: bool = False):
+        """Menghentikan executor (dipanggil saat aplikasi shutdown)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
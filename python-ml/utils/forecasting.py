@@ -1,11 +1,26 @@
 """Forecasting utilities for ARIMAX and LSTM predictions."""
 
+from __future__ import annotations
+
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
 import joblib
 from pathlib import Path
-import tensorflow as tf
+from typing import TYPE_CHECKING
+
+from .numpy_lstm import NumpyLSTM
+from .dataset import fingerprint_files
+from .registry import get_current_version, get_residual_train_path
+
+if TYPE_CHECKING:
+    import tensorflow as tf
+    from sklearn.preprocessing import MinMaxScaler
+
+
+# Nama atribut model tempat fungsi rollout terkompilasi di-cache per ukuran window.
+# Cache disimpan di model itu sendiri (bukan cache global) karena closure rollout memegang
+# referensi kuat ke model: model dan graph-nya harus dibuang bersama (misal setelah retrain).
+_COMPILED_ROLLOUTS_ATTR = '_compiled_rollouts'
 
 
 def get_models_dir() -> Path:
@@ -18,6 +33,30 @@ def get_models_dir() -> Path:
     return Path(__file__).parent.parent / 'models'
 
 
+def get_model_version() -> str | None:
+    """
+    Mendapatkan versi model yang sedang dilayani.
+    
+    Jika registry model sudah berisi bundle, versi adalah nama bundle CURRENT (lihat
+    utils.registry). Jika belum, versi adalah fingerprint (nama, ukuran, waktu modifikasi)
+    dari file model ARIMAX, model LSTM, scaler residual, dan residual training (sumber seed
+    LSTM) di direktori models/; setiap retrain menulis ulang file-file ini sehingga versinya berubah.
+    
+    Returns:
+        String versi, atau None jika belum ada model yang tersimpan
+    """
+    bundle_version = get_current_version()
+    if bundle_version is not None:
+        return bundle_version
+    models_dir = get_models_dir()
+    return fingerprint_files([
+        models_dir / 'arimax_model.pkl',
+        models_dir / 'lstm_residual_model.h5',
+        models_dir / 'residual_scaler.save',
+        get_residual_train_path(),
+    ])
+
+
 def create_sequences(arr: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
     """
     Membuat sequence untuk training LSTM.
@@ -40,26 +79,124 @@ def create_sequences(arr: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarr
         Tuple berisi (X, y) dimana:
         - X: Array sequence input dengan shape (n_sequences, window, 1)
         - y: Array target dengan shape (n_sequences,)
+
+    X adalah view (strided, tanpa salinan) ke arr yang bersifat read-only: setiap window
+    berbagi memori dengan arr, sehingga membuat window tidak menyalin data `window` kali.
+    Salin dengan np.array(X) jika perlu array yang dapat ditulis.
     """
-    X, y = [], []
-    # Loop untuk membuat setiap sequence
-    for i in range(len(arr) - window):
-        # Ambil window data sebagai input (X)
-        X.append(arr[i:i+window, 0])
-        # Ambil nilai berikutnya sebagai target (y)
-        y.append(arr[i+window, 0])
-    # Reshape X menjadi format (n_sequences, window, 1) untuk LSTM
-    X = np.array(X).reshape(-1, window, 1)
-    y = np.array(y)
+    values = np.asarray(arr)[:, 0]
+    n_sequences = len(values) - window
+    if n_sequences <= 0:
+        return np.empty((0, window, 1), dtype=values.dtype), np.empty(0, dtype=values.dtype)
+    # Window ke-i = values[i:i+window]; window terakhir (tanpa target) dibuang
+    X = np.lib.stride_tricks.sliding_window_view(values, window)[:n_sequences, :, np.newaxis]
+    y = values[window:]
     return X, y
 
 
+def make_sequence_dataset(
+    arr: np.ndarray,
+    window: int,
+    batch_size: int,
+    shuffle: bool = False,
+    seed: int | None = None,
+) -> tf.data.Dataset:
+    """
+    Membuat pipeline tf.data streaming berisi pasangan (X, y) yang sama seperti create_sequences.
+
+    Window dibentuk per batch di dalam pipeline (tf.keras.utils.timeseries_dataset_from_array)
+    dan di-prefetch, sehingga tensor window (n_sequences, window, 1) tidak pernah dibuat utuh
+    di memori. Dipakai untuk training pada series residual yang sangat panjang.
+
+    Args:
+        arr: Array dengan shape (n_samples, 1) berisi data time series (sudah di-scale)
+        window: Ukuran window
+        batch_size: Ukuran batch
+        shuffle: Jika True, urutan window diacak (diacak ulang setiap epoch)
+        seed: Seed pengacakan
+
+    Returns:
+        tf.data.Dataset berisi batch (X, y) dengan shape (batch, window, 1) dan (batch,)
+    """
+    import tensorflow as tf
+
+    values = np.asarray(arr, dtype=np.float32).reshape(-1, 1)
+    # Window ke-i = values[i:i+window] dengan target values[i+window]; jumlah window dibatasi
+    # oleh panjang targets, sehingga window terakhir (tanpa target) tidak ikut
+    dataset = tf.keras.utils.timeseries_dataset_from_array(
+        values,
+        values[window:, 0],
+        sequence_length=window,
+        batch_size=batch_size,
+        shuffle=shuffle,
+        seed=seed,
+    )
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+def get_compiled_rollout(model_lstm: tf.keras.Model, window: int = 18):
+    """
+    Mendapatkan fungsi rollout residual yang sudah dikompilasi menjadi satu graph TensorFlow.
+    
+    Seluruh loop n-step (prediksi -> geser window -> tambahkan prediksi) dijalankan di dalam
+    satu tf.function dengan input signature tetap, sehingga forecast n-step hanya membutuhkan
+    satu pemanggilan graph, bukan n kali bolak-balik Python ke TensorFlow.
+    
+    Fungsi di-cache per model dan per ukuran window, sehingga tracing hanya terjadi sekali.
+    
+    Args:
+        model_lstm: Model LSTM yang sudah dilatih
+        window: Ukuran window yang digunakan saat training (default: 18)
+    
+    Returns:
+        tf.function dengan signature (seq: float32[1, window, 1], n_steps: int32[]) -> float32[n_steps]
+    """
+    import tensorflow as tf
+
+    per_model = getattr(model_lstm, _COMPILED_ROLLOUTS_ATTR, None)
+    if per_model is None:
+        per_model = {}
+        setattr(model_lstm, _COMPILED_ROLLOUTS_ATTR, per_model)
+        # Keras membungkus dict atribut menjadi dict ter-track; ambil objek yang tersimpan
+        per_model = getattr(model_lstm, _COMPILED_ROLLOUTS_ATTR)
+    if window in per_model:
+        return per_model[window]
+
+    @tf.function(
+        input_signature=[
+            tf.TensorSpec(shape=[1, window, 1], dtype=tf.float32),
+            tf.TensorSpec(shape=[], dtype=tf.int32),
+        ],
+        reduce_retracing=True,
+    )
+    def rollout(seq, n_steps):
+        predictions = tf.TensorArray(tf.float32, size=n_steps)
+
+        def body(i, current_seq, predictions):
+            # Prediksi residual berikutnya, lalu geser window dan tambahkan prediksi di akhir
+            p_scaled = model_lstm(current_seq, training=False)
+            predictions = predictions.write(i, p_scaled[0, 0])
+            next_seq = tf.concat([current_seq[:, 1:, :], tf.reshape(p_scaled, [1, 1, 1])], axis=1)
+            return i + 1, next_seq, predictions
+
+        _, _, predictions = tf.while_loop(
+            lambda i, *_: i < n_steps,
+            body,
+            [tf.constant(0), seq, predictions],
+        )
+        return predictions.stack()
+
+    per_model[window] = rollout
+    return rollout
+
+
 def predict_residuals_iterative(
-    model_lstm: tf.keras.Model,
+    model_lstm: tf.keras.Model | NumpyLSTM,
     scaler: MinMaxScaler,
     seed: np.ndarray,
     n_steps: int,
     window: int = 18,  # Window size yang menghasilkan 27% MAPE
+    compiled: bool = True,
 ) -> np.ndarray:
     """
     Memprediksi residual secara iteratif menggunakan model LSTM.
@@ -76,40 +213,191 @@ def predict_residuals_iterative(
     3. Inverse transform hasil prediksi (unscale) untuk mendapatkan nilai asli
     
     Args:
-        model_lstm: Model LSTM yang sudah dilatih
+        model_lstm: Model LSTM yang sudah dilatih (Keras atau NumpyLSTM)
         scaler: Scaler yang sudah di-fit untuk residual (untuk inverse transform)
         seed: Window residual terakhir dari training data (sudah di-scale)
         n_steps: Jumlah step yang akan diprediksi
         window: Ukuran window yang digunakan saat training (default: 18)
+        compiled: Jika True, seluruh rollout dijalankan dalam satu graph terkompilasi
+                  (lihat get_compiled_rollout). Jika False, gunakan loop eager per step.
     
     Returns:
         Array residual yang diprediksi (sudah di-unscale, dalam skala asli)
     """
-    # Inisialisasi sequence saat ini dengan seed (window terakhir)
-    current_seq = seed.copy().reshape(1, window, 1)
-    predicted_resid_scaled = []
-
-    # Prediksi iteratif: setiap prediksi menggunakan hasil prediksi sebelumnya
-    # Menggunakan predict_on_batch untuk performa yang lebih baik
-    for _ in range(n_steps):
-        # Prediksi residual berikutnya menggunakan sequence saat ini
-        p_scaled = model_lstm.predict_on_batch(current_seq)[0, 0]
-        predicted_resid_scaled.append(p_scaled)
-        
-        # Update sequence: geser ke kiri, tambahkan prediksi baru di akhir
-        # Contoh: [1,2,3,4,5,6,7,8,9,10,11,12] -> [2,3,4,5,6,7,8,9,10,11,12,prediksi_baru]
-        new_seq = np.append(current_seq.flatten()[1:], p_scaled)
-        current_seq = new_seq.reshape(1, window, 1)
+    if n_steps <= 0:
+        return np.array([], dtype=float)
+
+    if isinstance(model_lstm, NumpyLSTM):
+        # Backend NumPy: rollout tanpa TensorFlow
+        predicted_resid_scaled = model_lstm.rollout(seed, n_steps, window=window)
+    elif compiled:
+        import tensorflow as tf
+
+        # Satu pemanggilan graph untuk seluruh horizon
+        rollout = get_compiled_rollout(model_lstm, window)
+        current_seq = tf.constant(np.asarray(seed, dtype=np.float32).reshape(1, window, 1))
+        predicted_resid_scaled = rollout(current_seq, tf.constant(n_steps, dtype=tf.int32)).numpy()
+    else:
+        # Inisialisasi sequence saat ini dengan seed (window terakhir)
+        current_seq = seed.copy().reshape(1, window, 1)
+        predicted_resid_scaled = []
+
+        # Prediksi iteratif: setiap prediksi menggunakan hasil prediksi sebelumnya
+        # Menggunakan predict_on_batch untuk performa yang lebih baik
+        for _ in range(n_steps):
+            # Prediksi residual berikutnya menggunakan sequence saat ini
+            p_scaled = model_lstm.predict_on_batch(current_seq)[0, 0]
+            predicted_resid_scaled.append(p_scaled)
+
+            # Update sequence: geser ke kiri, tambahkan prediksi baru di akhir
+            # Contoh: [1,2,3,4,5,6,7,8,9,10,11,12] -> [2,3,4,5,6,7,8,9,10,11,12,prediksi_baru]
+            new_seq = np.append(current_seq.flatten()[1:], p_scaled)
+            current_seq = new_seq.reshape(1, window, 1)
 
     # Convert ke array dan reshape untuk inverse transform
     predicted_resid_scaled = np.array(predicted_resid_scaled).reshape(-1, 1)
-    # Inverse transform untuk mendapatkan nilai residual dalam skala asli
+    # Denormalisasi residual dari min-max scaler ke skala asli
     predicted_resid = scaler.inverse_transform(predicted_resid_scaled).flatten()
     return predicted_resid
-    # Denormalisasi residual dari min-max scaler ke skala asli
 
 
-def load_arimax_model() -> object:
+def forecast_arimax_mean(arimax_res, exog) -> np.ndarray:
+    """
+    Menghitung forecast mean ARIMAX saja (tanpa kovarians forecast).
+    
+    get_forecast() membangun objek PredictionResults lengkap, termasuk kovarians forecast
+    yang kemudian dibuang karena pemanggil hanya memakai predicted_mean. Fungsi ini
+    menghitung point forecast langsung dari state space:
+        a_{T+1} = state prediksi terakhir dari Kalman filter
+        y_{T+h} = Z a_{T+h} + beta * wind_{T+h}
+        a_{T+h+1} = T a_{T+h} + c
+    dengan Z (design), T (transition), c (state intercept) dan beta (koefisien eksogen).
+    
+    Hasilnya identik secara numerik dengan get_forecast(...).predicted_mean.values.
+    Untuk model dengan struktur lain (trend, simple differencing, regresi di state),
+    fungsi ini fallback ke get_forecast().
+    
+    Args:
+        arimax_res: Model ARIMAX terlatih (SARIMAXResults)
+        exog: Nilai eksogen (wind_speed) untuk setiap step, DataFrame/array shape (n_steps, 1)
+    
+    Returns:
+        Array forecast mean dengan shape (n_steps,)
+    """
+    model = arimax_res.model
+    exog_values = np.asarray(exog, dtype=float).reshape(len(exog), -1)
+    n_steps = len(exog_values)
+    exog_names = list(getattr(model, 'exog_names', None) or [])
+
+    if not _supports_affine_forecast(model, exog_values.shape[1]):
+        exog_frame = exog if isinstance(exog, pd.DataFrame) else pd.DataFrame(exog_values, columns=exog_names or None)
+        return arimax_res.get_forecast(steps=n_steps, exog=exog_frame).predicted_mean.values
+
+    beta = np.asarray(arimax_res.params[exog_names], dtype=float)
+    return _forecast_arimax_base(arimax_res, n_steps) + exog_values @ beta
+
+
+def _supports_affine_forecast(model, n_exog: int) -> bool:
+    """Mengecek apakah forecast mean model dapat dihitung langsung dari state space (lihat forecast_arimax_mean)."""
+    exog_names = list(getattr(model, 'exog_names', None) or [])
+    return (
+        len(exog_names) == n_exog
+        and getattr(model, 'mle_regression', False)
+        and not getattr(model, 'state_regression', False)
+        and not getattr(model, 'simple_differencing', False)
+        and getattr(model, 'k_trend', 0) == 0
+    )
+
+
+def _forecast_arimax_base(arimax_res, n_steps: int) -> np.ndarray:
+    """Forecast mean komponen ARIMA (tanpa kontribusi eksogen) untuk n_steps setelah akhir data training."""
+    filter_results = arimax_res.filter_results
+    design = filter_results.design[:, :, -1]
+    transition = filter_results.transition[:, :, -1]
+    state_intercept = filter_results.state_intercept[:, -1]
+
+    # State prediksi untuk T+1 (kolom terakhir predicted_state)
+    state = filter_results.predicted_state[:, -1].copy()
+    forecast = np.empty(n_steps)
+    for h in range(n_steps):
+        forecast[h] = design[0] @ state
+        state = transition @ state + state_intercept
+    return forecast
+
+
+def forecast_arimax_horizons(arimax_res, exogs: dict) -> dict:
+    """
+    Forecast mean ARIMAX untuk beberapa horizon (contoh: validation dan test) dalam satu pass.
+
+    Semua horizon di-forecast dari akhir data training (sama seperti memanggil
+    forecast_arimax_mean untuk setiap horizon). Komponen ARIMA dihitung sekali sampai
+    horizon terpanjang, lalu setiap horizon hanya menambahkan beta * exog-nya sendiri,
+    sehingga hasilnya identik dengan forecast_arimax_mean per horizon.
+
+    Args:
+        arimax_res: Model ARIMAX terlatih (SARIMAXResults)
+        exogs: Dictionary {nama: exog}, exog berupa DataFrame/array shape (n_steps, 1);
+               horizon dengan exog None dilewati
+
+    Returns:
+        Dictionary {nama: array forecast mean shape (n_steps,)}
+    """
+    exogs = {name: exog for name, exog in exogs.items() if exog is not None}
+    model = arimax_res.model
+    exog_names = list(getattr(model, 'exog_names', None) or [])
+    exog_values = {
+        name: np.asarray(exog, dtype=float).reshape(len(exog), -1)
+        for name, exog in exogs.items()
+    }
+    if not exogs or not all(_supports_affine_forecast(model, values.shape[1]) for values in exog_values.values()):
+        return {name: forecast_arimax_mean(arimax_res, exog) for name, exog in exogs.items()}
+
+    base = _forecast_arimax_base(arimax_res, max(len(values) for values in exog_values.values()))
+    beta = np.asarray(arimax_res.params[exog_names], dtype=float)
+    return {
+        name: base[:len(values)] + values @ beta
+        for name, values in exog_values.items()
+    }
+
+
+def forecast_arimax_scenarios(arimax_res, wind_scenarios: np.ndarray) -> np.ndarray:
+    """
+    Forecast ARIMAX untuk banyak skenario kecepatan angin sekaligus (ter-vektorisasi).
+    
+    Pada SARIMAX dengan regresi eksogen (mle_regression), model berbentuk
+        y_t = beta * wind_speed_t + u_t
+    dimana u_t adalah proses ARIMA. Forecast mean u_t hanya bergantung pada state
+    terfilter terakhir, sehingga untuk state yang sama forecast mean bersifat affine:
+        mean_h(wind) = base_h + beta * wind_h
+    base dihitung sekali (forecast dengan exog nol), lalu semua skenario dihitung
+    dengan satu operasi broadcasting NumPy.
+    
+    Args:
+        arimax_res: Model ARIMAX terlatih (SARIMAXResults)
+        wind_scenarios: Array shape (n_scenarios, n_steps) berisi kecepatan angin per skenario
+    
+    Returns:
+        Array forecast mean dengan shape (n_scenarios, n_steps)
+    """
+    wind_scenarios = np.atleast_2d(np.asarray(wind_scenarios, dtype=float))
+    n_scenarios, n_steps = wind_scenarios.shape
+    model = arimax_res.model
+    exog_names = list(getattr(model, 'exog_names', None) or [])
+    exog_name = exog_names[0] if exog_names else 'wind_speed'
+
+    # Struktur affine hanya berlaku untuk satu variabel eksogen dengan regresi di observation intercept
+    if len(exog_names) != 1 or not getattr(model, 'mle_regression', False) or getattr(model, 'state_regression', False):
+        return np.vstack([
+            forecast_arimax_mean(arimax_res, pd.DataFrame({exog_name: scenario}))
+            for scenario in wind_scenarios
+        ])
+
+    base = forecast_arimax_mean(arimax_res, pd.DataFrame({exog_name: np.zeros(n_steps)}))
+    beta = float(arimax_res.params[exog_name])
+    return base[np.newaxis, :] + beta * wind_scenarios
+
+
+def load_arimax_model(model_dir: Path | None = None) -> object:
     """
     Memuat model ARIMAX dari disk.
     
@@ -119,13 +407,16 @@ def load_arimax_model() -> object:
     PENTING: Fungsi ini hanya memuat model yang sudah disimpan, TIDAK melakukan training.
     Model ini harus sudah dilatih sebelumnya melalui endpoint /train/arimax.
     
+    Args:
+        model_dir: Direktori model (contoh: bundle registry); default direktori models/
+    
     Returns:
         Model ARIMAX yang sudah dimuat (statsmodels SARIMAXResults object)
     
     Raises:
         FileNotFoundError: Jika file model tidak ditemukan
     """
-    models_dir = get_models_dir()
+    models_dir = model_dir or get_models_dir()
     model_path = models_dir / 'arimax_model.pkl'
     if not model_path.exists():
         raise FileNotFoundError(f"ARIMAX model not found: {model_path}. Please train ARIMAX model first using /train/arimax endpoint.")
@@ -133,6 +424,25 @@ def load_arimax_model() -> object:
     return joblib.load(model_path)
 
 
+def load_arimax_metadata(model_dir: Path | None = None) -> dict | None:
+    """
+    Memuat arimax_model_metadata.json (order, akhir sampel, kecepatan angin terakhir, dst.).
+    
+    Args:
+        model_dir: Direktori model (contoh: bundle registry); default direktori models/
+    
+    Returns:
+        Dictionary metadata, atau None jika file tidak ada atau rusak
+    """
+    import json
+    metadata_path = (model_dir or get_models_dir()) / 'arimax_model_metadata.json'
+    try:
+        with open(metadata_path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
 def load_arimax_order_metadata() -> tuple[int, int, int] | None:
     """
     Memuat metadata order (p, d, q) dari model ARIMAX yang sudah disimpan.
@@ -159,7 +469,7 @@ def load_arimax_order_metadata() -> tuple[int, int, int] | None:
     return None
 
 
-def load_lstm_model() -> tf.keras.Model:
+def load_lstm_model(backend: str = 'keras', model_dir: Path | None = None) -> tf.keras.Model | NumpyLSTM:
     """
     Memuat model LSTM dari disk.
     
@@ -167,35 +477,50 @@ def load_lstm_model() -> tf.keras.Model:
     Menggunakan compile=False untuk menghindari masalah deserialization dengan metrics.
     Untuk inference/prediction, kompilasi tidak diperlukan.
     
+    Args:
+        backend: 'keras' untuk memuat model Keras (memerlukan TensorFlow), atau
+                 'numpy' untuk memuat bobot ke NumpyLSTM (tanpa TensorFlow, khusus inference)
+        model_dir: Direktori model (contoh: bundle registry); default direktori models/
+    
     Returns:
         Model LSTM yang sudah dimuat
     
     Raises:
         FileNotFoundError: Jika file model tidak ditemukan
+        ValueError: Jika backend tidak dikenal
     """
-    models_dir = get_models_dir()
+    models_dir = model_dir or get_models_dir()
     model_path = models_dir / 'lstm_residual_model.h5'
     if not model_path.exists():
         raise FileNotFoundError(f"LSTM model not found: {model_path}")
+    if backend == 'numpy':
+        return NumpyLSTM.from_h5(model_path)
+    if backend != 'keras':
+        raise ValueError(f"Unknown LSTM backend: {backend}. Use 'keras' or 'numpy'.")
+    import tensorflow as tf
+
     # Gunakan compile=False untuk menghindari masalah deserialization dengan metrics
     # Kompilasi tidak diperlukan untuk inference/prediction
     return tf.keras.models.load_model(model_path, compile=False)
 
 
-def load_residual_scaler() -> MinMaxScaler:
+def load_residual_scaler(model_dir: Path | None = None) -> MinMaxScaler:
     """
     Memuat scaler untuk residual dari disk.
     
     Scaler digunakan untuk normalisasi data residual sebelum training LSTM
     dan untuk inverse transform setelah prediksi.
     
+    Args:
+        model_dir: Direktori model (contoh: bundle registry); default direktori models/
+    
     Returns:
         Scaler yang sudah dimuat (MinMaxScaler)
     
     Raises:
         FileNotFoundError: Jika file scaler tidak ditemukan
     """
-    models_dir = get_models_dir()
+    models_dir = model_dir or get_models_dir()
     scaler_path = models_dir / 'residual_scaler.save'
     if not scaler_path.exists():
         raise FileNotFoundError(f"Residual scaler not found: {scaler_path}")
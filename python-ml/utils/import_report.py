@@ -0,0 +1,91 @@
+"""
+Laporan Waktu Import - Memantau Biaya Startup Service
+
+Modul ini menyediakan:
+1. loaded_heavy_modules() - daftar library ML berat yang sudah ter-import di proses saat ini
+2. measure_import_time() - mengukur waktu import sebuah modul di proses Python baru
+   menggunakan `python -X importtime`, sehingga regresi waktu startup mudah terlihat
+
+Cara menjalankan dari direktori python-ml:
+    python -m utils.import_report            # laporan untuk modul 'main'
+    python -m utils.import_report utils      # laporan untuk modul lain
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+# Library berat yang seharusnya TIDAK ter-import saat startup API
+HEAVY_MODULES = ('tensorflow', 'keras', 'statsmodels', 'sklearn', 'scipy')
+
+
+def loaded_heavy_modules() -> list[str]:
+    """
+    Mendapatkan daftar library berat yang sudah ter-import di proses saat ini.
+
+    Returns:
+        List nama modul top-level (subset dari HEAVY_MODULES) yang ada di sys.modules
+    """
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+def measure_import_time(module: str = 'main', top: int = 15) -> dict:
+    """
+    Mengukur waktu import sebuah modul di proses Python baru (cold start).
+
+    Menjalankan `python -X importtime -c "import <module>"` dan mem-parsing output-nya.
+
+    Args:
+        module: Nama modul yang akan di-import (default: 'main')
+        top: Jumlah modul dengan waktu kumulatif terbesar yang dilaporkan
+
+    Returns:
+        Dictionary berisi:
+        - module: Nama modul yang diukur
+        - total_seconds: Waktu import kumulatif modul tersebut
+        - heavy_modules_loaded: Library berat yang ikut ter-import
+        - slowest: List {module, cumulative_seconds} untuk modul paling lambat
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=str(Path(__file__).parent.parent),
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f'Failed to import {module}: {completed.stderr.strip().splitlines()[-1:]}')
+
+    # Format baris: "import time:  self [us] | cumulative | imported package"
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        # Modul yang di-import langsung oleh perintah tidak memiliki indentasi tambahan
+        is_root = not parts[2].startswith('  ')
+        entries.append((parts[2].strip(), int(parts[1]), is_root))
+
+    top_level = {name.split('.')[0] for name, _, _ in entries}
+    total_us = sum(cumulative for _, cumulative, is_root in entries if is_root)
+    slowest = sorted(entries, key=lambda entry: entry[1], reverse=True)[:top]
+    return {
+        'module': module,
+        'total_seconds': total_us / 1e6,
+        'heavy_modules_loaded': [name for name in HEAVY_MODULES if name in top_level],
+        'slowest': [
+            {'module': name, 'cumulative_seconds': cumulative / 1e6}
+            for name, cumulative, _ in slowest
+        ],
+    }
+
+
+if __name__ == '__main__':
+    report = measure_import_time(sys.argv[1] if len(sys.argv) > 1 else 'main')
+    print(f"import {report['module']}: {report['total_seconds']:.3f}s")
+    print(f"heavy modules loaded: {', '.join(report['heavy_modules_loaded']) or 'none'}")
+    for entry in report['slowest']:
+        print(f"  {entry['cumulative_seconds']:8.3f}s  {entry['module']}")
+    # Exit code 1 jika ada library berat yang ikut ter-import (berguna untuk CI)
+    sys.exit(1 if report['heavy_modules_loaded'] else 0)
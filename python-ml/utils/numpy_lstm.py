@@ -0,0 +1,212 @@
+"""
+Inference Engine LSTM Berbasis NumPy - Serving Tanpa TensorFlow
+
+Modul ini menyediakan backend inference untuk model residual LSTM (LSTM + Dense)
+yang disimpan di lstm_residual_model.h5. Bobot (kernel, recurrent kernel, bias)
+dibaca langsung dari file H5 menggunakan h5py, lalu perhitungan gate LSTM
+dijalankan dengan operasi NumPy yang ter-vektorisasi.
+
+Dengan backend ini, worker serving (/predict) tidak perlu mengimpor TensorFlow sama sekali.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    """Fungsi aktivasi sigmoid yang stabil secara numerik."""
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)
+
+
+_ACTIVATIONS = {
+    'tanh': np.tanh,
+    'sigmoid': _sigmoid,
+    'linear': lambda x: x,
+    None: lambda x: x,
+}
+
+
+def _decode(value) -> str:
+    """Decode atribut H5 (bytes atau str) menjadi str."""
+    return value.decode('utf-8') if isinstance(value, bytes) else str(value)
+
+
+class NumpyLSTM:
+    """
+    Model LSTM(units) + Dense(1) yang dijalankan sepenuhnya dengan NumPy.
+
+    Urutan gate mengikuti Keras: input (i), forget (f), cell (c), output (o).
+    Untuk setiap timestep:
+        z = x_t @ W + h_{t-1} @ U + b
+        i = σ(z_i), f = σ(z_f), o = σ(z_o)
+        c_t = f * c_{t-1} + i * tanh(z_c)
+        h_t = o * tanh(c_t)
+    Output = h_T @ W_dense + b_dense
+
+    Class ini menyediakan predict_on_batch() dan predict() dengan signature yang sama
+    seperti Keras, sehingga dapat dipakai sebagai pengganti model Keras untuk inference.
+    """
+
+    def __init__(
+        self,
+        kernel: np.ndarray,
+        recurrent_kernel: np.ndarray,
+        bias: np.ndarray,
+        dense_kernel: np.ndarray,
+        dense_bias: np.ndarray,
+        activation: str = 'tanh',
+        recurrent_activation: str = 'sigmoid',
+        dense_activation: str | None = 'linear',
+    ):
+        if activation not in _ACTIVATIONS or recurrent_activation not in _ACTIVATIONS or dense_activation not in _ACTIVATIONS:
+            raise ValueError(
+                f'Unsupported activation: {activation}, {recurrent_activation}, {dense_activation}',
+            )
+        self.kernel = np.asarray(kernel, dtype=np.float32)
+        self.recurrent_kernel = np.asarray(recurrent_kernel, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.dense_kernel = np.asarray(dense_kernel, dtype=np.float32)
+        self.dense_bias = np.asarray(dense_bias, dtype=np.float32)
+        self.units = self.recurrent_kernel.shape[0]
+        self.activation = _ACTIVATIONS[activation]
+        self.recurrent_activation = _ACTIVATIONS[recurrent_activation]
+        self.dense_activation = _ACTIVATIONS[dense_activation]
+
+    @classmethod
+    def from_h5(cls, model_path: str | Path) -> 'NumpyLSTM':
+        """
+        Memuat bobot model LSTM + Dense dari file H5 Keras tanpa TensorFlow.
+
+        Args:
+            model_path: Path ke file .h5 (contoh: models/lstm_residual_model.h5)
+
+        Returns:
+            Instance NumpyLSTM dengan bobot dari file H5
+
+        Raises:
+            ValueError: Jika arsitektur model bukan single-layer LSTM + Dense
+        """
+        import h5py
+
+        with h5py.File(str(model_path), 'r') as f:
+            model_config = json.loads(_decode(f.attrs['model_config']))
+            layer_configs = [
+                layer for layer in model_config.get('config', {}).get('layers', [])
+                if layer.get('class_name') != 'InputLayer'
+            ]
+            if [layer.get('class_name') for layer in layer_configs] != ['LSTM', 'Dense']:
+                raise ValueError(
+                    f'Unsupported architecture for NumPy backend: {[layer.get("class_name") for layer in layer_configs]}',
+                )
+            lstm_config = layer_configs[0]['config']
+            dense_config = layer_configs[1]['config']
+            if lstm_config.get('return_sequences') or lstm_config.get('go_backwards') or lstm_config.get('stateful'):
+                raise ValueError('Unsupported LSTM configuration for NumPy backend')
+
+            # Bobot disimpan per layer dengan atribut 'weight_names' (urutan sesuai Keras)
+            weights_group = f['model_weights'] if 'model_weights' in f else f
+            layer_weights = []
+            for layer_name in weights_group.attrs['layer_names']:
+                layer_group = weights_group[_decode(layer_name)]
+                names = [_decode(name) for name in layer_group.attrs['weight_names']]
+                if names:
+                    layer_weights.append([np.array(layer_group[name]) for name in names])
+
+        if len(layer_weights) != 2 or len(layer_weights[0]) != 3 or len(layer_weights[1]) != 2:
+            raise ValueError('Unexpected weight layout in LSTM model file')
+
+        kernel, recurrent_kernel, bias = layer_weights[0]
+        dense_kernel, dense_bias = layer_weights[1]
+        return cls(
+            kernel,
+            recurrent_kernel,
+            bias,
+            dense_kernel,
+            dense_bias,
+            activation=lstm_config.get('activation', 'tanh'),
+            recurrent_activation=lstm_config.get('recurrent_activation', 'sigmoid'),
+            dense_activation=dense_config.get('activation', 'linear'),
+        )
+
+    def predict_on_batch(self, x: np.ndarray) -> np.ndarray:
+        """
+        Menjalankan forward pass untuk batch sequence.
+
+        Args:
+            x: Array dengan shape (batch, window, 1)
+
+        Returns:
+            Array prediksi dengan shape (batch, 1)
+        """
+        x = np.asarray(x, dtype=np.float32)
+        batch, timesteps, _ = x.shape
+        units = self.units
+        # Proyeksi input untuk semua timestep sekaligus: (batch, timesteps, 4 * units)
+        x_proj = x @ self.kernel + self.bias
+        h = np.zeros((batch, units), dtype=np.float32)
+        c = np.zeros((batch, units), dtype=np.float32)
+        for t in range(timesteps):
+            z = x_proj[:, t, :] + h @ self.recurrent_kernel
+            i = self.recurrent_activation(z[:, :units])
+            f = self.recurrent_activation(z[:, units:2 * units])
+            g = self.activation(z[:, 2 * units:3 * units])
+            o = self.recurrent_activation(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * self.activation(c)
+        return self.dense_activation(h @ self.dense_kernel + self.dense_bias)
+
+    def predict(self, x: np.ndarray, verbose: int = 0, batch_size: int | None = None) -> np.ndarray:
+        """Alias predict_on_batch dengan signature mirip Keras Model.predict()."""
+        return self.predict_on_batch(x)
+
+    __call__ = predict_on_batch
+
+    def rollout(self, seed: np.ndarray, n_steps: int, window: int = 18) -> np.ndarray:
+        """
+        Prediksi residual iteratif (sliding window) untuk n_steps ke depan.
+
+        Seed dan semua prediksi ditulis ke satu buffer berukuran window + n_steps, sehingga
+        window untuk setiap step hanyalah slice (view) dari buffer tanpa np.append.
+        Gate input/forget/output dihitung dengan satu pemanggilan aktivasi per timestep.
+
+        Args:
+            seed: Window residual terakhir (sudah di-scale), shape (1, window, 1)
+            n_steps: Jumlah step yang akan diprediksi
+            window: Ukuran window yang digunakan saat training (default: 18)
+
+        Returns:
+            Array prediksi residual dalam skala scaler, shape (n_steps,)
+        """
+        units = self.units
+        kernel = self.kernel[0]
+        bias = self.bias
+        recurrent_kernel = self.recurrent_kernel
+        dense_kernel = self.dense_kernel[:, 0]
+        dense_bias = float(self.dense_bias[0])
+        tanh = self.activation
+        gate = self.recurrent_activation
+        dense_activation = self.dense_activation
+
+        # Input berdimensi 1, sehingga proyeksi input (x * W + b) untuk setiap nilai
+        # cukup dihitung sekali dan dipakai ulang oleh semua window yang memuatnya
+        buffer = np.empty(window + n_steps, dtype=np.float32)
+        buffer[:window] = np.asarray(seed, dtype=np.float32).reshape(window)
+        projected = np.empty((window + n_steps, 4 * units), dtype=np.float32)
+        projected[:window] = buffer[:window, None] * kernel + bias
+
+        for step in range(n_steps):
+            h = np.zeros(units, dtype=np.float32)
+            c = np.zeros(units, dtype=np.float32)
+            for z_input in projected[step:step + window]:
+                z = z_input + h @ recurrent_kernel
+                gates = gate(z)
+                c = gates[units:2 * units] * c + gates[:units] * tanh(z[2 * units:3 * units])
+                h = gates[3 * units:] * tanh(c)
+            value = dense_activation(h @ dense_kernel + dense_bias)
+            buffer[window + step] = value
+            projected[window + step] = value * kernel + bias
+        return buffer[window:].copy()
@@ -3,14 +3,27 @@ Utility untuk Preprocessing Data - Persiapan Data untuk Training
 
 Modul ini menyediakan fungsi-fungsi untuk:
 1. Membersihkan dan menormalisasi data numerik
-2. Memuat dan membersihkan data dari file Excel
+2. Memuat dan membersihkan data dari file Excel, CSV, atau Parquet secara streaming (per chunk baris)
 3. Mengecek stasioneritas data (untuk ARIMAX)
 4. Membagi data menjadi training dan test set
 """
 
+import os
+from pathlib import Path
+from typing import Iterator
+
 import pandas as pd
 import numpy as np
-from statsmodels.tsa.stattools import adfuller
+
+# Nama kolom dataset (berdasarkan posisi kolom pada file upload)
+DATASET_COLUMNS = ['timestamp', 'wave_height', 'wind_speed']
+
+# Format file upload yang didukung. .xls (format lama) tidak dapat dibaca openpyxl sehingga
+# dibaca sekaligus dengan pd.read_excel (memerlukan xlrd); Parquet memerlukan pyarrow (opsional)
+UPLOAD_FORMATS = ('.xlsx', '.xlsm', '.xls', '.csv', '.parquet')
+
+# Jumlah baris per chunk saat membaca file upload (env INGEST_CHUNK_ROWS)
+DEFAULT_INGEST_CHUNK_ROWS = 50_000
 
 
 def clean_numeric(col: pd.Series) -> pd.Series:
@@ -20,7 +33,11 @@ def clean_numeric(col: pd.Series) -> pd.Series:
     Fungsi ini menangani berbagai format angka yang mungkin ada di data:
     - Mengganti koma (,) dengan titik (.) sebagai pemisah desimal
     - Menghapus karakter non-numerik (kecuali titik dan minus)
-    - Memperbaiki angka dengan multiple dots (contoh: "1.2.3" -> "1.23")
+    - Memperbaiki angka dengan multiple dots dengan menghapus semua titik (contoh: "1.2.3" -> "123")
+    
+    Kolom yang sudah bertipe numerik (contoh: sel Excel berisi angka) tidak diproses sebagai
+    string; nilai inf dijadikan NaN. Kolom lain dibersihkan dengan operasi string vektor
+    (tanpa fungsi Python per baris).
     
     Args:
         col: Pandas Series yang berisi data numerik (dalam format string atau campuran)
@@ -28,62 +45,173 @@ def clean_numeric(col: pd.Series) -> pd.Series:
     Returns:
         Pandas Series yang sudah dibersihkan dan dikonversi ke numerik
     """
-    # Konversi ke string dan hapus whitespace
-    col = col.astype(str).str.strip()
+    # Fast path: kolom sudah numerik (bool tetap lewat jalur string seperti sebelumnya)
+    if pd.api.types.is_numeric_dtype(col) and not pd.api.types.is_bool_dtype(col):
+        if pd.api.types.is_float_dtype(col):
+            return col.where(np.isfinite(col))
+        return col
+
+    # Konversi ke string; nilai kosong (NaN/None) tetap kosong dan menjadi NaN di akhir
+    col = col.astype(str)
     # Ganti koma dengan titik (format Eropa -> format standar)
     col = col.str.replace(',', '.', regex=False)
-    # Hapus semua karakter selain angka, titik, dan minus
+    # Hapus semua karakter selain angka, titik, dan minus (termasuk whitespace)
     col = col.str.replace(r'[^0-9\.\-]', '', regex=True)
 
-    def fix_multi_dot(x: str) -> str:
-        """
-        Memperbaiki angka dengan multiple dots.
-        
-        Contoh:
-        - "1.2.3" -> "1.23"
-        - "1.2" -> "1.2" (tidak diubah)
-        """
-        if x.count('.') <= 1:
-            return x
-        # Jika ada lebih dari 1 titik, gabungkan bagian setelah titik pertama
-        parts = x.split('.')
-        return parts[0] + ''.join(parts[1:])
-
-    col = col.apply(fix_multi_dot)
+    # Jika ada lebih dari 1 titik, semua titik dihapus (contoh: "1.2.3" -> "123")
+    multi_dot = col.str.count(r'\.') > 1
+    if multi_dot.any():
+        col = col.mask(multi_dot, col.str.replace('.', '', regex=False))
+
     # Konversi ke numerik, nilai yang tidak valid menjadi NaN
     return pd.to_numeric(col, errors='coerce')
 
 
-def load_and_clean_data(file_path: str) -> pd.DataFrame:
+def _check_columns(columns: list) -> None:
+    """Memastikan file upload memiliki tepat 3 kolom (timestamp, wave_height, wind_speed)."""
+    if len(columns) != len(DATASET_COLUMNS):
+        raise ValueError(
+            f'Dataset must contain exactly {len(DATASET_COLUMNS)} columns '
+            f'(timestamp, wave_height, wind_speed), got {len(columns)}: {list(columns)}'
+        )
+
+
+def _iter_excel_chunks(file_path: Path, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Membaca sheet pertama workbook .xlsx baris demi baris (openpyxl read-only) per chunk."""
+    from openpyxl import load_workbook
+
+    # read_only: sel dibaca secara streaming dari XML, tidak seluruh workbook dimuat ke memori
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        # Kolom kosong di ujung kanan header diabaikan (seperti pd.read_excel)
+        header = list(header)
+        while header and header[-1] is None:
+            header.pop()
+        _check_columns(header)
+        n_columns = len(header)
+
+        chunk = []
+        for row in rows:
+            row = row[:n_columns]
+            # Baris kosong dilewati (seperti pd.read_excel)
+            if all(value is None for value in row):
+                continue
+            chunk.append(row + (None,) * (n_columns - len(row)))
+            if len(chunk) >= chunk_rows:
+                yield pd.DataFrame(chunk, columns=DATASET_COLUMNS)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=DATASET_COLUMNS)
+    finally:
+        workbook.close()
+
+
+def _iter_csv_chunks(file_path: Path, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Membaca file CSV per chunk baris."""
+    # Semua kolom dibaca sebagai string agar pembersihan sama seperti data Excel
+    with pd.read_csv(file_path, chunksize=chunk_rows, dtype=str, keep_default_na=False) as reader:
+        for chunk in reader:
+            _check_columns(chunk.columns)
+            chunk.columns = DATASET_COLUMNS
+            yield chunk
+
+
+def _iter_parquet_chunks(file_path: Path, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Membaca file Parquet per batch baris (memerlukan pyarrow)."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError('Parquet upload requires pyarrow. Install it with: pip install pyarrow') from exc
+
+    parquet_file = pq.ParquetFile(file_path)
+    _check_columns(parquet_file.schema_arrow.names)
+    for batch in parquet_file.iter_batches(batch_size=chunk_rows):
+        chunk = batch.to_pandas()
+        chunk.columns = DATASET_COLUMNS
+        yield chunk
+
+
+def iter_raw_chunks(file_path: str, chunk_rows: int | None = None) -> Iterator[pd.DataFrame]:
+    """
+    Membaca file upload (Excel, CSV, atau Parquet) per chunk baris tanpa memuat seluruh file.
+
+    Kolom dipetakan berdasarkan posisi ke timestamp, wave_height, wind_speed (seperti
+    load_and_clean_data sebelumnya). File .xls (format lama) dibaca sekaligus dengan pd.read_excel.
+
+    Args:
+        file_path: Path ke file upload
+        chunk_rows: Jumlah baris per chunk (None = env INGEST_CHUNK_ROWS, default 50000)
+
+    Yields:
+        DataFrame mentah (belum dibersihkan) dengan kolom timestamp, wave_height, wind_speed
+
+    Raises:
+        ValueError: Jika format file tidak didukung atau jumlah kolom tidak sesuai
+        ImportError: Jika library untuk membaca format file tidak terpasang
+    """
+    file_path = Path(file_path)
+    chunk_rows = chunk_rows or int(os.environ.get('INGEST_CHUNK_ROWS', DEFAULT_INGEST_CHUNK_ROWS))
+    suffix = file_path.suffix.lower()
+    if suffix in ('.xlsx', '.xlsm'):
+        yield from _iter_excel_chunks(file_path, chunk_rows)
+    elif suffix == '.csv':
+        yield from _iter_csv_chunks(file_path, chunk_rows)
+    elif suffix == '.parquet':
+        yield from _iter_parquet_chunks(file_path, chunk_rows)
+    elif suffix == '.xls':
+        df = pd.read_excel(file_path)
+        _check_columns(df.columns)
+        df.columns = DATASET_COLUMNS
+        yield df
+    else:
+        raise ValueError(f'Unsupported dataset format: {suffix} (supported: {", ".join(UPLOAD_FORMATS)})')
+
+
+def clean_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    Membersihkan satu chunk mentah: parse timestamp dan bersihkan kolom numerik.
+
+    Hasilnya hanya berisi kolom datetime64 dan numerik (tanpa kolom object/string), sehingga
+    memori yang ditahan per baris kecil dan konstan.
     """
-    Memuat file Excel dan membersihkan data.
+    return pd.DataFrame({
+        'timestamp': pd.to_datetime(chunk['timestamp']),
+        'wave_height': clean_numeric(chunk['wave_height']),
+        'wind_speed': clean_numeric(chunk['wind_speed']),
+    })
+
+
+def load_and_clean_data(file_path: str, chunk_rows: int | None = None) -> pd.DataFrame:
+    """
+    Memuat file dataset (Excel, CSV, atau Parquet) dan membersihkan data.
     
     Fungsi ini melakukan:
-    1. Membaca file Excel dengan kolom timestamp, wave_height, wind_speed
-    2. Membersihkan data numerik (menghapus koma, multiple dots, dll)
-    3. Mengisi missing values dengan interpolasi berbasis waktu
-    4. Mengurutkan data berdasarkan timestamp
-    5. Menggunakan timestamp sebagai index
+    1. Membaca file per chunk baris (iter_raw_chunks) dengan kolom timestamp, wave_height, wind_speed
+    2. Membersihkan setiap chunk segera setelah dibaca (menghapus koma, multiple dots, dll),
+       sehingga hanya satu chunk mentah yang berada di memori pada satu waktu
+    3. Mengurutkan data berdasarkan timestamp
+    4. Menggunakan timestamp sebagai index
+    5. Mengisi missing values dengan interpolasi berbasis waktu
     
     Args:
-        file_path: Path ke file Excel yang akan dimuat
+        file_path: Path ke file yang akan dimuat (.xlsx, .xlsm, .xls, .csv, atau .parquet)
+        chunk_rows: Jumlah baris per chunk (None = env INGEST_CHUNK_ROWS, default 50000)
 
     Returns:
         DataFrame yang sudah dibersihkan dengan timestamp sebagai index
     """
-    # Baca file Excel dan parse kolom timestamp sebagai datetime
-    df = pd.read_excel(file_path, parse_dates=['timestamp'])
-    # Pastikan nama kolom sesuai (timestamp, wave_height, wind_speed)
-    df.columns = ['timestamp', 'wave_height', 'wind_speed']
-    # Konversi timestamp ke datetime (jika belum)
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    # Baca dan bersihkan per chunk; hanya hasil numerik yang sudah bersih yang disimpan
+    chunks = [clean_chunk(chunk) for chunk in iter_raw_chunks(file_path, chunk_rows)]
+    if not chunks:
+        return pd.DataFrame(columns=DATASET_COLUMNS[1:], index=pd.DatetimeIndex([], name='timestamp'))
+    df = pd.concat(chunks, ignore_index=True)
     # Urutkan berdasarkan timestamp dan gunakan sebagai index
     df = df.sort_values('timestamp').set_index('timestamp')
 
-    # Bersihkan kolom numerik (menghapus koma, multiple dots, dll)
-    df['wave_height'] = clean_numeric(df['wave_height'])
-    df['wind_speed'] = clean_numeric(df['wind_speed'])
-
     # Isi missing values dengan interpolasi berbasis waktu
     # Interpolasi ini menggunakan nilai sebelum dan sesudah untuk mengisi nilai yang hilang
     df = df.interpolate(method='time')
@@ -113,6 +241,9 @@ def check_stationarity(series: pd.Series) -> dict:
         - critical_values: Nilai kritis untuk berbagai tingkat signifikansi
         - is_stationary: Boolean, True jika data stasioner (p < 0.05)
     """
+    # Import statsmodels hanya saat dibutuhkan agar import modul ini tetap ringan
+    from statsmodels.tsa.stattools import adfuller
+
     # Lakukan ADF test (hapus NaN terlebih dahulu)
     adf_res = adfuller(series.dropna())
     return {
@@ -151,6 +282,24 @@ def split_train_test(df: pd.DataFrame, train_ratio: float = 0.8) -> tuple[pd.Dat
     return train, test
 
 
+def split_offsets(n: int, train_ratio: float = 0.7, validation_ratio: float = 0.15) -> tuple[int, int]:
+    """
+    Menghitung batas split train/validation/test (berbasis waktu) sebagai offset baris.
+
+    Args:
+        n: Jumlah baris data
+        train_ratio: Proporsi data training (default: 0.7 = 70%)
+        validation_ratio: Proporsi data validation (default: 0.15 = 15%)
+
+    Returns:
+        Tuple (train_end, validation_end): train = [0, train_end), validation =
+        [train_end, validation_end), test = [validation_end, n)
+    """
+    train_size = int(train_ratio * n)  # Ukuran data training (70%)
+    validation_size = int(validation_ratio * n)  # Ukuran data validation (15%)
+    return train_size, train_size + validation_size
+
+
 def split_train_validation_test(
     df: pd.DataFrame,
     train_ratio: float = 0.7,
@@ -161,7 +310,8 @@ def split_train_validation_test(
     
     Pembagian dilakukan secara time-based (bukan random) karena data time series
     harus mempertahankan urutan waktu. Data awal untuk training, data tengah untuk validation,
-    data akhir untuk testing.
+    data akhir untuk testing. Setiap split adalah slice (view) dari df, tanpa salinan
+    (copy-on-write pandas menyalin data hanya jika split diubah).
     
     Proporsi default 70:15:15 (training:validation:test) adalah standar dalam machine learning
     dengan data validasi untuk tuning hyperparameter dan early stopping.
@@ -177,13 +327,5 @@ def split_train_validation_test(
         - validation_df: DataFrame untuk validation (15% data tengah)
         - test_df: DataFrame untuk testing (15% data akhir)
     """
-    n = len(df)  # Total jumlah data
-    train_size = int(train_ratio * n)  # Ukuran data training (70%)
-    validation_size = int(validation_ratio * n)  # Ukuran data validation (15%)
-    # Ambil data awal untuk training
-    train = df.iloc[:train_size].copy()
-    # Ambil data tengah untuk validation
-    validation = df.iloc[train_size:train_size + validation_size].copy()
-    # Ambil data akhir untuk testing
-    test = df.iloc[train_size + validation_size:].copy()
-    return train, validation, test
+    train_end, validation_end = split_offsets(len(df), train_ratio, validation_ratio)
+    return df.iloc[:train_end], df.iloc[train_end:validation_end], df.iloc[validation_end:]
@@ -0,0 +1,325 @@
+"""
+Registry Model - Bundle Hybrid Berversi dengan Hot-Swap Atomik
+
+Trainer (train_arimax, train_lstm_residual) tetap menulis file model ke direktori models/
+sebagai area kerja. Setelah satu model hybrid selesai dilatih, file-file tersebut
+dipublikasikan sebagai bundle immutable:
+
+    models/registry/<versi>/
+        arimax_model.pkl
+        arimax_model_metadata.json
+        lstm_residual_model.h5
+        residual_scaler.save
+        residual_train.npy          (sumber seed residual LSTM; bundle lama: residual_train.csv)
+        manifest.json
+    models/registry/CURRENT         (pointer ke versi yang sedang dilayani)
+
+Bundle disalin ke direktori sementara lalu di-rename, dan pointer CURRENT ditulis ulang
+dengan os.replace, sehingga pembaca selalu melihat pasangan ARIMAX/LSTM yang lengkap
+dan konsisten. Bundle tidak pernah diubah setelah dipublikasikan.
+
+Bundle hasil refresh (ARIMAX diperpanjang dengan observasi baru, lihat
+training.arimax_refresh) mencatat `evaluation_base` di metadata manifest: evaluasi test set
+tetap milik bundle hasil training tersebut, dan bundle itu tidak dihapus oleh prune_bundles
+selama masih dirujuk.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+from .dataset import get_dataset_path, get_models_dir
+
+# File model yang wajib ada di setiap bundle
+BUNDLE_MODEL_FILES = (
+    'arimax_model.pkl',
+    'lstm_residual_model.h5',
+    'residual_scaler.save',
+)
+
+# File pendukung yang disalin jika ada
+BUNDLE_OPTIONAL_FILES = (
+    'arimax_model_metadata.json',
+    'lstm_training_history.json',
+)
+
+# Residual training (dari direktori data) yang menjadi seed rollout LSTM bundle ini
+BUNDLE_RESIDUAL_FILE = 'residual_train.npy'
+
+# Nama file residual di bundle yang dipublikasikan sebelum format dataset biner
+LEGACY_BUNDLE_RESIDUAL_FILE = 'residual_train.csv'
+
+MANIFEST_FILENAME = 'manifest.json'
+CURRENT_POINTER = 'CURRENT'
+
+
+def get_registry_dir() -> Path:
+    """
+    Mendapatkan path direktori registry model.
+
+    Returns:
+        Path ke models/registry/
+    """
+    return get_models_dir() / 'registry'
+
+
+def get_current_version() -> str | None:
+    """
+    Mendapatkan versi bundle yang sedang dilayani (isi pointer CURRENT).
+
+    Returns:
+        String versi, atau None jika belum ada bundle yang dipublikasikan
+    """
+    pointer_path = get_registry_dir() / CURRENT_POINTER
+    try:
+        version = pointer_path.read_text().strip()
+    except FileNotFoundError:
+        return None
+    if not version or not (get_registry_dir() / version).is_dir():
+        return None
+    return version
+
+
+def get_bundle_dir(version: str | None = None) -> Path | None:
+    """
+    Mendapatkan direktori bundle untuk versi tertentu (default: versi CURRENT).
+
+    Args:
+        version: Versi bundle (None = versi yang sedang dilayani)
+
+    Returns:
+        Path direktori bundle, atau None jika belum ada bundle
+    """
+    version = version or get_current_version()
+    if version is None:
+        return None
+    bundle_dir = get_registry_dir() / version
+    return bundle_dir if bundle_dir.is_dir() else None
+
+
+def resolve_serving_bundle() -> tuple[str | None, Path]:
+    """
+    Menentukan bundle yang dipakai untuk serving (pointer CURRENT dibaca satu kali).
+
+    Jika belum pernah ada bundle yang dipublikasikan (instalasi lama), file di
+    direktori models/ dipakai langsung dan versinya None.
+
+    Returns:
+        Tuple (versi bundle atau None, direktori yang berisi arimax_model.pkl, lstm_residual_model.h5, dst.)
+    """
+    version = get_current_version()
+    if version is None:
+        return None, get_models_dir()
+    return version, get_registry_dir() / version
+
+
+def get_residual_train_path(model_dir: Path | None = None) -> Path:
+    """
+    Mendapatkan path residual training (dibaca dengan utils.dataset.read_frame) yang sesuai
+    dengan direktori model.
+
+    Args:
+        model_dir: Direktori model (hasil resolve_serving_bundle()); None = direktori data
+
+    Returns:
+        Path ke residual_train.npy (atau residual_train.csv bundle lama) milik bundle,
+        atau data/residual_train.npy
+    """
+    if model_dir is not None:
+        for filename in (BUNDLE_RESIDUAL_FILE, LEGACY_BUNDLE_RESIDUAL_FILE):
+            if (model_dir / filename).exists():
+                return model_dir / filename
+    return get_dataset_path(BUNDLE_RESIDUAL_FILE)
+
+
+def get_bundle_manifest(version: str) -> dict | None:
+    """
+    Membaca manifest.json sebuah bundle.
+
+    Args:
+        version: Versi bundle
+
+    Returns:
+        Dictionary manifest, atau None jika bundle tidak ditemukan
+    """
+    manifest_path = get_registry_dir() / version / MANIFEST_FILENAME
+    try:
+        with open(manifest_path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def get_evaluation_base(version: str) -> str:
+    """
+    Mendapatkan versi bundle yang evaluasi test set-nya berlaku untuk bundle ini.
+
+    Bundle hasil training dievaluasi sendiri; bundle hasil refresh memakai evaluasi bundle
+    training asalnya (metadata 'evaluation_base'), karena ARIMAX-nya sudah melihat data test.
+
+    Args:
+        version: Versi bundle
+
+    Returns:
+        Versi bundle dasar evaluasi
+    """
+    manifest = get_bundle_manifest(version) or {}
+    return manifest.get('metadata', {}).get('evaluation_base') or version
+
+
+def _file_digest(paths: list[Path]) -> str:
+    """Hash SHA-1 dari isi sekumpulan file (dipakai sebagai bagian dari versi bundle)."""
+    digest = hashlib.sha1()
+    for path in paths:
+        digest.update(path.name.encode())
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def publish_bundle(metadata: dict | None = None, keep: int = 5, files: dict[str, Path] | None = None) -> str:
+    """
+    Mempublikasikan model di direktori models/ sebagai bundle immutable baru.
+
+    Langkah:
+    1. Salin file model + residual_train.npy ke direktori sementara di registry
+    2. Tulis manifest.json, lalu rename direktori sementara menjadi registry/<versi>
+    3. Tulis pointer CURRENT ke file sementara lalu os.replace (atomic)
+    4. Hapus bundle lama (menyisakan `keep` bundle terbaru)
+
+    Args:
+        metadata: Informasi tambahan untuk manifest (contoh: order ARIMAX, seed, MAPE)
+        keep: Jumlah bundle yang dipertahankan (bundle CURRENT selalu dipertahankan)
+        files: Sumber file bundle {nama file di bundle: path sumber} (contoh: bundle refresh).
+               None = file model di models/ + data/residual_train.npy
+
+    Returns:
+        Versi bundle yang baru dipublikasikan
+
+    Raises:
+        FileNotFoundError: Jika file model wajib belum ada
+    """
+    models_dir = get_models_dir()
+    registry_dir = get_registry_dir()
+    registry_dir.mkdir(parents=True, exist_ok=True)
+
+    if files is None:
+        files = {filename: models_dir / filename for filename in BUNDLE_MODEL_FILES + BUNDLE_OPTIONAL_FILES}
+        files[BUNDLE_RESIDUAL_FILE] = get_dataset_path(BUNDLE_RESIDUAL_FILE)
+    for filename in BUNDLE_MODEL_FILES:
+        path = files.get(filename)
+        if path is None or not Path(path).exists():
+            raise FileNotFoundError(f'Model file not found: {path or filename}. Please train the hybrid model first.')
+    # Nama file di bundle -> path sumber (file opsional yang tidak ada dilewati)
+    sources = [(filename, Path(path)) for filename, path in files.items() if Path(path).exists()]
+
+    # Salin dulu ke direktori sementara, versi dihitung dari isi salinan (bukan file
+    # sumber yang mungkin sedang ditulis ulang oleh training lain)
+    staging_dir = registry_dir / f'.staging-{os.getpid()}-{time.time_ns()}'
+    staging_dir.mkdir()
+    try:
+        copies = [Path(shutil.copy2(path, staging_dir / filename)) for filename, path in sources]
+        version = f"{time.strftime('%Y%m%dT%H%M%S')}-{_file_digest(copies)[:8]}"
+        manifest = {
+            'version': version,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'files': [path.name for path in copies],
+            'metadata': metadata or {},
+        }
+        with open(staging_dir / MANIFEST_FILENAME, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        bundle_dir = registry_dir / version
+        if bundle_dir.exists():
+            # Isi identik sudah pernah dipublikasikan pada detik yang sama
+            shutil.rmtree(staging_dir)
+        else:
+            os.rename(staging_dir, bundle_dir)
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+    # Swap pointer secara atomic
+    pointer_tmp = registry_dir / f'{CURRENT_POINTER}.{os.getpid()}.tmp'
+    pointer_tmp.write_text(version)
+    os.replace(pointer_tmp, registry_dir / CURRENT_POINTER)
+
+    prune_bundles(keep=keep)
+    return version
+
+
+def list_bundles() -> list[dict]:
+    """
+    Mendapatkan daftar bundle di registry (terbaru lebih dulu).
+
+    Returns:
+        List manifest bundle, dengan kolom tambahan 'current' (True untuk versi CURRENT)
+    """
+    registry_dir = get_registry_dir()
+    if not registry_dir.exists():
+        return []
+    current = get_current_version()
+    bundles = []
+    for bundle_dir in sorted(registry_dir.iterdir(), reverse=True):
+        manifest_path = bundle_dir / MANIFEST_FILENAME
+        if not bundle_dir.is_dir() or not manifest_path.exists():
+            continue
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        manifest['current'] = bundle_dir.name == current
+        bundles.append(manifest)
+    return bundles
+
+
+def activate_bundle(version: str) -> str:
+    """
+    Mengarahkan pointer CURRENT ke bundle yang sudah ada (contoh: rollback).
+
+    Args:
+        version: Versi bundle tujuan
+
+    Returns:
+        Versi yang diaktifkan
+
+    Raises:
+        FileNotFoundError: Jika bundle tidak ditemukan
+    """
+    registry_dir = get_registry_dir()
+    if Path(version).name != version or version.startswith('.') or not (registry_dir / version / MANIFEST_FILENAME).exists():
+        raise FileNotFoundError(f'Model bundle not found: {version}')
+    pointer_tmp = registry_dir / f'{CURRENT_POINTER}.{os.getpid()}.tmp'
+    pointer_tmp.write_text(version)
+    os.replace(pointer_tmp, registry_dir / CURRENT_POINTER)
+    return version
+
+
+def prune_bundles(keep: int = 5) -> list[str]:
+    """
+    Menghapus bundle lama, menyisakan `keep` bundle terbaru dan bundle CURRENT, beserta
+    bundle dasar evaluasi (evaluation_base) dari bundle yang dipertahankan.
+
+    Model yang sudah dimuat di memori tidak terpengaruh; hanya file di disk yang dihapus.
+
+    Args:
+        keep: Jumlah bundle terbaru yang dipertahankan (<= 0 berarti tidak menghapus apa pun)
+
+    Returns:
+        List versi yang dihapus
+    """
+    if keep <= 0:
+        return []
+    current = get_current_version()
+    bundles = list_bundles()
+    kept = bundles[:keep] + [bundle for bundle in bundles if bundle['version'] == current]
+    protected = {current} | {bundle.get('metadata', {}).get('evaluation_base') for bundle in kept}
+    removed = []
+    for version in [bundle['version'] for bundle in bundles[keep:]]:
+        if version in protected:
+            continue
+        shutil.rmtree(get_registry_dir() / version, ignore_errors=True)
+        removed.append(version)
+    return removed